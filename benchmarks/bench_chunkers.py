@@ -0,0 +1,374 @@
+"""
+Benchmark and regression suite for ``alita_tools.chunkers``.
+
+Runs every chunker on reproducible corpora and reports docs/sec, tokens/sec, peak RSS and
+traced allocations per chunk:
+
+  - ``code_parser`` on a multi-language source tree (or a real checkout, ``--source-path``);
+  - ``markdown`` and ``statistical`` on a synthetic markdown wiki;
+  - ``statistical`` and ``proposal`` on long prose.
+
+Everything runs offline: embeddings are deterministic word-hash vectors, the LLM of the
+proposal chunker is a deterministic fake that groups sentences, and tokens are whitespace
+delimited words unless ``--encoding cl100k_base`` is given. ``--embedding-latency-ms`` and
+``--llm-latency-ms`` simulate remote calls. Each run executes in its own process so peak RSS
+belongs to that chunker only, then once more under ``tracemalloc``.
+
+Results are written as JSON with a fingerprint of the produced chunks. ``--baseline`` compares
+them with a previous results file and exits with status 1 when throughput drops, memory grows
+by more than ``--tolerance`` or the chunks change.
+
+Usage:
+    python benchmarks/bench_chunkers.py [--output results.json] [--baseline previous.json]
+        [--only markdown,statistical] [--scale 1.0] [--encoding words]
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import random
+import re
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from bench_markdown_chunker import HEADERS_TO_SPLIT_ON, WORDS, make_export, paragraph  # noqa: E402
+
+RUNS = [
+    ("code_parser", "source_tree"),
+    ("markdown", "markdown_wiki"),
+    ("statistical", "markdown_wiki"),
+    ("statistical", "long_prose"),
+    ("proposal", "long_prose"),
+]
+# documents per corpus at --scale 1
+CORPUS_SIZES = {"source_tree": 600, "markdown_wiki": 500, "long_prose": 200}
+# the proposal chunker makes an LLM call per split, it runs on a sample of the corpus
+PROPOSAL_SAMPLE = 0.25
+# relative change of a metric that counts as a regression, and whether higher is better
+METRICS = {"docs_per_second": True, "tokens_per_second": True, "peak_rss_mb": False,
+           "traced_kb_per_chunk": False}
+
+
+class WordEncoder:
+    """Offline stand-in for a tiktoken encoding: a token is a word with its leading whitespace."""
+    name = "words"
+    _pattern = re.compile(r"\s*\S+|\s+")
+
+    def __init__(self):
+        self._ids = {}
+        self._pieces = []
+        self._lock = threading.Lock()
+
+    def _id(self, piece):
+        token_id = self._ids.get(piece)
+        if token_id is None:
+            with self._lock:
+                token_id = self._ids.setdefault(piece, len(self._pieces))
+                if token_id == len(self._pieces):
+                    self._pieces.append(piece)
+        return token_id
+
+    def encode(self, text, allowed_special=(), disallowed_special=()):
+        return [self._id(piece) for piece in self._pattern.findall(text)]
+
+    def encode_ordinary(self, text):
+        return self.encode(text)
+
+    def encode_batch(self, texts, allowed_special=(), disallowed_special=()):
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens):
+        return "".join(self._pieces[token] for token in tokens)
+
+
+class HashEmbeddings:
+    """Deterministic embeddings: the normalized sum of per-word random vectors seeded by the word."""
+    model = "hash-embeddings"
+
+    def __init__(self, dim=256, latency=0.0):
+        import numpy as np
+        self._np = np
+        self.dim = dim
+        self.latency = latency
+        self._vectors = {}
+
+    def _word_vector(self, word):
+        vector = self._vectors.get(word)
+        if vector is None:
+            seed = int.from_bytes(hashlib.sha256(word.encode("utf-8")).digest()[:8], "little")
+            vector = self._vectors[word] = self._np.random.default_rng(seed).standard_normal(self.dim)
+        return vector
+
+    def _embed(self, text):
+        vector = self._np.zeros(self.dim)
+        for word in re.findall(r"\w+", text.lower()):
+            vector += self._word_vector(word)
+        norm = self._np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class FakeStructuredLLM:
+
+    def __init__(self, schema, latency):
+        self.schema = schema
+        self.latency = latency
+
+    def invoke(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        content = prompt.to_messages()[-1].content
+        content = content[len("Content: "):] if content.startswith("Content: ") else content
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+", content.strip()) if s]
+        chunks = []
+        for i in range(0, len(sentences), 5):
+            group = sentences[i:i + 5]
+            title = " ".join(group[0].split()[:3]).strip(".").title()
+            chunks.append({"chunk_title": title, "chunk_summary": f"This chunk is about {title.lower()}.",
+                           "propositions": group})
+        return self.schema(chunks=chunks)
+
+
+class FakeLLM:
+    """Deterministic LLM for the proposal chunker: chunks are groups of five sentences."""
+    model_name = "fake-llm"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def with_structured_output(self, schema):
+        return FakeStructuredLLM(schema, self.latency)
+
+
+SOURCE_TEMPLATES = {
+    ".py": ('def {name}({arg}):\n    """{doc}"""\n    {arg}_total = 0\n    for item in {arg}:\n'
+            '        {arg}_total += len(str(item))\n    return {arg}_total\n\n\n'),
+    ".js": ("/** {doc} */\nfunction {name}({arg}) {{\n  let total = 0;\n  for (const item of {arg}) {{\n"
+            "    total += String(item).length;\n  }}\n  return total;\n}}\n\n"),
+    ".java": ("    /** {doc} */\n    public int {name}(List<String> {arg}) {{\n        int total = 0;\n"
+              "        for (String item : {arg}) {{\n            total += item.length();\n        }}\n"
+              "        return total;\n    }}\n\n"),
+    ".go": ("// {name} {doc}\nfunc {name}({arg} []string) int {{\n\ttotal := 0\n\tfor _, item := range {arg} {{\n"
+            "\t\ttotal += len(item)\n\t}}\n\treturn total\n}}\n\n"),
+    ".rs": ("/// {doc}\nfn {name}({arg}: &[String]) -> usize {{\n    let mut total = 0;\n"
+            "    for item in {arg} {{\n        total += item.len();\n    }}\n    total\n}}\n\n"),
+    ".rb": "# {doc}\ndef {name}({arg})\n  {arg}.map(&:to_s).sum(&:length)\nend\n\n",
+}
+
+
+def make_source_tree(files, seed=0):
+    rng = random.Random(seed)
+    extensions = list(SOURCE_TEMPLATES) + [".md", ".yaml"]
+    tree = []
+    for file_no in range(files):
+        extension = extensions[file_no % len(extensions)]
+        if extension == ".md":
+            content = "\n\n".join(paragraph(rng, rng.randint(30, 120)) for _ in range(rng.randint(3, 10)))
+        elif extension == ".yaml":
+            content = "\n".join(f"{rng.choice(WORDS)}_{i}: {rng.randint(0, 999)}" for i in range(rng.randint(10, 80)))
+        else:
+            functions = []
+            for function_no in range(rng.randint(3, 25)):
+                name = f"{rng.choice(WORDS)}_{function_no}"
+                functions.append(SOURCE_TEMPLATES[extension].format(
+                    name=name, arg=rng.choice(WORDS), doc=paragraph(rng, rng.randint(5, 25))))
+            content = "".join(functions)
+            if extension == ".java":
+                content = f"public class Module{file_no} {{\n{content}}}\n"
+        tree.append({"file_name": f"src/module_{file_no // 50}/file_{file_no}{extension}", "file_content": content})
+    return tree
+
+
+def make_prose(docs, seed=0):
+    from langchain.schema import Document
+
+    rng = random.Random(seed)
+    return [Document(page_content="\n\n".join(" ".join(paragraph(rng, rng.randint(8, 25))
+                                                        for _ in range(rng.randint(3, 8)))
+                                               for _ in range(rng.randint(20, 60))),
+                     metadata={"source": f"doc_{doc_no}.txt", "title": f"Document {doc_no}"})
+            for doc_no in range(docs)]
+
+
+def make_corpus(name, scale, source_path=None):
+    size = max(1, int(CORPUS_SIZES[name] * scale))
+    if name == "source_tree":
+        if source_path:
+            from bench_code_parser import collect_files
+            return collect_files(source_path, size, code_only=False)
+        return make_source_tree(size)
+    if name == "markdown_wiki":
+        return make_export(size)
+    return make_prose(size)
+
+
+def corpus_text(corpus):
+    for doc in corpus:
+        yield doc["file_content"] if isinstance(doc, dict) else doc.page_content
+
+
+def chunker_call(chunker, corpus, args):
+    from alita_tools.chunkers import __all__ as chunkers
+
+    if chunker == "code_parser":
+        return lambda: chunkers["code_parser"](iter(corpus), processes=1)
+    if chunker == "markdown":
+        config = {"headers_to_split_on": HEADERS_TO_SPLIT_ON, "max_tokens": 512, "token_overlap": 10}
+    elif chunker == "statistical":
+        config = {"embedding": HashEmbeddings(latency=args.embedding_latency_ms / 1000)}
+    else:
+        config = {"llm": FakeLLM(latency=args.llm_latency_ms / 1000)}
+    return lambda: chunkers[chunker](iter(corpus), config)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def run_chunker(chunker, corpus_name, args, queue):
+    """Runs in a fresh process: builds the corpus, runs the chunker, then runs it again under tracemalloc."""
+    os.environ["ALITA_PROPOSAL_CACHE"] = "none"
+    import tiktoken
+    from alita_tools.utils import tokens
+    if args.encoding == "words":
+        encoder = WordEncoder()
+        tokens._encoder = encoder
+        # splitters load their encoding by name
+        tiktoken.get_encoding = lambda name: encoder
+
+    corpus = make_corpus(corpus_name, args.scale, args.source_path)
+    if chunker == "proposal":
+        corpus = corpus[:max(1, int(len(corpus) * PROPOSAL_SAMPLE))]
+    input_tokens = sum(tokens.count_tokens(list(corpus_text(corpus))))
+    call = chunker_call(chunker, corpus, args)
+
+    rss_before = peak_rss_mb()
+    fingerprint = hashlib.sha256()
+    chunks = 0
+    start = time.perf_counter()
+    for document in call():
+        chunks += 1
+        fingerprint.update(document.page_content.encode("utf-8"))
+        fingerprint.update(json.dumps(document.metadata, sort_keys=True, default=str).encode("utf-8"))
+    seconds = time.perf_counter() - start
+    peak_rss = peak_rss_mb()
+
+    tracemalloc.start()
+    traced_chunks = sum(1 for _ in call())
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queue.put({
+        "chunker": chunker,
+        "corpus": corpus_name,
+        "documents": len(corpus),
+        "input_tokens": input_tokens,
+        "chunks": chunks,
+        "seconds": seconds,
+        "docs_per_second": len(corpus) / seconds,
+        "tokens_per_second": input_tokens / seconds,
+        "peak_rss_mb": peak_rss,
+        "corpus_rss_mb": rss_before,
+        "traced_peak_mb": traced_peak / 2 ** 20,
+        "traced_kb_per_chunk": traced_peak / 2 ** 10 / max(1, traced_chunks),
+        "fingerprint": fingerprint.hexdigest(),
+    })
+
+
+def compare(results, baseline, tolerance):
+    """Returns the regressions of `results` against `baseline` as human readable lines."""
+    previous = {(run["chunker"], run["corpus"]): run for run in baseline["runs"]}
+    regressions = []
+    for run in results["runs"]:
+        old = previous.get((run["chunker"], run["corpus"]))
+        if old is None:
+            continue
+        name = f"{run['chunker']}/{run['corpus']}"
+        if (old["fingerprint"], old["chunks"]) != (run["fingerprint"], run["chunks"]):
+            regressions.append(f"{name}: output changed ({old['chunks']} -> {run['chunks']} chunks)")
+        for metric, higher_is_better in METRICS.items():
+            if not old.get(metric):
+                continue
+            change = (run[metric] - old[metric]) / old[metric]
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{name}: {metric} {old[metric]:.1f} -> {run[metric]:.1f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="comma separated chunkers to run (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the size of every corpus")
+    parser.add_argument("--source-path", help="real source checkout to use instead of the synthetic tree")
+    parser.add_argument("--encoding", choices=["words", "cl100k_base"], default="words")
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative change of a metric reported as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    only = set(args.only.split(",")) if args.only else None
+    context = multiprocessing.get_context("spawn")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "encoding": args.encoding,
+        "scale": args.scale,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": [],
+    }
+    print(f"{'chunker':>12} {'corpus':>14} {'docs':>6} {'chunks':>7} {'docs/s':>9} {'tokens/s':>11} "
+          f"{'peak RSS MB':>11} {'KB/chunk':>9}")
+    for chunker, corpus_name in RUNS:
+        if only and chunker not in only:
+            continue
+        queue = context.Queue()
+        process = context.Process(target=run_chunker, args=(chunker, corpus_name, args, queue))
+        process.start()
+        run = None
+        while run is None:
+            try:
+                run = queue.get(timeout=1)
+            except queue_module.Empty:
+                if not process.is_alive():
+                    sys.exit(f"{chunker}/{corpus_name} failed with exit code {process.exitcode}")
+        process.join()
+        results["runs"].append(run)
+        print(f"{chunker:>12} {corpus_name:>14} {run['documents']:>6} {run['chunks']:>7} "
+              f"{run['docs_per_second']:>9.1f} {run['tokens_per_second']:>11.0f} "
+              f"{run['peak_rss_mb']:>11.1f} {run['traced_kb_per_chunk']:>9.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Throughput (files/sec) of ``parse_code_files_for_db`` on a real source checkout.
+
+Modes:
+  - ``per-file``: the former behaviour, creating a tree-sitter parser and a code
+    splitter for every file (kept below as the reference);
+  - ``pooled``: ``parse_code_files_for_db`` in the calling process, parsers and
+    splitters reused across files;
+  - ``processes``: ``parse_code_files_for_db(processes=N)``.
+
+Files are read up front so only parsing and splitting are timed. Files of unknown
+languages are split with the ``gpt2`` tiktoken encoding, which is downloaded on first
+use; pass ``--code-only`` to skip them when offline.
+
+Usage:
+    python benchmarks/bench_code_parser.py --path /path/to/checkout [--max-files 20000]
+        [--processes 4] [--code-only] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv"}
+
+
+def collect_files(path, max_files, code_only):
+    from alita_tools.chunkers.code.constants import Language, get_file_extension, get_programming_language
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(names):
+            file_path = os.path.join(root, name)
+            if code_only and get_programming_language(get_file_extension(name)) == Language.UNKNOWN:
+                continue
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    content = f.read()
+            except (UnicodeDecodeError, OSError):
+                continue
+            files.append({"file_name": os.path.relpath(file_path, path), "file_content": content})
+            if len(files) >= max_files:
+                return files
+    return files
+
+
+def per_file_reference(files):
+    """The former loop: a new parser and splitter for every file."""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
+    from alita_tools.chunkers.code.constants import Language, get_langchain_language, get_file_extension, \
+        get_programming_language, image_extensions, default_skip
+    from alita_tools.chunkers.code.treesitter.treesitter import Treesitter
+    documents = 0
+    for data in files:
+        file_name, file_content = data["file_name"], data["file_content"]
+        file_extension = get_file_extension(file_name)
+        programming_language = get_programming_language(file_extension)
+        if not file_content.strip() or file_name in default_skip or file_extension in image_extensions:
+            continue
+        if programming_language == Language.UNKNOWN:
+            splitter = TokenTextSplitter(encoding_name="gpt2", chunk_size=256, chunk_overlap=30)
+            documents += len(splitter.split_text(file_content))
+            continue
+        langchain_language = get_langchain_language(programming_language)
+        code_splitter = None
+        if langchain_language:
+            code_splitter = RecursiveCharacterTextSplitter.from_language(
+                language=langchain_language, chunk_size=1024, chunk_overlap=128)
+        for node in Treesitter.create_treesitter(programming_language).parse(file_content.encode()):
+            source = node.method_source_code
+            if node.doc_comment and programming_language != Language.PYTHON:
+                source = node.doc_comment + "\n" + source
+            documents += len(code_splitter.split_text(source)) if code_splitter else 1
+    return documents
+
+
+def run(name, func, files):
+    start = time.perf_counter()
+    documents = func(files)
+    elapsed = time.perf_counter() - start
+    result = {"seconds": elapsed, "files_per_second": len(files) / elapsed, "documents": documents}
+    print(f"{name:>12}: {result['files_per_second']:8.1f} files/s ({documents} documents in {elapsed:.2f}s)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=os.path.dirname(os.__file__),
+                        help="source checkout to parse (default: the Python standard library)")
+    parser.add_argument("--max-files", type=int, default=20000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--code-only", action="store_true", help="skip files of unknown languages")
+    parser.add_argument("--skip-reference", action="store_true", help="do not run the per-file reference")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    from alita_tools.chunkers.code.codeparser import parse_code_files_for_db
+
+    files = collect_files(args.path, args.max_files, args.code_only)
+    print(f"{len(files)} files from {args.path}")
+    results = {"path": args.path, "files": len(files), "processes": args.processes}
+    if not args.skip_reference:
+        results["per-file"] = run("per-file", per_file_reference, files)
+    results["pooled"] = run("pooled", lambda f: sum(1 for _ in parse_code_files_for_db(iter(f), processes=1)), files)
+    results["processes"] = run(f"processes={args.processes}", lambda f: sum(
+        1 for _ in parse_code_files_for_db(iter(f), processes=args.processes)), files)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
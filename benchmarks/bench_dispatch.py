@@ -0,0 +1,71 @@
+"""
+Per-call dispatch overhead of ``BaseToolApiWrapper.run``.
+
+For the largest wrappers this compares the former lookup (rebuilding
+``get_available_tools()`` and scanning it linearly on every call) with the
+per-instance name -> tool table used by ``run``. No remote calls are made:
+wrappers are created with ``model_construct()`` and only the lookup is timed.
+
+Usage:
+    python benchmarks/bench_dispatch.py [--calls 2000] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from importlib import import_module
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+WRAPPERS = [
+    ("alita_tools.jira.api_wrapper", "JiraApiWrapper"),
+    ("alita_tools.confluence.api_wrapper", "ConfluenceAPIWrapper"),
+    ("alita_tools.github.api_wrapper", "AlitaGitHubAPIWrapper"),
+    ("alita_tools.ado.work_item.ado_wrapper", "AzureDevOpsApiWrapper"),
+    ("alita_tools.ado.repos.repos_wrapper", "ReposApiWrapper"),
+    ("alita_tools.zephyr_scale.api_wrapper", "ZephyrScaleApiWrapper"),
+]
+
+
+def linear_lookup(wrapper, name):
+    for tool in wrapper.get_available_tools():
+        if tool["name"] == name:
+            return tool
+
+
+def bench(wrapper, lookup, names, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        lookup(names[i % len(names)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = []
+    for module, class_name in WRAPPERS:
+        try:
+            wrapper = getattr(import_module(module), class_name).model_construct()
+            names = [tool["name"] for tool in wrapper.get_available_tools()]
+        except Exception as e:
+            print(f"skipping {class_name}: {e}", file=sys.stderr)
+            continue
+        results.append({
+            "wrapper": class_name,
+            "tools": len(names),
+            "linear_us_per_call": bench(wrapper, lambda n: linear_lookup(wrapper, n), names, args.calls),
+            "table_us_per_call": bench(wrapper, wrapper._get_tool, names, args.calls),
+        })
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
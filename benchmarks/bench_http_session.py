@@ -0,0 +1,77 @@
+"""
+Requests/sec of bare ``requests`` calls versus the shared pooled session.
+
+Starts a local keep-alive HTTP stub server and issues the same number of GET
+requests from a thread pool, once with ``requests.get`` (new connection per call)
+and once through ``alita_tools.utils.http_session.get_session()``.
+
+Usage:
+    python benchmarks/bench_http_session.py [--requests 2000] [--workers 8] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from alita_tools.utils.http_session import get_session  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = json.dumps({"ok": True}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench(get, url, total, workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for response in pool.map(lambda _: get(url), range(total)):
+            response.raise_for_status()
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        result = {
+            "requests": args.requests,
+            "workers": args.workers,
+            "bare_requests_rps": bench(requests.get, url, args.requests, args.workers),
+            "pooled_session_rps": bench(get_session().get, url, args.requests, args.workers),
+        }
+    finally:
+        server.shutdown()
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Throughput of the markdown chunker on a synthetic Confluence space export.
+
+Compares the former chunker (a header splitter per document, a ``TokenTextSplitter`` per
+oversize section, token counting before splitting and deep-copied metadata, kept below as
+the reference) with ``chunkers/sematic/markdown_chunker.py`` and checks that both produce
+the same chunks and metadata. Pages mix headers, paragraphs, tables, lists and code blocks,
+with sections large enough to be token-split.
+
+By default tokens are UTF-8 bytes so nothing is downloaded; ``--encoding cl100k_base``
+uses the real tiktoken encoding.
+
+Usage:
+    python benchmarks/bench_markdown_chunker.py [--pages 2000] [--encoding bytes] [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from copy import deepcopy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+HEADERS_TO_SPLIT_ON = [("#", "Header 1"), ("##", "Header 2"), ("###", "Header 3")]
+WORDS = ("deployment pipeline service release cluster database migration rollback configuration "
+         "monitoring alert latency throughput dashboard incident owner runbook environment token "
+         "permission schema endpoint payload retry timeout cache replica backup").split()
+
+
+class ByteEncoder:
+    name = "bytes"
+
+    def encode(self, text, allowed_special=(), disallowed_special=()):
+        return list(text.encode("utf-8"))
+
+    def encode_ordinary(self, text):
+        return self.encode(text)
+
+    def encode_batch(self, texts, allowed_special=(), disallowed_special=()):
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+
+def reference_markdown_chunker(documents, config):
+    from langchain.schema import Document
+    from langchain_text_splitters import MarkdownHeaderTextSplitter
+    from langchain.text_splitter import TokenTextSplitter
+    from alita_tools.chunkers.utils import tiktoken_length
+
+    headers_to_split_on = [tuple(header) for header in config["headers_to_split_on"]]
+    max_tokens = config["max_tokens"]
+    for doc in documents:
+        chunk_id = 0
+        markdown_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=headers_to_split_on,
+                                                       strip_headers=config["strip_header"],
+                                                       return_each_line=config["return_each_line"])
+        for chunk in markdown_splitter.split_text(doc.page_content):
+            if tiktoken_length(chunk.page_content) > max_tokens:
+                subchunks = TokenTextSplitter(encoding_name="cl100k_base", chunk_size=max_tokens,
+                                              chunk_overlap=config["token_overlap"]).split_text(chunk.page_content)
+            else:
+                subchunks = [chunk.page_content]
+            for subchunk in subchunks:
+                chunk_id += 1
+                docmeta = deepcopy(doc.metadata)
+                docmeta.update({"headers": "; ".join(chunk.metadata.values())})
+                docmeta['chunk_id'] = chunk_id
+                docmeta['chunk_type'] = "document"
+                yield Document(page_content=subchunk, metadata=docmeta)
+
+
+def paragraph(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_page(rng, page_id):
+    lines = [f"# Page {page_id}: {rng.choice(WORDS)} {rng.choice(WORDS)}", paragraph(rng, 40), ""]
+    for section in range(rng.randint(3, 8)):
+        lines += [f"## Section {section}", paragraph(rng, rng.randint(20, 120)), ""]
+        for subsection in range(rng.randint(0, 3)):
+            lines += [f"### Step {section}.{subsection}"]
+            kind = rng.random()
+            if kind < 0.25:
+                lines += ["| Name | Owner | Status |", "|---|---|---|"]
+                lines += [f"| {rng.choice(WORDS)} | {rng.choice(WORDS)} | {rng.choice(WORDS)} |"
+                          for _ in range(rng.randint(3, 30))]
+            elif kind < 0.5:
+                lines += ["```yaml"] + [f"{rng.choice(WORDS)}: {rng.randint(0, 999)}"
+                                        for _ in range(rng.randint(5, 40))] + ["```"]
+            elif kind < 0.7:
+                lines += [f"- {paragraph(rng, 12)}" for _ in range(rng.randint(3, 12))]
+            else:
+                # oversize sections are token-split
+                lines += [paragraph(rng, rng.randint(300, 900))]
+            lines.append("")
+    return "\n".join(lines)
+
+
+def make_export(pages, seed=0):
+    from langchain.schema import Document
+
+    rng = random.Random(seed)
+    return [Document(page_content=make_page(rng, page_id),
+                     metadata={"id": str(page_id), "title": f"Page {page_id}", "space": "DOCS",
+                               "ancestors": [{"id": str(i), "title": f"Parent {i}"} for i in range(3)],
+                               "labels": ["runbook", "ops"]})
+            for page_id in range(pages)]
+
+
+def timed(func, *args, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = list(func(*args))
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--max-tokens", type=int, default=512)
+    parser.add_argument("--token-overlap", type=int, default=10)
+    parser.add_argument("--encoding", choices=["bytes", "cl100k_base"], default="bytes")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    import tiktoken
+    from alita_tools.utils import tokens
+    if args.encoding == "bytes":
+        encoder = ByteEncoder()
+        tokens._encoder = encoder
+        # the reference TokenTextSplitter loads its encoding by name
+        tiktoken.get_encoding = lambda name: encoder
+    from alita_tools.chunkers.sematic.markdown_chunker import markdown_chunker
+
+    config = {"strip_header": False, "return_each_line": False, "headers_to_split_on": HEADERS_TO_SPLIT_ON,
+              "max_tokens": args.max_tokens, "token_overlap": args.token_overlap}
+    documents = make_export(args.pages)
+    size_mb = sum(len(doc.page_content.encode("utf-8")) for doc in documents) / 2 ** 20
+
+    def reference():
+        # token counts are memoized, start each run cold
+        tokens.clear_token_cache()
+        return reference_markdown_chunker(documents, config)
+
+    ref_time, ref_chunks = timed(reference)
+    new_time, new_chunks = timed(lambda: markdown_chunker(documents, config))
+
+    results = {
+        "pages": args.pages,
+        "export_mb": size_mb,
+        "chunks": len(new_chunks),
+        "encoding": args.encoding,
+        "seconds": {"reference": ref_time, "streaming": new_time},
+        "mb_per_second": {"reference": size_mb / ref_time, "streaming": size_mb / new_time},
+        "identical_chunks": [(c.page_content, c.metadata) for c in ref_chunks]
+                            == [(c.page_content, c.metadata) for c in new_chunks],
+    }
+    print(f"{args.pages} pages, {size_mb:.1f} MB, {len(new_chunks)} chunks")
+    print(f"markdown chunker: {ref_time:.2f} s ({size_mb / ref_time:.1f} MB/s) -> "
+          f"{new_time:.2f} s ({size_mb / new_time:.1f} MB/s)")
+    print(f"identical output: {results['identical_chunks']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Startup cost of the toolkit registry.
+
+Measures wall-clock time and peak RSS of ``import alita_tools`` and of a
+single-toolkit ``get_tools()`` call, each in a fresh interpreter so that
+module caches do not leak between scenarios.
+
+Usage:
+    python benchmarks/bench_startup.py [--toolkit jira] [--repeat 5] [--output results.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+_PROBE = r"""
+import json, resource, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import alita_tools
+imported = time.perf_counter()
+rss_import = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tools = alita_tools.get_tools([{{'type': {toolkit!r}, 'settings': {settings!r}}}], alita=None, llm=None)
+done = time.perf_counter()
+print(json.dumps({{
+    'import_s': imported - start,
+    'get_tools_s': done - imported,
+    'rss_import_kb': rss_import,
+    'rss_get_tools_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'tools': len(tools),
+}}))
+"""
+
+# minimal settings that let each toolkit build its wrapper without network access
+_SETTINGS = {
+    'jira': {'base_url': 'https://jira.example.com', 'token': 'token', 'cloud': True},
+    'confluence': {'base_url': 'https://confluence.example.com', 'token': 'token', 'cloud': True},
+}
+
+
+def run_once(toolkit: str) -> dict:
+    code = _PROBE.format(src=SRC_DIR, toolkit=toolkit, settings=_SETTINGS.get(toolkit, {}))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--toolkit", default="jira")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    runs = [run_once(args.toolkit) for _ in range(args.repeat)]
+    result = {
+        "toolkit": args.toolkit,
+        "repeat": args.repeat,
+        **{key: median(run[key] for run in runs) for key in runs[0]},
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Similarity scoring and threshold search of the statistical chunker on a 10k-split document.
+
+Compares the former per-split Python loops (kept below as the reference) with the
+vectorized implementation in ``chunkers/sematic/statistical_chunker.py`` and checks
+that both produce the same split indices and chunks (scores and the threshold only
+differ by floating point rounding). Embeddings are
+synthetic topic clusters and splits are whitespace-tokenized, so nothing is
+downloaded and no embedding model is called.
+
+Usage:
+    python benchmarks/bench_statistical_chunker.py [--splits 10000] [--dim 384] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+class WhitespaceEncoder:
+
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+    def encode_batch(self, texts, disallowed_special=()):
+        return [text.split() for text in texts]
+
+
+def reference_similarity_scores(encoded_docs, window_size):
+    raw_similarities = []
+    for idx in range(1, len(encoded_docs)):
+        window_start = max(0, idx - window_size)
+        cumulative_context = np.mean(encoded_docs[window_start:idx], axis=0)
+        curr_sim_score = np.dot(cumulative_context, encoded_docs[idx]) / (
+            np.linalg.norm(cumulative_context) * np.linalg.norm(encoded_docs[idx]) + 1e-10
+        )
+        raw_similarities.append(curr_sim_score)
+    return raw_similarities
+
+
+def reference_split_indices(similarities, calculated_threshold):
+    return [idx + 1 for idx, score in enumerate(similarities) if score < calculated_threshold]
+
+
+def reference_optimal_threshold(token_counts, similarity_scores, min_split_tokens=100, max_split_tokens=300,
+                                split_tokens_tolerance=10, threshold_adjustment=0.01):
+    cumulative_token_counts = np.cumsum([0] + token_counts)
+    median_score = np.median(similarity_scores)
+    std_dev = np.std(similarity_scores)
+    low = max(0.0, float(median_score - std_dev))
+    high = min(1.0, float(median_score + std_dev))
+    calculated_threshold = 0.0
+    while low <= high:
+        calculated_threshold = (low + high) / 2
+        split_indices = reference_split_indices(similarity_scores, calculated_threshold)
+        split_token_counts = [
+            cumulative_token_counts[end] - cumulative_token_counts[start]
+            for start, end in zip([0] + split_indices, split_indices + [len(token_counts)])
+        ]
+        median_tokens = np.median(split_token_counts)
+        if min_split_tokens - split_tokens_tolerance <= median_tokens <= max_split_tokens + split_tokens_tolerance:
+            break
+        elif median_tokens < min_split_tokens:
+            high = calculated_threshold - threshold_adjustment
+        else:
+            low = calculated_threshold + threshold_adjustment
+    return calculated_threshold
+
+
+def make_corpus(splits, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(max(1, splits // 8), dim))
+    topic_of_split = np.repeat(np.arange(len(topics)), 8)[:splits]
+    embeddings = topics[topic_of_split] + 0.8 * rng.normal(size=(splits, dim))
+    docs = [" ".join(["tok"] * int(n)) for n in rng.integers(20, 80, size=splits)]
+    return docs, embeddings
+
+
+def timed(func, *args, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--splits", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--window-size", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    from alita_tools.utils import tokens
+    tokens._encoder = WhitespaceEncoder()
+    from alita_tools.chunkers.sematic import statistical_chunker as chunker
+
+    docs, embeddings = make_corpus(args.splits, args.dim)
+    token_counts = tokens.count_tokens(docs)
+
+    ref_scores_time, ref_scores = timed(reference_similarity_scores, embeddings, args.window_size)
+    new_scores_time, new_scores = timed(chunker._calculate_similarity_scores, embeddings, args.window_size)
+    ref_threshold_time, ref_threshold = timed(reference_optimal_threshold, token_counts, ref_scores)
+    new_threshold_time, new_threshold = timed(
+        lambda: chunker._find_optimal_threshold(docs, new_scores, token_counts=token_counts))
+
+    ref_indices = reference_split_indices(ref_scores, ref_threshold)
+    new_indices = chunker._find_split_indices(new_scores, new_threshold)
+    ref_chunks = chunker._split_documents(docs, ref_indices, ref_scores, token_counts=token_counts)
+    new_split_time, new_chunks = timed(
+        lambda: chunker._split_documents(docs, new_indices, new_scores, token_counts=token_counts))
+
+    results = {
+        "splits": args.splits,
+        "dim": args.dim,
+        "similarity_seconds": {"reference": ref_scores_time, "vectorized": new_scores_time},
+        "threshold_seconds": {"reference": ref_threshold_time, "vectorized": new_threshold_time},
+        "split_documents_seconds": new_split_time,
+        "max_score_difference": float(np.max(np.abs(np.asarray(ref_scores) - np.asarray(new_scores)))),
+        "threshold_difference": abs(ref_threshold - new_threshold),
+        "identical_split_indices": ref_indices == new_indices,
+        "identical_chunks": [(c.splits, c.token_count) for c in ref_chunks]
+                            == [(c.splits, c.token_count) for c in new_chunks],
+    }
+    print(f"similarity: {ref_scores_time * 1000:.1f} ms -> {new_scores_time * 1000:.1f} ms")
+    print(f"threshold search: {ref_threshold_time * 1000:.1f} ms -> {new_threshold_time * 1000:.1f} ms")
+    print(f"split documents: {new_split_time * 1000:.1f} ms")
+    print(f"identical output: indices={results['identical_split_indices']} chunks={results['identical_chunks']} "
+          f"(max score difference {results['max_score_difference']:.2e}, "
+          f"threshold difference {results['threshold_difference']:.2e})")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
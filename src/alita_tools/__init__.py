@@ -1,52 +1,151 @@
 import logging
 from importlib import import_module
 
-from .github import get_tools as get_github, AlitaGitHubToolkit
-from .openapi import get_tools as get_openapi
-from .jira import get_tools as get_jira, JiraToolkit
-from .confluence import get_tools as get_confluence, ConfluenceToolkit
-from .servicenow import get_tools as get_service_now, ServiceNowToolkit
-from .gitlab import get_tools as get_gitlab, AlitaGitlabToolkit
-from .gitlab_org import get_tools as get_gitlab_org, AlitaGitlabSpaceToolkit
-from .zephyr import get_tools as get_zephyr, ZephyrToolkit
-from .browser import get_tools as get_browser, BrowserToolkit
-from .report_portal import get_tools as get_report_portal, ReportPortalToolkit
-from .bitbucket import get_tools as get_bitbucket, AlitaBitbucketToolkit
-from .testrail import get_tools as get_testrail, TestrailToolkit
-from .testio import get_tools as get_testio, TestIOToolkit
-from .xray import get_tools as get_xray_cloud, XrayToolkit
-from .sharepoint import get_tools as get_sharepoint, SharepointToolkit
-from .qtest import get_tools as get_qtest, QtestToolkit
-from .zephyr_scale import get_tools as get_zephyr_scale, ZephyrScaleToolkit
-from .zephyr_enterprise import get_tools as get_zephyr_enterprise, ZephyrEnterpriseToolkit
-from .ado import get_tools as get_ado
-from .ado.repos import get_tools as  get_ado_repo,  AzureDevOpsReposToolkit
-from .ado.test_plan import AzureDevOpsPlansToolkit
-from .ado.work_item import AzureDevOpsWorkItemsToolkit
-from .ado.wiki import AzureDevOpsWikiToolkit
-from .rally import get_tools as get_rally, RallyToolkit
-from .sql import get_tools as get_sql, SQLToolkit
-from .code.sonar import get_tools as get_sonar, SonarToolkit
-from .google_places import get_tools as get_google_places, GooglePlacesToolkit
-from .yagmail import get_tools as get_yagmail, AlitaYagmailToolkit
-from .cloud.aws import AWSToolkit
-from .cloud.azure import AzureToolkit
-from .cloud.gcp import GCPToolkit
-from .cloud.k8s import KubernetesToolkit
-from .custom_open_api import OpenApiToolkit as CustomOpenApiToolkit
-from .elastic import ElasticToolkit
-from .keycloak import KeycloakToolkit
-from .localgit import AlitaLocalGitToolkit
-from .pandas import get_tools as get_pandas, PandasToolkit
-from .azure_ai.search import AzureSearchToolkit, get_tools as get_azure_search
-from .figma import get_tools as get_figma, FigmaToolkit
-from .salesforce import get_tools as get_salesforce, SalesforceToolkit
-from .carrier import get_tools as get_carrier, AlitaCarrierToolkit
-from .ocr import get_tools as get_ocr, OCRToolkit
-from .pptx import get_tools as get_pptx, PPTXToolkit
-
 logger = logging.getLogger(__name__)
 
+# Toolkit packages are heavy (OCR pulls cv2, chunkers pull tree_sitter, etc.), so nothing
+# below is imported until a toolkit of the corresponding type is actually requested.
+
+# toolkit type -> (module, name of its ``get_tools`` entry point)
+_TOOLS_REGISTRY = {
+    'openapi': ('.openapi', 'get_tools'),
+    'github': ('.github', 'get_tools'),
+    'jira': ('.jira', 'get_tools'),
+    'confluence': ('.confluence', 'get_tools'),
+    'service_now': ('.servicenow', 'get_tools'),
+    'gitlab': ('.gitlab', 'get_tools'),
+    'gitlab_org': ('.gitlab_org', 'get_tools'),
+    'zephyr': ('.zephyr', 'get_tools'),
+    'browser': ('.browser', 'get_tools'),
+    'yagmail': ('.yagmail', 'get_tools'),
+    'report_portal': ('.report_portal', 'get_tools'),
+    'bitbucket': ('.bitbucket', 'get_tools'),
+    'testrail': ('.testrail', 'get_tools'),
+    'ado_boards': ('.ado', 'get_tools'),
+    'ado_wiki': ('.ado', 'get_tools'),
+    'ado_plans': ('.ado', 'get_tools'),
+    'ado_repos': ('.ado.repos', 'get_tools'),
+    'azure_devops_repos': ('.ado.repos', 'get_tools'),
+    'testio': ('.testio', 'get_tools'),
+    'xray_cloud': ('.xray', 'get_tools'),
+    'sharepoint': ('.sharepoint', 'get_tools'),
+    'qtest': ('.qtest', 'get_tools'),
+    'zephyr_scale': ('.zephyr_scale', 'get_tools'),
+    'zephyr_enterprise': ('.zephyr_enterprise', 'get_tools'),
+    'rally': ('.rally', 'get_tools'),
+    'sql': ('.sql', 'get_tools'),
+    'sonar': ('.code.sonar', 'get_tools'),
+    'google_places': ('.google_places', 'get_tools'),
+    'azure_search': ('.azure_ai.search', 'get_tools'),
+    'pandas': ('.pandas', 'get_tools'),
+    'figma': ('.figma', 'get_tools'),
+    'salesforce': ('.salesforce', 'get_tools'),
+    'carrier': ('.carrier', 'get_tools'),
+    'ocr': ('.ocr', 'get_tools'),
+    'pptx': ('.pptx', 'get_tools'),
+}
+
+# ADO boards/wiki/plans share a single entry point that dispatches on the toolkit type
+_TYPED_TOOLS = {'ado_boards', 'ado_wiki', 'ado_plans'}
+
+# (module, toolkit class) in the order get_toolkits() reports them
+_TOOLKITS_REGISTRY = [
+    ('.github', 'AlitaGitHubToolkit'),
+    ('.testrail', 'TestrailToolkit'),
+    ('.jira', 'JiraToolkit'),
+    ('.ado.test_plan', 'AzureDevOpsPlansToolkit'),
+    ('.ado.wiki', 'AzureDevOpsWikiToolkit'),
+    ('.ado.work_item', 'AzureDevOpsWorkItemsToolkit'),
+    ('.rally', 'RallyToolkit'),
+    ('.qtest', 'QtestToolkit'),
+    ('.report_portal', 'ReportPortalToolkit'),
+    ('.testio', 'TestIOToolkit'),
+    ('.sql', 'SQLToolkit'),
+    ('.code.sonar', 'SonarToolkit'),
+    ('.google_places', 'GooglePlacesToolkit'),
+    ('.browser', 'BrowserToolkit'),
+    ('.xray', 'XrayToolkit'),
+    ('.gitlab', 'AlitaGitlabToolkit'),
+    ('.confluence', 'ConfluenceToolkit'),
+    ('.servicenow', 'ServiceNowToolkit'),
+    ('.bitbucket', 'AlitaBitbucketToolkit'),
+    ('.gitlab_org', 'AlitaGitlabSpaceToolkit'),
+    ('.zephyr_scale', 'ZephyrScaleToolkit'),
+    ('.zephyr_enterprise', 'ZephyrEnterpriseToolkit'),
+    ('.zephyr', 'ZephyrToolkit'),
+    ('.yagmail', 'AlitaYagmailToolkit'),
+    ('.sharepoint', 'SharepointToolkit'),
+    ('.ado.repos', 'AzureDevOpsReposToolkit'),
+    ('.cloud.aws', 'AWSToolkit'),
+    ('.cloud.azure', 'AzureToolkit'),
+    ('.cloud.gcp', 'GCPToolkit'),
+    ('.cloud.k8s', 'KubernetesToolkit'),
+    ('.custom_open_api', 'OpenApiToolkit'),
+    ('.elastic', 'ElasticToolkit'),
+    ('.keycloak', 'KeycloakToolkit'),
+    ('.localgit', 'AlitaLocalGitToolkit'),
+    ('.pandas', 'PandasToolkit'),
+    ('.azure_ai.search', 'AzureSearchToolkit'),
+    ('.figma', 'FigmaToolkit'),
+    ('.salesforce', 'SalesforceToolkit'),
+    ('.carrier', 'AlitaCarrierToolkit'),
+    ('.ocr', 'OCRToolkit'),
+    ('.pptx', 'PPTXToolkit'),
+]
+
+# Names historically re-exported from this package, resolved on first attribute access
+_LAZY_EXPORTS = {
+    'get_openapi': ('.openapi', 'get_tools'),
+    'get_github': ('.github', 'get_tools'),
+    'get_jira': ('.jira', 'get_tools'),
+    'get_confluence': ('.confluence', 'get_tools'),
+    'get_service_now': ('.servicenow', 'get_tools'),
+    'get_gitlab': ('.gitlab', 'get_tools'),
+    'get_gitlab_org': ('.gitlab_org', 'get_tools'),
+    'get_zephyr': ('.zephyr', 'get_tools'),
+    'get_browser': ('.browser', 'get_tools'),
+    'get_report_portal': ('.report_portal', 'get_tools'),
+    'get_bitbucket': ('.bitbucket', 'get_tools'),
+    'get_testrail': ('.testrail', 'get_tools'),
+    'get_testio': ('.testio', 'get_tools'),
+    'get_xray_cloud': ('.xray', 'get_tools'),
+    'get_sharepoint': ('.sharepoint', 'get_tools'),
+    'get_qtest': ('.qtest', 'get_tools'),
+    'get_zephyr_scale': ('.zephyr_scale', 'get_tools'),
+    'get_zephyr_enterprise': ('.zephyr_enterprise', 'get_tools'),
+    'get_ado': ('.ado', 'get_tools'),
+    'get_ado_repo': ('.ado.repos', 'get_tools'),
+    'get_rally': ('.rally', 'get_tools'),
+    'get_sql': ('.sql', 'get_tools'),
+    'get_sonar': ('.code.sonar', 'get_tools'),
+    'get_google_places': ('.google_places', 'get_tools'),
+    'get_yagmail': ('.yagmail', 'get_tools'),
+    'get_pandas': ('.pandas', 'get_tools'),
+    'get_azure_search': ('.azure_ai.search', 'get_tools'),
+    'get_figma': ('.figma', 'get_tools'),
+    'get_salesforce': ('.salesforce', 'get_tools'),
+    'get_carrier': ('.carrier', 'get_tools'),
+    'get_ocr': ('.ocr', 'get_tools'),
+    'get_pptx': ('.pptx', 'get_tools'),
+    'CustomOpenApiToolkit': ('.custom_open_api', 'OpenApiToolkit'),
+    **{class_name: (module, class_name) for module, class_name in _TOOLKITS_REGISTRY
+       if class_name != 'OpenApiToolkit'},
+}
+
+
+def _resolve(module: str, attr: str):
+    """Imports ``module`` relative to this package and returns ``attr`` from it."""
+    return getattr(import_module(module, __name__), attr)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = _resolve(*_LAZY_EXPORTS[name])
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_tools(tools_list, alita: 'AlitaClient', llm: 'LLMLikeObject', *args, **kwargs):
     tools = []
     for tool in tools_list:
@@ -56,70 +155,13 @@ def get_tools(tools_list, alita: 'AlitaClient', llm: 'LLMLikeObject', *args, **k
                 raise ValueError(f"Tool name '{tool_name}' from toolkit '{tool.get('type', '')}' cannot start with '_'")
         tool['settings']['alita'] = alita
         tool['settings']['llm'] = llm
-        if tool['type'] == 'openapi':
-            tools.extend(get_openapi(tool))
-        elif tool['type'] == 'github':
-            tools.extend(get_github(tool))
-        elif tool['type'] == 'jira':
-            tools.extend(get_jira(tool))
-        elif tool['type'] == 'confluence':
-            tools.extend(get_confluence(tool))
-        elif tool['type'] == 'service_now':
-            tools.extend(get_service_now(tool))
-        elif tool['type'] == 'gitlab':
-            tools.extend(get_gitlab(tool))
-        elif tool['type'] == 'gitlab_org':
-            tools.extend(get_gitlab_org(tool))
-        elif tool['type'] == 'zephyr':
-            tools.extend(get_zephyr(tool))
-        elif tool['type'] == 'browser':
-            tools.extend(get_browser(tool))
-        elif tool['type'] == 'yagmail':
-            tools.extend(get_yagmail(tool))
-        elif tool['type'] == 'report_portal':
-            tools.extend(get_report_portal(tool))
-        elif tool['type'] == 'bitbucket':
-            tools.extend(get_bitbucket(tool))
-        elif tool['type'] == 'testrail':
-            tools.extend(get_testrail(tool))
-        elif tool['type'] in ['ado_boards', 'ado_wiki', 'ado_plans']:
-            tools.extend(get_ado(tool['type'], tool))
-        elif tool['type'] in ['ado_repos', 'azure_devops_repos']:
-            tools.extend(get_ado_repo(tool))
-        elif tool['type'] == 'testio':
-            tools.extend(get_testio(tool))
-        elif tool['type'] == 'xray_cloud':
-            tools.extend(get_xray_cloud(tool))
-        elif tool['type'] == 'sharepoint':
-            tools.extend(get_sharepoint(tool))
-        elif tool['type'] == 'qtest':
-            tools.extend(get_qtest(tool))
-        elif tool['type'] == 'zephyr_scale':
-            tools.extend(get_zephyr_scale(tool))
-        elif tool['type'] == 'zephyr_enterprise':
-            tools.extend(get_zephyr_enterprise(tool))
-        elif tool['type'] == 'rally':
-            tools.extend(get_rally(tool))
-        elif tool['type'] == 'sql':
-            tools.extend(get_sql(tool))
-        elif tool['type'] == 'sonar':
-            tools.extend(get_sonar(tool))
-        elif tool['type'] == 'google_places':
-            tools.extend(get_google_places(tool))
-        elif tool['type'] == 'azure_search':
-            tools.extend(get_azure_search(tool))
-        elif tool['type'] == 'pandas':
-            tools.extend(get_pandas(tool))
-        elif tool['type'] == 'figma':
-            tools.extend(get_figma(tool))
-        elif tool['type'] == 'salesforce':
-            tools.extend(get_salesforce(tool))
-        elif tool['type'] == 'carrier':
-            tools.extend(get_carrier(tool))
-        elif tool['type'] == 'ocr':
-            tools.extend(get_ocr(tool))
-        elif tool['type'] == 'pptx':
-            tools.extend(get_pptx(tool))
+        tool_type = tool['type']
+        if tool_type in _TOOLS_REGISTRY:
+            toolkit_tools = _resolve(*_TOOLS_REGISTRY[tool_type])
+            if tool_type in _TYPED_TOOLS:
+                tools.extend(toolkit_tools(tool_type, tool))
+            else:
+                tools.extend(toolkit_tools(tool))
         else:
             if tool.get("settings", {}).get("module"):
                 try:
@@ -132,47 +174,13 @@ def get_tools(tools_list, alita: 'AlitaClient', llm: 'LLMLikeObject', *args, **k
                     logger.error(f"Error in getting toolkit: {e}")
     return tools
 
+
 def get_toolkits():
-    return [
-        AlitaGitHubToolkit.toolkit_config_schema(),
-        TestrailToolkit.toolkit_config_schema(),
-        JiraToolkit.toolkit_config_schema(),
-        AzureDevOpsPlansToolkit.toolkit_config_schema(),
-        AzureDevOpsWikiToolkit.toolkit_config_schema(),
-        AzureDevOpsWorkItemsToolkit.toolkit_config_schema(),
-        RallyToolkit.toolkit_config_schema(),
-        QtestToolkit.toolkit_config_schema(),
-        ReportPortalToolkit.toolkit_config_schema(),
-        TestIOToolkit.toolkit_config_schema(),
-        SQLToolkit.toolkit_config_schema(),
-        SonarToolkit.toolkit_config_schema(),
-        GooglePlacesToolkit.toolkit_config_schema(),
-        BrowserToolkit.toolkit_config_schema(),
-        XrayToolkit.toolkit_config_schema(),
-        AlitaGitlabToolkit.toolkit_config_schema(),
-        ConfluenceToolkit.toolkit_config_schema(),
-        ServiceNowToolkit.toolkit_config_schema(),
-        AlitaBitbucketToolkit.toolkit_config_schema(),
-        AlitaGitlabSpaceToolkit.toolkit_config_schema(),
-        ZephyrScaleToolkit.toolkit_config_schema(),
-        ZephyrEnterpriseToolkit.toolkit_config_schema(),
-        ZephyrToolkit.toolkit_config_schema(),
-        AlitaYagmailToolkit.toolkit_config_schema(),
-        SharepointToolkit.toolkit_config_schema(),
-        AzureDevOpsReposToolkit.toolkit_config_schema(),
-        AWSToolkit.toolkit_config_schema(),
-        AzureToolkit.toolkit_config_schema(),
-        GCPToolkit.toolkit_config_schema(),
-        KubernetesToolkit.toolkit_config_schema(),
-        CustomOpenApiToolkit.toolkit_config_schema(),
-        ElasticToolkit.toolkit_config_schema(),
-        KeycloakToolkit.toolkit_config_schema(),
-        AlitaLocalGitToolkit.toolkit_config_schema(),
-        PandasToolkit.toolkit_config_schema(),
-        AzureSearchToolkit.toolkit_config_schema(),
-        FigmaToolkit.toolkit_config_schema(),
-        SalesforceToolkit.toolkit_config_schema(),
-        AlitaCarrierToolkit.toolkit_config_schema(),
-        OCRToolkit.toolkit_config_schema(),
-        PPTXToolkit.toolkit_config_schema(),
-    ]
+    from .schema_cache import get_toolkit_models
+    return get_toolkit_models()
+
+
+def get_toolkits_json_schemas():
+    """Returns JSON schemas of all toolkits, served from the prebuilt artifact when available."""
+    from .schema_cache import get_toolkit_json_schemas
+    return get_toolkit_json_schemas()
@@ -243,6 +243,7 @@ indexAdoRepoParams = create_model(
     whitelist=(Optional[List[str]], Field(description="File extensions or paths to include. Defaults to all files if None.", default=None)),
     blacklist=(Optional[List[str]], Field(description="File extensions or paths to exclude. Defaults to no exclusions if None.", default=None)),
     collection_suffix=(Optional[str], Field(description="Optional suffix for collection name (max 7 characters)", default="", max_length=7)),
+    incremental=(Optional[bool], Field(description="Only index files added or changed since the previous incremental run and delete documents of removed files", default=False)),
 )
 
 searchAdoRepoParams = create_model(
@@ -399,6 +400,27 @@ class ReposApiWrapper(BaseCodeToolApiWrapper):
                 files.append(item.path)
         return str(files)
 
+    def _get_cache_state(self) -> Dict[str, Any]:
+        # set_active_branch and read_file change the branch that reads are served from
+        return {"repository_id": self.repository_id, "branch": self.active_branch}
+
+    def _get_index_identity(self) -> List[Optional[str]]:
+        return [self.organization_url, self.project, self.repository_id]
+
+    def _get_file_versions(self, branch: str) -> Optional[Dict[str, str]]:
+        """Returns the blob object id of every file in the branch, listed in a single request."""
+        version_descriptor = GitVersionDescriptor(
+            version=branch or self.base_branch, version_type="branch"
+        )
+        items = self._client.get_items(
+            repository_id=self.repository_id,
+            project=self.project,
+            scope_path="",
+            recursion_level="Full",
+            version_descriptor=version_descriptor,
+        )
+        return {item.path: item.object_id for item in items if item.git_object_type == "blob"}
+
     def set_active_branch(self, branch_name: str) -> str:
         """
         Equivalent to `git checkout branch_name` for this Agent.
@@ -1207,6 +1229,7 @@ class ReposApiWrapper(BaseCodeToolApiWrapper):
             {
                 "ref": self.set_active_branch,
                 "name": "set_active_branch",
+                "cache": "write",
                 "description": self.set_active_branch.__doc__,
                 "args_schema": ArgsSchema.BranchName.value,
             },
@@ -1225,42 +1248,49 @@ class ReposApiWrapper(BaseCodeToolApiWrapper):
             {
                 "ref": self.get_pull_request,
                 "name": "get_pull_request",
+                "cache": "read",
                 "description": self.get_pull_request.__doc__,
                 "args_schema": ArgsSchema.GetPR.value,
             },
             {
                 "ref": self.list_pull_request_diffs,
                 "name": "list_pull_request_files",
+                "cache": "read",
                 "description": self.list_pull_request_diffs.__doc__,
                 "args_schema": ArgsSchema.GetPR.value,
             },
             {
                 "ref": self.create_branch,
                 "name": "create_branch",
+                "cache": "write",
                 "description": self.create_branch.__doc__,
                 "args_schema": ArgsSchema.BranchName.value,
             },
             {
                 "ref": self._read_file,
                 "name": "read_file",
+                "cache": "read",
                 "description": self._read_file.__doc__,
                 "args_schema": ArgsSchema.ReadFile.value,
             },
             {
                 "ref": self.create_file,
                 "name": "create_file",
+                "cache": "write",
                 "description": self.create_file.__doc__,
                 "args_schema": ArgsSchema.CreateFile.value,
             },
             {
                 "ref": self.update_file,
                 "name": "update_file",
+                "cache": "write",
                 "description": self.update_file.__doc__,
                 "args_schema": ArgsSchema.UpdateFile.value,
             },
             {
                 "ref": self.delete_file,
                 "name": "delete_file",
+                "cache": "write",
                 "description": self.delete_file.__doc__,
                 "args_schema": ArgsSchema.DeleteFile.value,
             },
@@ -1273,12 +1303,14 @@ class ReposApiWrapper(BaseCodeToolApiWrapper):
             {
                 "ref": self.comment_on_pull_request,
                 "name": "comment_on_pull_request",
+                "cache": "write",
                 "description": self.comment_on_pull_request.__doc__,
                 "args_schema": ArgsSchema.CommentOnPullRequest.value,
             },
             {
                 "ref": self.create_pr,
                 "name": "create_pull_request",
+                "cache": "write",
                 "description": self.create_pr.__doc__,
                 "args_schema": ArgsSchema.CreatePullRequest.value,
             },
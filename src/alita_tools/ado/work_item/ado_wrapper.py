@@ -511,48 +511,56 @@ class AzureDevOpsApiWrapper(BaseToolApiWrapper):
             },
             {
                 "name": "create_work_item",
+                "cache": "write",
                 "description": self.create_work_item.__doc__,
                 "args_schema": ADOCreateWorkItem,
                 "ref": self.create_work_item,
             },
             {
                 "name": "update_work_item",
+                "cache": "write",
                 "description": self.update_work_item.__doc__,
                 "args_schema": ADOUpdateWorkItem,
                 "ref": self.update_work_item,
             },
             {
                 "name": "get_work_item",
+                "cache": "read",
                 "description": self.get_work_item.__doc__,
                 "args_schema": ADOGetWorkItem,
                 "ref": self.get_work_item,
             },
             {
                 "name": "link_work_items",
+                "cache": "write",
                 "description": self.link_work_items.__doc__,
                 "args_schema": ADOLinkWorkItem,
                 "ref": self.link_work_items,
             },
             {
                 "name": "get_relation_types",
+                "cache": "read",
                 "description": self.get_relation_types.__doc__,
                 "args_schema": ADOGetLinkType,
                 "ref": self.get_relation_types,
             },
             {
                 "name": "get_comments",
+                "cache": "read",
                 "description": self.get_comments.__doc__,
                 "args_schema": ADOGetComments,
                 "ref": self.get_comments,
             },
             {
                 "name": "link_work_items_to_wiki_page",
+                "cache": "write",
                 "description": self.link_work_items_to_wiki_page.__doc__,
                 "args_schema": ADOLinkWorkItemsToWikiPage,
                 "ref": self.link_work_items_to_wiki_page,
             },
             {
                 "name": "unlink_work_items_from_wiki_page",
+                "cache": "write",
                 "description": self.unlink_work_items_from_wiki_page.__doc__,
                 "args_schema": ADOUnlinkWorkItemsFromWikiPage,
                 "ref": self.unlink_work_items_from_wiki_page,
@@ -1,11 +1,14 @@
 
 from typing import Optional, Type, Any
 
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
 from pydantic import BaseModel
 from pydantic import Field
 from langchain_core.tools import BaseTool, ToolException
 
+from ..utils import instrumentation
+from ..utils.executor import run_in_executor
+
 
 class BaseAction(BaseTool):
     """Tool for interacting with the Confluence API."""
@@ -22,7 +25,24 @@ class BaseAction(BaseTool):
         **kwargs: Any,
     ) -> ToolException | str:
         """Use the Confluence API to run an operation."""
+        with instrumentation.tool_call(type(self.api_wrapper).__name__, self.name) as scope:
+            try:
+                result = self.api_wrapper.run(self.name, *args, **kwargs)
+            except Exception as e:
+                result = ToolException(f"An exception occurred: {e}")
+            scope.set_output(result)
+        return result
+
+    async def _arun(
+        self,
+        *args: Any,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> ToolException | str:
+        """Use the API wrapper to run an operation without blocking the event loop."""
         try:
-            return self.api_wrapper.run(self.name, *args, **kwargs)
+            if hasattr(self.api_wrapper, "arun"):
+                return await self.api_wrapper.arun(self.name, *args, **kwargs)
+            return await run_in_executor(self.api_wrapper.run, self.name, *args, **kwargs)
         except Exception as e:
             return ToolException(f"An exception occurred: {e}")
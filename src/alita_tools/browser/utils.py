@@ -1,5 +1,4 @@
 import re
-import requests
 from langchain_community.document_loaders import AsyncChromiumLoader
 from langchain_community.document_transformers import BeautifulSoupTransformer
 from langchain.text_splitter import CharacterTextSplitter
@@ -14,6 +13,8 @@ from langchain_community.embeddings.sentence_transformer import (
     SentenceTransformerEmbeddings,
 )
 
+from ..utils.http_session import get_session
+
 # retrieves pages and extracts text by tag
 def get_page(urls, html_only=False):
     loader = AsyncChromiumLoader(urls)
@@ -49,7 +50,7 @@ def webRag(urls, max_response_size, query):
 
 
 def getPDFContent(url):
-    response = requests.get(url)
+    response = get_session().get(url)
     # Check if the request was successful
     if response.status_code == 200:
         # Open the PDF from the bytes in memory
@@ -4,6 +4,8 @@ import requests
 from typing import Any, Dict, List
 from pydantic import BaseModel, Field
 
+from ..utils.http_session import get_session
+
 logger = logging.getLogger("carrier_sdk")
 
 
@@ -128,8 +130,8 @@ class CarrierClient(BaseModel):
     def upload_excel_report(self, bucket_name: str, excel_report_name: str):
         upload_url = f'api/v1/artifacts/artifacts/{self.credentials.project_id}/{bucket_name}'
         full_url = f"{self.credentials.url.rstrip('/')}/{upload_url.lstrip('/')}"
-        files = {'file': open(excel_report_name, 'rb')}
         headers = {'Authorization': f'bearer {self.credentials.token}'}
         s3_config = {'integration_id': 1, 'is_local': False}
-        requests.post(full_url, params=s3_config, allow_redirects=True, files=files, headers=headers)
+        with open(excel_report_name, 'rb') as report:
+            get_session().post(full_url, params=s3_config, allow_redirects=True, files={'file': report}, headers=headers)
 
@@ -8,6 +8,8 @@ from .treesitter_registry import TreesitterRegistry
 
 
 class TreesitterMethodNode:
+    __slots__ = ("name", "doc_comment", "node", "_method_source_code")
+
     def __init__(
         self,
         name: "str | bytes | None",
@@ -17,8 +19,19 @@ class TreesitterMethodNode:
     ):
         self.name = name
         self.doc_comment = doc_comment
-        self.method_source_code = method_source_code or node.text.decode()
         self.node = node
+        self._method_source_code = method_source_code or None
+
+    @property
+    def method_source_code(self) -> str:
+        # decoded on first access only
+        if self._method_source_code is None:
+            self._method_source_code = self.node.text.decode()
+        return self._method_source_code
+
+    @method_source_code.setter
+    def method_source_code(self, value: str):
+        self._method_source_code = value
 
 
 class Treesitter(ABC):
@@ -31,6 +44,7 @@ class Treesitter(ABC):
     ):
         self.parser = get_parser(language.value)
         self.language = get_language(language.value)
+        self.language_name = language
         self.method_declaration_identifier = method_declaration_identifier
         self.method_name_identifier = name_identifier
         self.doc_comment_identifier = doc_comment_identifier
@@ -39,6 +53,15 @@ class Treesitter(ABC):
     def create_treesitter(language: Language) -> "Treesitter":
         return TreesitterRegistry.create_treesitter(language)
 
+    def _get_query(self, query_code: str):
+        """Returns the query compiled for the language of this parser; compiled once per process."""
+        return TreesitterRegistry.get_query(self.language_name, self.language, query_code)
+
+    @staticmethod
+    def get_treesitter(language: Language) -> "Treesitter":
+        """Returns the pooled parser of the language; unlike `create_treesitter` it is reused across files."""
+        return TreesitterRegistry.get_treesitter(language)
+
     def parse(self, file_bytes: bytes) -> list[TreesitterMethodNode]:
         """
         Parses the given file bytes and extracts method nodes.
@@ -65,7 +88,7 @@ class Treesitter(ABC):
         node: tree_sitter.Node,
     ):
         """
-        Recursively queries all method nodes in the given syntax tree node.
+        Queries all method nodes in the given syntax tree node; nodes nested in a method are not visited.
 
         Args:
             node (tree_sitter.Node): The root node to start the query from.
@@ -73,19 +96,53 @@ class Treesitter(ABC):
         Returns:
             list: A list of dictionaries, each containing a method node and its associated doc comment (if any).
         """
-        methods = []
-        if node.type == self.method_declaration_identifier:
-            doc_comment_node = None
-            if (
-                node.prev_named_sibling
-                and node.prev_named_sibling.type == self.doc_comment_identifier
-            ):
-                doc_comment_node = node.prev_named_sibling.text.decode()
-            methods.append({"method": node, "doc_comment": doc_comment_node})
-        else:
-            for child in node.children:
-                methods.extend(self._query_all_methods(child))
-        return methods
+        return [
+            {"method": method, "doc_comment": self._query_doc_comment(method)}
+            for method in self._iter_method_nodes(node)
+        ]
+
+    def _iter_method_nodes(self, node: tree_sitter.Node):
+        """
+        Yields method declaration nodes in document order with an iterative `TreeCursor` walk,
+        so deeply nested code cannot exceed the recursion limit.
+        """
+        cursor = node.walk()
+        while True:
+            current = cursor.node
+            if current.type == self.method_declaration_identifier:
+                yield current
+            elif cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return
+
+    def _query_doc_comment(self, node: tree_sitter.Node):
+        """
+        Returns the doc comment directly preceding the method node.
+
+        Args:
+            node (tree_sitter.Node): The method node.
+
+        Returns:
+            str or None: The comment text if found, otherwise None.
+        """
+        if (
+            node.prev_named_sibling
+            and node.prev_named_sibling.type == self.doc_comment_identifier
+        ):
+            return node.prev_named_sibling.text.decode()
+        return None
+
+    def _query_doc_comment_lines(self, node: tree_sitter.Node) -> list:
+        """Returns the texts of all consecutive doc comment nodes preceding the method node, top to bottom."""
+        comments = []
+        sibling = node.prev_named_sibling
+        while sibling and sibling.type == self.doc_comment_identifier:
+            comments.append(sibling.text.decode())
+            sibling = sibling.prev_named_sibling
+        comments.reverse()
+        return comments
 
     def _query_method_name(self, node: tree_sitter.Node):
         """
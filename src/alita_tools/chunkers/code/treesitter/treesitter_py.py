@@ -5,6 +5,12 @@ from .treesitter import Treesitter, TreesitterMethodNode
 from .treesitter_registry import TreesitterRegistry
 
 
+DOC_STRING_QUERY = """
+    (function_definition
+        body: (block . (expression_statement (string)) @function_doc_str))
+"""
+
+
 class TreesitterPython(Treesitter):
     def __init__(self):
         super().__init__(
@@ -26,7 +32,7 @@ class TreesitterPython(Treesitter):
         methods = self._query_all_methods(self.tree.root_node)
         for method in methods:
             method_name = self._query_method_name(method)
-            doc_comment = self._query_doc_comment(method)
+            doc_comment = self._query_docstring(method)
             result.append(TreesitterMethodNode(method_name, doc_comment, None, method))
         return result
 
@@ -67,7 +73,7 @@ class TreesitterPython(Treesitter):
                         methods.append(child_node)
         return methods
 
-    def _query_doc_comment(self, node: tree_sitter.Node):
+    def _query_docstring(self, node: tree_sitter.Node):
         """
         Queries the documentation comment for the given function definition node.
 
@@ -77,11 +83,7 @@ class TreesitterPython(Treesitter):
         Returns:
             str or None: The documentation comment string if found, otherwise None.
         """
-        query_code = """
-            (function_definition
-                body: (block . (expression_statement (string)) @function_doc_str))
-        """
-        doc_str_query = self.language.query(query_code)
+        doc_str_query = self._get_query(DOC_STRING_QUERY)
         doc_strs = doc_str_query.captures(node)
 
         if doc_strs:
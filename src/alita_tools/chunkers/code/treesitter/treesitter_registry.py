@@ -1,8 +1,15 @@
+import threading
+
 from ..constants import Language
 
 
 class TreesitterRegistry:
     _registry = {}
+    # parsers are not thread-safe, so pooled instances are kept per thread
+    _pool = threading.local()
+    # compiled tree-sitter queries by (language, query source); queries are immutable and shared
+    _queries = {}
+    _queries_lock = threading.Lock()
 
     @classmethod
     def register_treesitter(cls, name, treesitter_class):
@@ -15,3 +22,26 @@ class TreesitterRegistry:
             return treesitter_class()
         else:
             raise ValueError("Invalid tree type")
+
+    @classmethod
+    def get_treesitter(cls, name: Language):
+        """Returns a pooled instance for the language, created on first use in the current thread."""
+        instances = getattr(cls._pool, "instances", None)
+        if instances is None:
+            instances = cls._pool.instances = {}
+        instance = instances.get(name)
+        if instance is None:
+            instance = instances[name] = cls.create_treesitter(name)
+        return instance
+
+    @classmethod
+    def get_query(cls, name: Language, language, query_code: str):
+        """Returns `query_code` compiled for the tree-sitter `language`, compiling it on first use."""
+        key = (name, query_code)
+        query = cls._queries.get(key)
+        if query is None:
+            with cls._queries_lock:
+                query = cls._queries.get(key)
+                if query is None:
+                    query = cls._queries[key] = language.query(query_code)
+        return query
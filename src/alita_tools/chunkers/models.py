@@ -14,6 +14,7 @@ class StatisticalChunkerConfig(BaseModel):
     split_tokens_tolerance: int = Field(default=10, description="Tolerance for split token counts")
     threshold_adjustment: float = Field(default=0.01, description="Threshold adjustment for binary search")
     score_threshold: float = Field(default=0.5, description="Score threshold when not using dynamic threshold")
+    max_concurrent_batches: int = Field(default=4, description="Number of split batches embedded concurrently")
     
     @model_validator(mode='after')
     def validate_required_runtime_fields(self):
@@ -38,6 +39,7 @@ class ProposalChunkerConfig(BaseModel):
     """Configuration for proposal chunker"""
     llm: Optional[Any] = Field(default=None, description="LLM model instance for generating proposals")
     max_doc_tokens: int = Field(default=1024, description="Maximum tokens per document before splitting")
+    max_concurrency: int = Field(default=4, description="Number of splits analyzed by the LLM concurrently")
     
     @model_validator(mode='after')
     def validate_required_runtime_fields(self):
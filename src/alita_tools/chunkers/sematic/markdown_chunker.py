@@ -1,9 +1,24 @@
-from typing import Generator
+from typing import Generator, List
 from langchain.schema import Document
 from langchain_text_splitters import MarkdownHeaderTextSplitter
-from langchain.text_splitter import TokenTextSplitter
-from ..utils import tiktoken_length
-from copy import deepcopy as copy
+from ...utils.tokens import get_encoder
+
+
+def _split_tokens(encoder, token_ids: List[int], max_tokens: int, tokens_overlapping: int) -> List[str]:
+    # same windows as TokenTextSplitter.split_text, on token ids that are already encoded
+    if max_tokens <= tokens_overlapping:
+        raise ValueError("tokens_per_chunk must be greater than chunk_overlap")
+    splits = []
+    start_idx = 0
+    while start_idx < len(token_ids):
+        cur_idx = min(start_idx + max_tokens, len(token_ids))
+        decoded = encoder.decode(token_ids[start_idx:cur_idx])
+        if decoded:
+            splits.append(decoded)
+        if cur_idx == len(token_ids):
+            break
+        start_idx += max_tokens - tokens_overlapping
+    return splits
 
 
 def markdown_chunker(file_content_generator: Generator[Document, None, None], config: dict, *args, **kwargs) -> Generator[str, None, None]:
@@ -13,40 +28,34 @@ def markdown_chunker(file_content_generator: Generator[Document, None, None], co
     max_tokens = config.get("max_tokens", 512)
     tokens_overlapping = config.get("token_overlap", 10)
     headers_to_split_on = [tuple(header) for header in headers_to_split_on]
+    # the splitter keeps no state between documents
+    markdown_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=headers_to_split_on,
+        strip_headers=strip_header,
+        return_each_line=return_each_line
+    )
+    encoder = get_encoder()
     for doc in file_content_generator:
         doc_metadata = doc.metadata
-        doc_content = doc.page_content
         chunk_id = 0
-        markdown_splitter = MarkdownHeaderTextSplitter(
-            headers_to_split_on=headers_to_split_on, 
-            strip_headers=strip_header,
-            return_each_line=return_each_line
-        )
-        md_header_splits = markdown_splitter.split_text(doc_content)
-        for chunk in md_header_splits:
-            if tiktoken_length(chunk.page_content) > max_tokens:
-                for subchunk in TokenTextSplitter(encoding_name="cl100k_base", 
-                                                  chunk_size=max_tokens, 
-                                                  chunk_overlap=tokens_overlapping
-                                                  ).split_text(chunk.page_content):
-                    chunk_id += 1
-                    headers_meta = list(chunk.metadata.values())
-                    docmeta = copy(doc_metadata)
-                    docmeta.update({"headers": "; ".join(headers_meta)})
-                    docmeta['chunk_id'] = chunk_id
-                    docmeta['chunk_type'] = "document"
-                    yield Document(
-                        page_content=subchunk,
-                        metadata=docmeta
-                    )
+        md_header_splits = markdown_splitter.split_text(doc.page_content)
+        # every section is encoded once: its length decides the split and its ids are the split input
+        sections = [chunk.page_content for chunk in md_header_splits]
+        if len(sections) == 1:
+            # encode_batch spins up a thread pool, not worth it for a single text
+            sections_token_ids = [encoder.encode(sections[0], disallowed_special=())]
+        else:
+            sections_token_ids = encoder.encode_batch(sections, disallowed_special=())
+        for chunk, token_ids in zip(md_header_splits, sections_token_ids):
+            headers = "; ".join(chunk.metadata.values())
+            if len(token_ids) > max_tokens:
+                subchunks = _split_tokens(encoder, token_ids, max_tokens, tokens_overlapping)
             else:
+                subchunks = [chunk.page_content]
+            for subchunk in subchunks:
                 chunk_id += 1
-                headers_meta = list(chunk.metadata.values())
-                docmeta = copy(doc_metadata)
-                docmeta.update({"headers": "; ".join(headers_meta)})
-                docmeta['chunk_id'] = chunk_id
-                docmeta['chunk_type'] = "document"
+                # shallow copy: nested metadata values are shared by the chunks of a document
                 yield Document(
-                    page_content=chunk.page_content,
-                    metadata=docmeta
-                )
\ No newline at end of file
+                    page_content=subchunk,
+                    metadata={**doc_metadata, "headers": headers, "chunk_id": chunk_id, "chunk_type": "document"}
+                )
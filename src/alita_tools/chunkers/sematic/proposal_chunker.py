@@ -1,5 +1,8 @@
+import hashlib
+import os
+import sqlite3
 from json import dumps
-from typing import Generator
+from typing import Generator, Tuple
 from logging import getLogger
 from langchain.schema import Document
 from langchain_core.prompts import ChatPromptTemplate
@@ -8,9 +11,16 @@ from langchain.text_splitter import TokenTextSplitter
 from typing import Optional, List
 from langchain_core.pydantic_v1 import BaseModel
 from ..utils import tiktoken_length
+from ...utils.executor import map_ordered
+from ...utils.tool_cache import SqliteCache, ToolCacheBackend
 
 logger = getLogger(__name__)
 
+PROPOSAL_CACHE_TTL = float(os.environ.get("ALITA_PROPOSAL_CACHE_TTL", 30 * 24 * 3600))
+PROPOSAL_CACHE_MAXSIZE = int(os.environ.get("ALITA_PROPOSAL_CACHE_MAXSIZE", 100000))
+
+_proposal_cache: Optional[SqliteCache] = None
+
 
 
 CHUNK_SUMMARY_PROMPT = """
@@ -46,10 +56,14 @@ class ChunkAnalysis(BaseModel):
     chunks: List[ChunkDetails]
 
 class AgenticChunker:
-    def __init__(self, llm=None):
+    def __init__(self, llm=None, cache: Optional[ToolCacheBackend] = None):
         # Whether or not to update/refine summaries and titles as you get new information
         self.llm = llm
         self.chunk_summary_llm = llm.with_structured_output(schema=ChunkAnalysis)
+        self.cache = cache
+        model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+        # results depend on the model and the prompt
+        self.cache_namespace = hashlib.sha256(f"{model}:{CHUNK_SUMMARY_PROMPT}".encode("utf-8")).hexdigest()
 
     def create_chunkes(self, split: str):
         chunk_analysis_prompt = ChatPromptTemplate.from_messages(
@@ -63,57 +77,120 @@ class AgenticChunker:
             return self.chunk_summary_llm.invoke(prompt).chunks
         except Exception as e:
             logger.error(f"Error in chunking: {e}")
-            return []
+            return None
 
-    def add_propositions(self, propositions):
-        for chunk in self.create_chunkes(propositions):
-            yield {
+    def add_propositions(self, propositions) -> List[dict]:
+        """Returns the chunks of a split, from the cache when the same split was analyzed by the same model."""
+        key = f"{self.cache_namespace}:{hashlib.sha256(propositions.encode('utf-8')).hexdigest()}"
+        if self.cache is not None:
+            try:
+                hit, chunks = self.cache.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Proposal cache is unavailable: {e}")
+                hit = False
+            if hit:
+                return chunks
+        analysis = self.create_chunkes(propositions)
+        if analysis is None:
+            # failed calls are not cached
+            return []
+        chunks = [
+            {
                 "title": chunk.chunk_title,
                 "summary": chunk.chunk_summary,
                 "propositions": chunk.propositions
             }
+            for chunk in analysis
+        ]
+        if self.cache is not None:
+            try:
+                self.cache.set(key, chunks)
+            except sqlite3.Error as e:
+                logger.warning(f"Proposal cache is unavailable: {e}")
+        return chunks
+
+
+def get_proposal_cache() -> Optional[ToolCacheBackend]:
+    """Persistent cache of split analyses at the path in ``ALITA_PROPOSAL_CACHE``; None if it is unset or ``none``."""
+    global _proposal_cache
+    path = os.environ.get("ALITA_PROPOSAL_CACHE", "none")
+    if not path or path == "none":
+        return None
+    if _proposal_cache is None or _proposal_cache.path != path:
+        try:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            _proposal_cache = SqliteCache(path, ttl=PROPOSAL_CACHE_TTL, maxsize=PROPOSAL_CACHE_MAXSIZE)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Proposal cache is unavailable: {e}")
+            return None
+    return _proposal_cache
+
+
+def _analyzed_splits(file_content_generator: Generator[Document, None, None], chunker: AgenticChunker,
+                     max_tokens_doc: int, max_concurrency: int
+                     ) -> Generator[Tuple[int, Document, str, List[dict]], None, None]:
+    """
+    Yields ``(document number, document, split, chunks)`` in input order while up to `max_concurrency`
+    splits, across document boundaries, are analyzed by the LLM at the same time.
+    """
+    def splits():
+        for doc_no, doc in enumerate(file_content_generator):
+            doc_content = doc.page_content
+            if tiktoken_length(doc_content) > max_tokens_doc:
+                doc_splits = TokenTextSplitter(encoding_name='cl100k_base', 
+                                               chunk_size=max_tokens_doc, chunk_overlap=0
+                                               ).split_text(doc_content)
+            else:
+                doc_splits = [doc_content]
+            for split in doc_splits:
+                yield doc_no, doc, split
+
+    def analyze(item: Tuple[int, Document, str]) -> Tuple[int, Document, str, List[dict]]:
+        doc_no, doc, split = item
+        return doc_no, doc, split, chunker.add_propositions(split)
+
+    yield from map_ordered(analyze, splits(), max_concurrency)
+
 
 def proposal_chunker(file_content_generator: Generator[Document, None, None], config: dict, *args, **kwargs):
     llm = config.get("llm")
     max_tokens_doc = config.get("max_doc_tokens", 1024)
+    max_concurrency = config.get("max_concurrency", 4)
     if not llm:
         raise ValueError("Missing LLM model")
-    for doc in file_content_generator:
-        chunk_id = 0
+    chunker = AgenticChunker(llm=llm, cache=get_proposal_cache())
+    current_doc_no = None
+    chunk_id = 0
+    for doc_no, doc, split, chunks in _analyzed_splits(file_content_generator, chunker,
+                                                       max_tokens_doc, max_concurrency):
+        if doc_no != current_doc_no:
+            current_doc_no = doc_no
+            chunk_id = 0
         doc_metadata = doc.metadata
-        doc_content = doc.page_content
-        if tiktoken_length(doc_content) > max_tokens_doc:
-            splits = TokenTextSplitter(encoding_name='cl100k_base', 
-                                       chunk_size=max_tokens_doc, chunk_overlap=0
-                                       ).split_text(doc_content)
-        else:
-            splits = [doc_content]
-        chunker = AgenticChunker(llm=llm)
-        for split in splits:    
-            for chunk in chunker.add_propositions(split):
-                chunk_id += 1
-                docmeta = doc_metadata.copy()
-                docmeta['chunk_id'] = chunk_id
-                docmeta['chunk_type'] = "title"
-                yield Document(
-                    metadata=docmeta,
-                    page_content=chunk['title'],
-                )
-                docmeta['chunk_type'] = "summary"
-                yield Document(
-                    metadata=docmeta,
-                    page_content=chunk['summary'],
-                )
-                docmeta['chunk_type'] = "propositions"
-                yield Document(
-                    metadata=docmeta,
-                    page_content="\n".join(chunk['propositions']),
-                )
-                docmeta['chunk_type'] = "document"
-                docmeta.update({"chunk_title": chunk['title']})
-                docmeta.update({"chunk_summary": chunk['summary']})
-                yield Document(
-                    metadata=docmeta,
-                    page_content=split,
-                )
-    
\ No newline at end of file
+        for chunk in chunks:
+            chunk_id += 1
+            docmeta = doc_metadata.copy()
+            docmeta['chunk_id'] = chunk_id
+            docmeta['chunk_type'] = "title"
+            yield Document(
+                metadata=docmeta,
+                page_content=chunk['title'],
+            )
+            docmeta['chunk_type'] = "summary"
+            yield Document(
+                metadata=docmeta,
+                page_content=chunk['summary'],
+            )
+            docmeta['chunk_type'] = "propositions"
+            yield Document(
+                metadata=docmeta,
+                page_content="\n".join(chunk['propositions']),
+            )
+            docmeta['chunk_type'] = "document"
+            docmeta.update({"chunk_title": chunk['title']})
+            docmeta.update({"chunk_summary": chunk['summary']})
+            yield Document(
+                metadata=docmeta,
+                page_content=split,
+            )
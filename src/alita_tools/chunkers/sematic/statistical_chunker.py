@@ -1,75 +1,109 @@
 
 import numpy as np
-from typing import Generator, Optional, List
+from typing import Generator, Optional, List, Tuple
 from logging import getLogger
 from langchain.schema import Document
 from langchain.text_splitter import TokenTextSplitter
-from tqdm.auto import tqdm
 
 logger = getLogger(__name__)
 
 from .base import Chunk
-from ..utils import tiktoken_length
+from ..utils import tiktoken_lengths
+from ...utils.executor import map_ordered
 
 
-def _encode_documents(embeddings: 'BaseModel', docs: List[str]) -> np.ndarray: # type: ignore
+def _embed_batch(embeddings: 'BaseModel', batch_docs: List[str]) -> List[List[float]]: # type: ignore
+    try:
+        return embeddings.embed_documents(batch_docs)
+    except Exception as e:
+        logger.error(f"Error encoding documents {batch_docs}: {e}")
+        raise
+
+
+def _encode_documents(embeddings: 'BaseModel', docs: List[str], max_in_flight: int = 1) -> np.ndarray: # type: ignore
     """
     Encodes a list of documents into embeddings. If the number of documents
     exceeds 2000, the documents are split into batches to avoid overloading
     the encoder. OpenAI has a limit of len(array) < 2048.
 
     :param docs: List of text documents to be encoded.
+    :param max_in_flight: Number of batches sent to the encoder concurrently.
     :return: A numpy array of embeddings for the given documents.
     """
     max_docs_per_batch = 2000
     _embeddings = []
     logger.info(f"Encoding {len(docs)} documents.")
-    for i in range(0, len(docs), max_docs_per_batch):
-        batch_docs = docs[i : i + max_docs_per_batch]
-        try:
-            batch_embeddings = embeddings.embed_documents(batch_docs)
-            _embeddings.extend(batch_embeddings)
-        except Exception as e:
-            logger.error(f"Error encoding documents {batch_docs}: {e}")
-            raise
+    batches = [docs[i : i + max_docs_per_batch] for i in range(0, len(docs), max_docs_per_batch)]
+    for batch_embeddings in map_ordered(lambda batch: _embed_batch(embeddings, batch), batches,
+                                        min(max_in_flight, len(batches))):
+        _embeddings.extend(batch_embeddings)
     logger.info(f"Encoded {len(_embeddings)} embeddings.")
     return np.array(_embeddings)
 
+
+def _embedded_batches(file_content_generator: Generator[Document, None, None], embeddings: 'BaseModel', # type: ignore
+                      max_tokens_doc: int, batch_size: int, max_in_flight: int
+                      ) -> Generator[Tuple[int, Document, List[str], np.ndarray], None, None]:
+    """
+    Splits the documents of the generator and yields ``(document number, document, splits, embeddings)``
+    per batch of splits, in input order.
+
+    Up to `max_in_flight` batches (across document boundaries) are embedded concurrently; the generator
+    is only advanced while fewer batches are pending, so slow embedding throttles document loading.
+    """
+    splitter = TokenTextSplitter(encoding_name='cl100k_base', chunk_size=max_tokens_doc, chunk_overlap=0)
+
+    def split_batches():
+        for doc_no, doc in enumerate(file_content_generator, start=1):
+            logger.info(f"Processing document {doc_no}.")
+            splits = splitter.split_text(doc.page_content)
+            logger.info(f"Splitting {len(splits)} documents.")
+            for i in range(0, len(splits), batch_size):
+                yield doc_no, doc, splits[i : i + batch_size]
+
+    def encode(batch: Tuple[int, Document, List[str]]) -> Tuple[int, Document, List[str], np.ndarray]:
+        doc_no, doc, batch_splits = batch
+        return doc_no, doc, batch_splits, _encode_documents(embeddings, batch_splits)
+
+    yield from map_ordered(encode, split_batches(), max_in_flight)
+
 def _calculate_similarity_scores(encoded_docs: np.ndarray, window_size: int) -> List[float]:
-        raw_similarities = []
-        for idx in range(1, len(encoded_docs)):
-            window_start = max(0, idx - window_size)
-            cumulative_context = np.mean(encoded_docs[window_start:idx], axis=0)
-            curr_sim_score = np.dot(cumulative_context, encoded_docs[idx]) / (
-                np.linalg.norm(cumulative_context) * np.linalg.norm(encoded_docs[idx])
-                + 1e-10
-            )
-            raw_similarities.append(curr_sim_score)
-        return raw_similarities
-
-def _find_split_indices(
-        similarities: List[float], calculated_threshold: float
-    ) -> List[int]:
-        split_indices = []
-        for idx, score in enumerate(similarities):
-            logger.debug(f"Similarity score at index {idx}: {score}")
-            if score < calculated_threshold:
-                logger.debug(
-                    f"Adding to split_indices due to score < threshold: "
-                    f"{score} < {calculated_threshold}"
-                )
-                # Chunk after the document at idx
-                split_indices.append(idx + 1)
-        return split_indices
-    
+    """
+    Cosine similarity of every document with the mean of up to `window_size` preceding documents.
+
+    Window sums are accumulated for all documents at once with one shifted in-place addition
+    per window position (no cancellation error as with differences of cumulative sums),
+    and norms are computed once per row.
+    """
+    encoded_docs = np.asarray(encoded_docs, dtype=np.float64)
+    n = len(encoded_docs)
+    if n < 2:
+        return []
+    # window_sums[i] is the sum of the window preceding document i + 1
+    window_sums = encoded_docs[:-1].copy()
+    for shift in range(1, min(window_size, n - 1)):
+        window_sums[shift:] += encoded_docs[:-1 - shift]
+    window_lengths = np.minimum(np.arange(1, n), max(window_size, 1))
+    window_means = window_sums / window_lengths[:, None]
+    targets = encoded_docs[1:]
+    scores = np.einsum("ij,ij->i", window_means, targets) / (
+        np.sqrt(np.einsum("ij,ij->i", window_means, window_means))
+        * np.sqrt(np.einsum("ij,ij->i", targets, targets))
+        + 1e-10
+    )
+    return scores.tolist()
+
 def _find_optimal_threshold(docs: List[str], similarity_scores: List[float], 
                             min_split_tokens:int = 100, 
                             max_split_tokens:int = 300,
                             split_tokens_tolerance: int = 10,
-                            threshold_adjustment: float = 0.01
+                            threshold_adjustment: float = 0.01,
+                            token_counts: Optional[List[int]] = None
                             ) -> float:
-    token_counts = [tiktoken_length(doc) for doc in docs]
-    cumulative_token_counts = np.cumsum([0] + token_counts)
+    if token_counts is None:
+        token_counts = tiktoken_lengths(docs)
+    cumulative_token_counts = np.cumsum([0] + list(token_counts))
+    scores = np.asarray(similarity_scores, dtype=np.float64)
 
     # Analyze the distribution of similarity scores to set initial bounds
     median_score = np.median(similarity_scores)
@@ -84,17 +118,12 @@ def _find_optimal_threshold(docs: List[str], similarity_scores: List[float],
     calculated_threshold = 0.0
     while low <= high:
         calculated_threshold = (low + high) / 2
-        split_indices = _find_split_indices(similarity_scores, calculated_threshold)
         logger.debug(f"Iteration {iteration}: Trying threshold: {calculated_threshold}")
 
         # Calculate the token counts for each split using the cumulative sums
-        split_token_counts = [
-            cumulative_token_counts[end] - cumulative_token_counts[start]
-            for start, end in zip(
-                [0] + split_indices, split_indices + [len(token_counts)]
-            )
-        ]
-        
+        boundaries = np.concatenate(([0], np.flatnonzero(scores < calculated_threshold) + 1, [len(token_counts)]))
+        split_token_counts = np.diff(cumulative_token_counts[boundaries])
+
         # Calculate the median token count for the chunks
         median_tokens = np.median(split_token_counts)
         logger.debug(
@@ -124,21 +153,15 @@ def _find_optimal_threshold(docs: List[str], similarity_scores: List[float],
     return calculated_threshold
 
 def _find_split_indices(similarities: List[float], calculated_threshold: float) -> List[int]:
-    split_indices = []
-    for idx, score in enumerate(similarities):
-        logger.debug(f"Similarity score at index {idx}: {score}")
-        if score < calculated_threshold:
-            logger.debug(
-                f"Adding to split_indices due to score < threshold: "
-                f"{score} < {calculated_threshold}"
-            )
-            # Chunk after the document at idx
-            split_indices.append(idx + 1)
+    # Chunk after every document whose successor scores below the threshold
+    split_indices = (np.flatnonzero(np.asarray(similarities, dtype=np.float64) < calculated_threshold) + 1).tolist()
+    logger.debug(f"Found {len(split_indices)} split indices below threshold {calculated_threshold}")
     return split_indices
 
 
 def _split_documents(docs: List[str], split_indices: List[int], similarities: List[float],
-                     max_split_tokens: int = 300, min_split_tokens: int = 100, 
+                     max_split_tokens: int = 300, min_split_tokens: int = 100,
+                     token_counts: Optional[List[int]] = None
                      ) -> List[Chunk]:
     """
     This method iterates through each document, appending it to the current split
@@ -148,7 +171,9 @@ def _split_documents(docs: List[str], split_indices: List[int], similarities: Li
     or when a split point is reached and the minimum token requirement is met,
     the current split is finalized and added to the List of chunks.
     """
-    token_counts = [tiktoken_length(doc) for doc in docs]
+    if token_counts is None:
+        token_counts = tiktoken_lengths(docs)
+    split_points = set(split_indices)
     chunks, current_split = [], []
     current_tokens_count = 0
 
@@ -162,7 +187,7 @@ def _split_documents(docs: List[str], split_indices: List[int], similarities: Li
         logger.debug(f"Accumulative token count: {current_tokens_count} tokens")
         logger.debug(f"Document token count: {doc_token_count} tokens")
         # Check if current index is a split point based on similarity
-        if doc_idx + 1 in split_indices:
+        if doc_idx + 1 in split_points:
             if (
                 min_split_tokens
                 <= current_tokens_count + doc_token_count
@@ -232,7 +257,7 @@ def _split_documents(docs: List[str], split_indices: List[int], similarities: Li
     # Validation to ensure no tokens are lost during the split
     original_token_count = sum(token_counts)
     split_token_count = sum(
-        [tiktoken_length(doc) for split in chunks for doc in split.splits]
+        tiktoken_lengths([doc for split in chunks for doc in split.splits])
     )
     if original_token_count != split_token_count:
         logger.error(
@@ -259,61 +284,64 @@ def statistical_chunker(file_content_generator: Generator[Document, None, None],
     split_tokens_tolerance: int = config.get("split_tokens_tolerance", 10)
     threshold_adjustment: float = config.get("threshold_adjustment", 0.01)
     score_threshold: float = config.get("score_threshold", 0.5)
-    docs_no = 0
-    for doc in file_content_generator:
-        docs_no+=1
-        logger.info(f"Processing document {docs_no}.")
-        try:
+    max_concurrent_batches: int = config.get("max_concurrent_batches", 4)
+    current_doc_no = None
+    last_chunk: Optional[Chunk] = None
+    last_chunk_embeddings: Optional[np.ndarray] = None
+    chunk_id = 0
+    try:
+        for doc_no, doc, new_splits, new_embeddings in _embedded_batches(
+                file_content_generator, embedding, max_tokens_doc, batch_size, max_concurrent_batches):
+            if doc_no != current_doc_no:
+                current_doc_no = doc_no
+                last_chunk, last_chunk_embeddings, chunk_id = None, None, 0
             doc_metadata = doc.metadata
-            doc_content = doc.page_content
-            last_chunk: Optional[Chunk] = None
-            splits = TokenTextSplitter(encoding_name='cl100k_base', 
-                                    chunk_size=max_tokens_doc, chunk_overlap=0
-                                    ).split_text(doc_content)
-            logger.info(f"Splitting {len(splits)} documents.")
-            chunk_id = 0
-            for i in tqdm(range(0, len(splits), batch_size)):
-                batch_splits = splits[i : i + batch_size]
-                if last_chunk is not None:
-                    batch_splits = last_chunk.splits + batch_splits
-                
-                encoded_splits = _encode_documents(embedding, batch_splits)
-                
-                similarities = _calculate_similarity_scores(encoded_splits, window_size)
-
-                if dynamic_threshold:
-                    calculated_threshold = _find_optimal_threshold(
-                        batch_splits, similarities, min_split_tokens, 
-                        max_split_tokens, split_tokens_tolerance, 
-                        threshold_adjustment
-                    )
-                else:
-                    calculated_threshold = score_threshold
-                
-                split_indices = _find_split_indices(
-                    similarities=similarities, 
-                    calculated_threshold=calculated_threshold
+            batch_splits = new_splits
+            encoded_splits = new_embeddings
+            if last_chunk is not None:
+                # the splits of the previous chunk were embedded with the previous batch
+                batch_splits = last_chunk.splits + new_splits
+                encoded_splits = np.concatenate([last_chunk_embeddings, new_embeddings])
+
+            similarities = _calculate_similarity_scores(encoded_splits, window_size)
+            token_counts = tiktoken_lengths(batch_splits)
+
+            if dynamic_threshold:
+                calculated_threshold = _find_optimal_threshold(
+                    batch_splits, similarities, min_split_tokens, 
+                    max_split_tokens, split_tokens_tolerance, 
+                    threshold_adjustment, token_counts
                 )
+            else:
+                calculated_threshold = score_threshold
+            
+            split_indices = _find_split_indices(
+                similarities=similarities, 
+                calculated_threshold=calculated_threshold
+            )
 
-                doc_chunks = _split_documents(
-                    docs=batch_splits,
-                    split_indices=split_indices,
-                    similarities=similarities,
+            doc_chunks = _split_documents(
+                docs=batch_splits,
+                split_indices=split_indices,
+                similarities=similarities,
+                token_counts=token_counts,
+            )
+            for chunk in doc_chunks:
+                chunk_id += 1
+                metadata = doc_metadata.copy()
+                metadata['chunk_id'] = chunk_id
+                metadata['chunk_token_count'] = chunk.token_count
+                metadata['chunk_type'] = "document"
+                last_chunk = chunk
+                logger.info(f"Chunk {chunk_id} created with {chunk.token_count} tokens.")
+                logger.info(f"Chunk metadata: {metadata}")
+                yield Document(
+                    page_content=chunk.content,
+                    metadata=metadata
                 )
-                for chunk in doc_chunks:
-                    chunk_id += 1
-                    metadata = doc_metadata.copy()
-                    metadata['chunk_id'] = chunk_id
-                    metadata['chunk_token_count'] = chunk.token_count
-                    metadata['chunk_type'] = "document"
-                    last_chunk = chunk
-                    logger.info(f"Chunk {chunk_id} created with {chunk.token_count} tokens.")
-                    logger.info(f"Chunk metadata: {metadata}")
-                    yield Document(
-                        page_content=chunk.content,
-                        metadata=metadata
-                    )
-        except Exception as e:
-            from traceback import format_exc
-            logger.error(f"Error: {format_exc()}")
-            raise e
+            # chunks cover the batch in order, so the last chunk is its tail
+            last_chunk_embeddings = encoded_splits[len(encoded_splits) - len(last_chunk.splits):]
+    except Exception as e:
+        from traceback import format_exc
+        logger.error(f"Error: {format_exc()}")
+        raise e
@@ -1,7 +1,11 @@
-import tiktoken
+from typing import List
+
+from ..utils.tokens import count_tokens
 
 
 def tiktoken_length(text: str) -> int:
-    tokenizer = tiktoken.get_encoding("cl100k_base")
-    tokens = tokenizer.encode(text, disallowed_special=())
-    return len(tokens)
+    return count_tokens([text])[0]
+
+
+def tiktoken_lengths(texts: List[str]) -> List[int]:
+    return count_tokens(texts)
@@ -18,6 +18,7 @@ def get_tools(tool):
         username=tool['settings'].get('username', None),
         token=tool['settings'].get('token', None),
         limit=tool['settings'].get('limit', 5),
+        max_concurrent_requests=tool['settings'].get('max_concurrent_requests', 4),
         labels=parse_list(tool['settings'].get('labels', None)),
         additional_fields=tool['settings'].get('additional_fields', []),
         verify_ssl=tool['settings'].get('verify_ssl', True),
@@ -62,6 +63,7 @@ class ConfluenceToolkit(BaseToolkit):
             number_of_retries=(int, Field(description="Number of retries", default=2)),
             min_retry_seconds=(int, Field(description="Min retry, sec", default=10)),
             max_retry_seconds=(int, Field(description="Max retry, sec", default=60)),
+            max_concurrent_requests=(int, Field(description="Pages fetched concurrently", default=4)),
             selected_tools=(List[Literal[tuple(selected_tools)]],
                             Field(default=[], json_schema_extra={'args_schemas': selected_tools})),
             # indexer settings
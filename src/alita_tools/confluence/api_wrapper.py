@@ -4,7 +4,10 @@ import logging
 import requests
 import json
 import base64
+import contextvars
 import traceback
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Any, Dict, Callable, Generator, Literal
 from json import JSONDecodeError
 
@@ -18,11 +21,25 @@ from markdownify import markdownify
 from langchain_community.document_loaders.confluence import ContentFormat
 
 from ..elitea_base import BaseVectorStoreToolApiWrapper
-from ..llm.img_utils import ImageDescriptionCache
+from ..llm.img_utils import (ImageDescriptionCache, find_image_references, get_image_description_cache,
+                             llm_model_name, resolve_concurrently, splice)
 from ..utils import is_cookie_token, parse_cookie_string
+from ..utils.dedup import NearDuplicateFilter
+from ..utils.executor import map_ordered
+from ..utils.index_manifest import (IndexManifest, ManifestStore, clear_collection, deletable_store,
+                                   delete_documents, document_id)
+from ..utils.rate_limit import install_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# page ids listed per request by incremental indexing
+INDEX_LISTING_LIMIT = 200
+# loader parameters selecting pages or tuning requests, which do not change the indexed documents
+INDEX_IGNORED_PARAMS = ("url", "space_key", "page_ids", "label", "cql", "limit", "max_pages",
+                        "min_retry_seconds", "max_retry_seconds", "number_of_retries")
+# a trailing ORDER BY clause of a CQL query
+CQL_ORDER_BY = re.compile(r"\border\s+by\b[^\"']*$", re.IGNORECASE)
+
 createPage = create_model(
     "createPage",
     space=(Optional[str], Field(description="Confluence space that is used for page's creation", default=None)),
@@ -188,6 +205,10 @@ indexPagesParams = create_model(
     ### Chunking Parameters
     chunking_tool=(Literal['markdown', 'statistical', 'proposal'], Field(description="Name of chunking tool", default="markdown")),
     chunking_config=(Optional[dict], Field(description="Chunking tool configuration", default_factory=dict)),
+    ### Deduplication Parameters
+    deduplicate=(Optional[bool], Field(description="Skip near-duplicate chunks (templated pages, repeated footers) instead of embedding them", default=False)),
+    dedup_config=(Optional[dict], Field(description="Near-duplicate detection configuration: threshold, num_perm, bands, shingle_size, max_entries, merge_window", default_factory=dict)),
+    incremental=(Optional[bool], Field(description="Only index pages created or modified since the previous incremental run and delete documents of removed pages", default=False)),
 )
 
 searchIndexParams = create_model(
@@ -299,6 +320,8 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
     number_of_retries: Optional[int] = 3
     min_retry_seconds: Optional[int] = 2
     max_retry_seconds: Optional[int] = 10
+    max_concurrent_requests: Optional[int] = 4
+    expanded_search: Optional[bool] = True
     keep_markdown_format: Optional[bool] = True
     ocr_languages: Optional[str] = None
     keep_newlines: Optional[bool] = True
@@ -311,7 +334,7 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
     embedding_model_params: Optional[Dict[str, Any]] = {"model_name": "sentence-transformers/all-MiniLM-L6-v2"}
     vectorstore_type: Optional[str] = "PGVector"
 
-    _image_cache: ImageDescriptionCache = PrivateAttr(default_factory=ImageDescriptionCache)
+    _image_cache: ImageDescriptionCache = PrivateAttr(default_factory=get_image_description_cache)
 
     @model_validator(mode='before')
     @classmethod
@@ -339,6 +362,7 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             values['client'] = Confluence(url=url, token=token, cloud=cloud)
         else:
             values['client'] = Confluence(url=url, username=username, password=api_key, cloud=cloud)
+        install_rate_limiter(values['client'].session)
         return values
 
     def __unquote_confluence_space(self) -> str | None:
@@ -604,7 +628,8 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
 
     def is_public_page(self, page: dict) -> bool:
         """Check if a page is publicly accessible."""
-        restrictions = self.client.get_all_restrictions_for_content(page["id"])
+        # pages fetched by get_pages_by_id carry their read restrictions already
+        restrictions = page.get("restrictions") or self.client.get_all_restrictions_for_content(page["id"])
 
         return (
                 page["status"] == "current"
@@ -612,27 +637,46 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
                 and not restrictions["read"]["restrictions"]["group"]["results"]
         )
 
+    def _retrying(self, func: Callable) -> Callable:
+        """Wraps a client call with the configured retries; throttling (429/503) is handled by the rate limiter."""
+        return retry(
+            reraise=True,
+            stop=stop_after_attempt(
+                self.number_of_retries  # type: ignore[arg-type]
+            ),
+            wait=wait_exponential(
+                multiplier=1,  # type: ignore[arg-type]
+                min=self.min_retry_seconds,  # type: ignore[arg-type]
+                max=self.max_retry_seconds,  # type: ignore[arg-type]
+            ),
+            before_sleep=before_sleep_log(logger, logging.WARNING),
+        )(func)
+
+    def _page_expand(self) -> str:
+        expand = f"{self.content_format.value},version"
+        if not self.include_restricted_content:
+            # one request per page: read restrictions come with the page
+            expand += ",restrictions.read.restrictions.user,restrictions.read.restrictions.group"
+        return expand
+
+    def _convert_page(self, page: dict, skip_images: bool = False) -> Optional[Document]:
+        """Converts a page fetched with ``_page_expand``; None if it is restricted and restricted content is excluded."""
+        if not self.include_restricted_content and not self.is_public_page(page):
+            return None
+        return self.process_page(page, skip_images)
+
     def get_pages_by_id(self, page_ids: List[str], skip_images: bool = False):
         """ Gets pages by id in the Confluence space."""
-        for page_id in page_ids:
-            get_page = retry(
-                reraise=True,
-                stop=stop_after_attempt(
-                    self.number_of_retries  # type: ignore[arg-type]
-                ),
-                wait=wait_exponential(
-                    multiplier=1,  # type: ignore[arg-type]
-                    min=self.min_retry_seconds,  # type: ignore[arg-type]
-                    max=self.max_retry_seconds,  # type: ignore[arg-type]
-                ),
-                before_sleep=before_sleep_log(logger, logging.WARNING),
-            )(self.client.get_page_by_id)
-            page = get_page(
-                page_id=page_id, expand=f"{self.content_format.value},version"
-            )
-            if not self.include_restricted_content and not self.is_public_page(page):
-                continue
-            yield self.process_page(page, skip_images)
+        get_page = self._retrying(self.client.get_page_by_id)
+        expand = self._page_expand()
+
+        def fetch(page_id: str) -> Optional[Document]:
+            return self._convert_page(get_page(page_id=page_id, expand=expand), skip_images)
+
+        max_concurrency = self.max_concurrent_requests if len(page_ids) > 1 else 1
+        for document in map_ordered(fetch, page_ids, max_concurrency):
+            if document is not None:
+                yield document
 
     def read_page_by_id(self, page_id: str, skip_images: bool = False):
         """Reads a page by its id in the Confluence space. If id is not available, but there is a title - use get_page_id first."""
@@ -654,24 +698,68 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
         base64_md_pattern = r'data:image/(png|jpeg|gif);base64,[a-zA-Z0-9+/=]+'
         return re.sub(base64_md_pattern, "[Image Removed]", content)
 
+    def _content_search(self, cql: str, expand: Optional[str] = None, limit: Optional[int] = None,
+                        max_results: Optional[int] = None) -> Generator[dict, None, None]:
+        """
+        Yields the content matching a CQL query from the content search endpoint, following its
+        ``_links.next`` cursor. The next result page is requested while the current one is consumed.
+        """
+        get = self._retrying(self.client.get)
+        params = {"cql": cql, "limit": limit or self.limit}
+        if expand:
+            params["expand"] = expand
+        remaining = max_results if max_results is not None else float("inf")
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            response = get("rest/api/content/search", params=params)
+            while response and remaining > 0:
+                results = response.get("results", [])
+                if remaining < len(results):
+                    results = results[:int(remaining)]
+                remaining -= len(results)
+                next_link = response.get("_links", {}).get("next")
+                upcoming = None
+                if results and next_link and remaining > 0:
+                    upcoming = executor.submit(contextvars.copy_context().run, get, next_link.lstrip("/"))
+                yield from results
+                response = upcoming.result() if upcoming else None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search_pages(self, cql: str, skip_images: bool = False) -> Generator[Document, None, None]:
+        """
+        Yields the pages matching a CQL query, at most ``max_pages`` results.
+
+        Bodies, versions and read restrictions are expanded on the search request, so pages cost
+        no request of their own.
+        """
+        for page in self._content_search(cql, expand=self._page_expand(), max_results=self.max_pages):
+            document = self._convert_page(page, skip_images)
+            if document is not None:
+                yield document
+
     def _process_search(self, cql, skip_images: bool = False):
+        if self.expanded_search:
+            pages = self._search_pages(cql, skip_images)
+        else:
+            pages = self._search_pages_by_id(cql, skip_images)
+        pages_info = [{
+            'content': page.page_content,
+            'page_id': page.metadata['id'],
+            'page_title': page.metadata['title'],
+            'page_url': page.metadata['source']
+        } for page in pages]
+        return str(pages_info)
+
+    def _search_pages_by_id(self, cql: str, skip_images: bool = False) -> Generator[Document, None, None]:
+        """Runs the CQL query for page ids only and fetches the pages with ``get_pages_by_id``."""
         start = 0
-        pages_info = []
         for _ in range((self.max_pages + self.limit - 1) // self.limit):
             pages = self.client.cql(cql, start=start, limit=self.limit).get("results", [])
             if not pages:
                 break
-            page_ids = [page['content']['id'] for page in pages]
-            for page in self.get_pages_by_id(page_ids, skip_images):
-                page_info = {
-                    'content': page.page_content,
-                    'page_id': page.metadata['id'],
-                    'page_title': page.metadata['title'],
-                    'page_url': page.metadata['source']
-                }
-                pages_info.append(page_info)
+            yield from self.get_pages_by_id([page['content']['id'] for page in pages], skip_images)
             start += self.limit
-        return str(pages_info)
 
     def search_pages(self, query: str, skip_images: bool = False):
         """Search pages in Confluence by query text in title or page content."""
@@ -783,56 +871,16 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             metadata=metadata,
         )
 
-    # todo: refactor this method since file processing is not working (self.process_pdf, self.process_image, etc. are not defined)
     def process_attachment(
             self,
             page_id: str,
             ocr_languages: Optional[str] = None,
     ) -> List[str]:
-        try:
-            from PIL import Image  # noqa: F401
-        except ImportError:
-            raise ImportError(
-                "`Pillow` package not found, " "please run `pip install Pillow`"
-            )
-
-        # depending on setup you may also need to set the correct path for
-        # poppler and tesseract
-        attachments = self.client.get_attachments_from_content(page_id)["results"]
-        texts = []
-        for attachment in attachments:
-            media_type = attachment["metadata"]["mediaType"]
-            absolute_url = self.base_url + attachment["_links"]["download"]
-            title = attachment["title"]
-            try:
-                if media_type == "application/pdf":
-                    text = title + self.process_pdf(absolute_url, ocr_languages)
-                elif (
-                        media_type == "image/png"
-                        or media_type == "image/jpg"
-                        or media_type == "image/jpeg"
-                ):
-                    text = title + self.process_image(absolute_url, ocr_languages)
-                elif (
-                        media_type == "application/vnd.openxmlformats-officedocument"
-                                      ".wordprocessingml.document"
-                ):
-                    text = title + self.process_doc(absolute_url)
-                elif media_type == "application/vnd.ms-excel":
-                    text = title + self.process_xls(absolute_url)
-                elif media_type == "image/svg+xml":
-                    text = title + self.process_svg(absolute_url, ocr_languages)
-                else:
-                    continue
-                texts.append(text)
-            except requests.HTTPError as e:
-                if e.response.status_code == 404:
-                    print(f"Attachment not found at {absolute_url}")  # noqa: T201
-                    continue
-                else:
-                    raise
-
-        return texts
+        """Extracts the text of the page attachments with the loader's concurrent, cached pipeline."""
+        from .loader import AlitaConfluenceLoader
+        loader = AlitaConfluenceLoader(self.client, self.llm, url=self.base_url,
+                                       max_attachment_workers=self.max_concurrent_requests)
+        return loader.process_attachment(page_id, ocr_languages)
 
     def execute_generic_confluence(self, method: str, relative_url: str, params: Optional[str] = "") -> str:
         """Generic Confluence Tool for Official Atlassian Confluence REST API to call, searching, creating, updating pages, etc."""
@@ -888,19 +936,8 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
         max_pages = kwargs.pop("max_pages")
         docs: List[dict] = []
         next_url: str = ""
+        get_pages = self._retrying(retrieval_method)
         while len(docs) < max_pages:
-            get_pages = retry(
-                reraise=True,
-                stop=stop_after_attempt(
-                    self.number_of_retries  # type: ignore[arg-type]
-                ),
-                wait=wait_exponential(
-                    multiplier=1,
-                    min=self.min_retry_seconds,  # type: ignore[arg-type]
-                    max=self.max_retry_seconds,  # type: ignore[arg-type]
-                ),
-                before_sleep=before_sleep_log(logger, logging.WARNING),
-            )(retrieval_method)
             if self.cql:  # cursor pagination for CQL
                 batch, next_url = get_pages(**kwargs, next_url=next_url)
                 if not next_url:
@@ -936,6 +973,7 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
         confluence_loader_params['min_retry_seconds'] = self.min_retry_seconds
         confluence_loader_params['max_retry_seconds'] = self.max_retry_seconds
         confluence_loader_params['number_of_retries'] = self.number_of_retries
+        confluence_loader_params['max_attachment_workers'] = self.max_concurrent_requests
         bins_with_llm = confluence_loader_params.pop('bins_with_llm', False)
         loader = AlitaConfluenceLoader(self.client, self.llm, bins_with_llm, **confluence_loader_params)
 
@@ -959,14 +997,15 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
                     bins_with_llm: bool = False,
                     chunking_tool: str = "markdown",
                     chunking_config: Optional[Dict[str, Any]] = None,
+                    deduplicate: bool = False,
+                    dedup_config: Optional[Dict[str, Any]] = None,
+                    incremental: bool = False,
                     **kwargs) -> Generator[str, None, None]:
-        """Load Confluence pages and index them in the vector store."""
+        """Load Confluence pages and index them in the vector store.
+        With incremental=True only pages created or modified since the previous incremental run are loaded and
+        indexed, and documents of removed pages are deleted."""
 
         from alita_tools.chunkers import __confluence_chunkers__ as chunkers, __confluence_models__ as models
-        try:
-            from alita_sdk.langchain.interfaces.llm_processor import get_embeddings
-        except ImportError:
-            from src.alita_sdk.langchain.interfaces.llm_processor import get_embeddings
 
         loader_params = {
             'url': self.base_url,
@@ -989,12 +1028,18 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             'max_retry_seconds': self.max_retry_seconds,
             'number_of_retries': self.number_of_retries
         }
-        documents = self._loader(**loader_params)
-        embedding = get_embeddings(self.embedding_model, self.embedding_model_params)
+        # cached: chunkers and indexing only embed splits that were not embedded before
+        embedding = self._get_embeddings()
 
         chunker = chunkers.get(chunking_tool)
 
         chunking_config = chunking_config or {}
+        # settings the documents of an incremental index depend on, before instances are added to the config
+        index_settings = json.dumps({
+            "loader": {key: value for key, value in loader_params.items() if key not in INDEX_IGNORED_PARAMS},
+            "chunking": {"tool": chunking_tool, "config": chunking_config},
+            "dedup": dedup_config if deduplicate else None,
+        }, sort_keys=True, default=str)
 
         if chunker:
             # Validate and prepare chunking configuration using Pydantic models
@@ -1016,12 +1061,169 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
                 chunking_config['embedding'] = embedding
                 chunking_config['llm'] = self.llm
 
-            documents = chunker(documents, chunking_config)
+        dedup = None
+        if deduplicate:
+            try:
+                dedup = NearDuplicateFilter.from_config(dedup_config)
+            except Exception as e:
+                logger.error(f"Invalid deduplication configuration: {e}")
+                raise ToolException(f"Invalid deduplication configuration: {e}")
+
+        def pipeline(documents):
+            if chunker:
+                documents = chunker(documents, chunking_config)
+            if dedup is not None:
+                documents = dedup.filter(documents)
+            return documents
 
         # passing embedding to avoid re-initialization
         vectorstore = self._init_vector_store(collection_suffix, embeddings=embedding)
-        return vectorstore.index_documents(documents)
-
+        if incremental and deletable_store(vectorstore) is None:
+            logger.info("Vector store does not support deletion by id, indexing all pages")
+            incremental = False
+        if incremental:
+            result = self._index_pages_incrementally(vectorstore, self._get_manifest_store(collection_suffix),
+                                                     self._get_index_key(collection_suffix), loader_params,
+                                                     pipeline, dedup, index_settings)
+        else:
+            result = vectorstore.index_documents(pipeline(self._loader(**loader_params)))
+        if dedup is not None and isinstance(result, str):
+            result = f"{result}\n{dedup.stats.report()}"
+        return result
+
+    def _get_index_identity(self) -> List[Optional[str]]:
+        return [self.base_url, self.space]
+
+    def _index_scope_cql(self, loader_params: Dict[str, Any]) -> str:
+        """CQL matching the pages the loader reads for the same parameters, without ordering."""
+        scopes = []
+        if loader_params.get('cql'):
+            # the scope is combined with other clauses, which cannot follow an ORDER BY
+            cql = CQL_ORDER_BY.sub("", loader_params['cql']).strip()
+            if cql:
+                scopes.append(f"({cql})")
+        if loader_params.get('label'):
+            scopes.append(f'(type = page and label = "{loader_params["label"]}")')
+        if loader_params.get('page_ids'):
+            scopes.append(f"(id in ({', '.join(str(page_id) for page_id in loader_params['page_ids'])}))")
+        if not scopes and self.space:
+            # the loader reads the space only when no other scope is given
+            scopes.append(f"(type = page and space = {self.__sanitize_confluence_space()})")
+        if not scopes:
+            raise ToolException("Incremental indexing needs a space, a label, a CQL query or page ids")
+        return " or ".join(scopes)
+
+    def _index_pages_incrementally(self, vectorstore, manifest_store: ManifestStore, index_key: str,
+                                   loader_params: Dict[str, Any], pipeline: Callable[[Any], Any],
+                                   dedup: Optional[NearDuplicateFilter] = None, settings: str = ""):
+        """
+        Indexes only the pages created, modified or brought into scope since the previous run.
+
+        Notes:
+        - All page ids in scope are listed every run, removed pages are detected by diffing them with the manifest.
+        - Modified pages are found with a ``lastmodified`` query from one day before the watermark (the
+          latest ``version.when`` indexed), since CQL dates are minute-granular and in server time; pages
+          returned whose ``version.when`` did not change are skipped.
+        - At most ``max_pages`` new or modified pages are loaded per run, oldest first; the others
+          keep their documents and are recorded as pending, so the next runs load them first.
+        - Loaded pages are recorded even if they yield no documents, e.g. when all their chunks are
+          near-duplicates. Pages whose chunks were dropped as duplicates of another page are loaded
+          again when that page is modified or removed. Pages the loader skips (e.g. restricted) are
+          not recorded and are checked again next run.
+        - Without a manifest all pages are loaded; a collection holding no manifest at all is cleared first.
+        - When `settings` (content format, chunking, ...) differ from the previous run all pages are loaded again.
+        """
+        scope = self._index_scope_cql(loader_params)
+        max_pages = loader_params.get('max_pages')
+        manifest = IndexManifest(index_key + ":" + scope, manifest_store)
+        if not manifest.exists:
+            logger.info(f"No manifest for index '{index_key}', loading all pages in scope")
+            if manifest_store.is_empty():
+                clear_collection(vectorstore)
+        listed = [page["id"] for page in self._content_search(f"{scope} order by created asc",
+                                                              limit=INDEX_LISTING_LIMIT)]
+        modified: Dict[str, str] = {}
+        watermark = manifest.state.get("watermark")
+        if watermark:
+            since = (datetime.strptime(watermark[:10], "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+            for page in self._content_search(f'({scope}) and lastmodified >= "{since}"', expand="version",
+                                             limit=INDEX_LISTING_LIMIT):
+                modified[page["id"]] = page["version"]["when"]
+        # unknown pages get an empty version, so they differ from the manifest
+        versions = {page_id: modified.get(page_id) or manifest.entries.get(page_id, {}).get("version", "")
+                    for page_id in listed}
+        changed, removed = manifest.diff(versions)
+        if manifest.exists and manifest.state.get("settings") != settings:
+            logger.info(f"Settings of index '{index_key}' changed, loading all pages in scope")
+            changed = list(versions)
+            manifest.state["pending"] = []
+        manifest.state["settings"] = settings
+        # held back by max_pages on earlier runs; their change may be older than the watermark by now
+        pending = [page_id for page_id in manifest.state.get("pending", []) if page_id in versions]
+        changed = pending + [page_id for page_id in changed if page_id not in pending]
+        # kept page -> pages whose chunks were dropped as its duplicates
+        duplicates: Dict[str, List[str]] = manifest.state.get("duplicates", {})
+        updated, reload = list(changed + removed), set(changed)
+        while updated:
+            for page_id in duplicates.pop(updated.pop(), []):
+                if page_id in versions and page_id not in reload:
+                    reload.add(page_id)
+                    changed.append(page_id)
+                    updated.append(page_id)
+        manifest.state["pending"] = []
+        if max_pages and len(changed) > max_pages:
+            # held back pages keep their documents until a later run loads them
+            manifest.state["pending"] = changed[max_pages:]
+            changed = changed[:max_pages]
+        stale_ids = manifest.state.pop("stale_ids", []) + manifest.document_ids(changed + removed)
+        if not delete_documents(vectorstore, stale_ids):
+            # retried on the next run
+            manifest.state["stale_ids"] = stale_ids
+        for page_id in changed + removed:
+            manifest.remove(page_id)
+        logger.info(f"Incremental index: {len(changed)} new or modified, {len(removed)} removed, "
+                    f"{len(listed) - len(changed)} unchanged or deferred pages")
+        if not changed:
+            manifest.state["duplicates"] = duplicates
+            manifest.save()
+            return f"Index is up to date: {len(removed)} removed pages deleted, no new or modified pages"
+
+        page_documents: Dict[str, List[str]] = {}
+        page_versions: Dict[str, str] = {}
+        # the duplicate filter identifies pages by the first source key of their chunks
+        source_pages: Dict[str, str] = {}
+
+        def loaded_pages():
+            for document in self._loader(**{**loader_params, 'page_ids': changed, 'label': None, 'cql': None}):
+                page_id = str(document.metadata.get("id"))
+                page_versions.setdefault(page_id, document.metadata.get("when") or versions.get(page_id, ""))
+                if dedup is not None:
+                    source_pages[dedup.source(document) or page_id] = page_id
+                yield document
+
+        def documents():
+            for document in pipeline(loaded_pages()):
+                page_id = str(document.metadata.get("id"))
+                ids = page_documents.setdefault(page_id, [])
+                document.id = document_id(index_key, page_id, page_versions.get(page_id, ""), len(ids))
+                ids.append(document.id)
+                yield document
+
+        result = vectorstore.index_documents(documents())
+        for page_id, version in page_versions.items():
+            manifest.update(page_id, version, page_documents.get(page_id, []))
+        if dedup is not None:
+            for kept, dropped in dedup.duplicate_sources.items():
+                if kept in source_pages:
+                    pages = duplicates.setdefault(source_pages[kept], [])
+                    pages.extend(source_pages[source] for source in dropped
+                                 if source in source_pages and source_pages[source] not in pages)
+        manifest.state["duplicates"] = duplicates
+        indexed_versions = [entry["version"] for entry in manifest.entries.values() if entry["version"]]
+        if indexed_versions:
+            manifest.state["watermark"] = max(indexed_versions)
+        manifest.save()
+        return result
 
     def _download_image(self, image_url):
         """
@@ -1226,8 +1428,24 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
         Returns:
             Generated description from the LLM
         """
+        # Use default or custom prompt
+        prompt = custom_prompt if custom_prompt else self._get_default_image_analysis_prompt()
+
+        # Add context information if available
+        if image_name or context_text:
+            prompt += "\n\n## Additional Context Information:\n"
+
+            if image_name:
+                prompt += f"- Image Name/Reference: {image_name}\n"
+
+            if context_text:
+                prompt += f"- Surrounding Content: {context_text}\n"
+
+            prompt += "\nPlease incorporate this contextual information in your description when relevant."
+
         # Check cache first to avoid redundant processing
-        cached_description = self._image_cache.get(image_data, image_name)
+        model = llm_model_name(self.llm)
+        cached_description = self._image_cache.get(image_data, prompt, model)
         if cached_description:
             logger.info(f"Using cached description for image: {image_name}")
             return cached_description
@@ -1240,22 +1458,12 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
 
             # If image_data is empty or None, do text-only analysis
             if not image_data:
-                prompt = custom_prompt if custom_prompt else self._get_default_image_analysis_prompt()
-                if image_name or context_text:
-                    prompt += "\n\n## Additional Context Information:\n"
-                    if image_name:
-                        prompt += f"- Image Name/Reference: {image_name}\n"
-                    if context_text:
-                        prompt += f"- Surrounding Content: {context_text}\n"
-                    prompt += "\nPlease incorporate this contextual information in your description when relevant."
                 result = llm.invoke([
                     HumanMessage(
                         content=[{"type": "text", "text": prompt}]
                     )
                 ])
-                description = result.content
-                self._image_cache.set(image_data, description, image_name)
-                return description
+                return result.content
 
             from io import BytesIO
             from PIL import Image, UnidentifiedImageError
@@ -1285,21 +1493,6 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
                 logger.warning(f"Error converting image {image_name}: {str(conv_error)}")
                 return f"[Error converting image {image_name}: {str(conv_error)}]"
 
-            # Use default or custom prompt
-            prompt = custom_prompt if custom_prompt else self._get_default_image_analysis_prompt()
-
-            # Add context information if available
-            if image_name or context_text:
-                prompt += "\n\n## Additional Context Information:\n"
-
-                if image_name:
-                    prompt += f"- Image Name/Reference: {image_name}\n"
-
-                if context_text:
-                    prompt += f"- Surrounding Content: {context_text}\n"
-
-                prompt += "\nPlease incorporate this contextual information in your description when relevant."
-
             # Perform LLM invocation with image
             result = llm.invoke([
                 HumanMessage(
@@ -1316,7 +1509,7 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             description = result.content
 
             # Cache the result for future use
-            self._image_cache.set(image_data, description, image_name)
+            self._image_cache.set(image_data, description, prompt, model)
 
             return description
         except Exception as e:
@@ -1331,7 +1524,7 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
         This method will:
         1. Extract the specified page content from Confluence
         2. Detect images in the content (both attachments and embedded/linked images)
-        3. Retrieve and process each image with an LLM, providing surrounding context
+        3. Retrieve and process the images with an LLM concurrently, providing surrounding context
         4. Replace image references with the generated text descriptions
 
         Args:
@@ -1362,6 +1555,18 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             # 3. Base64 embedded images - <ac:image><ac:resource>...<ac:media-type>image/png</ac:media-type><ac:data>(base64 data)</ac:data></ac:resource></ac:image>
             base64_image_pattern = r'<ac:image[^>]*>(?:.*?)<ac:resource>(?:.*?)<ac:media-type>([^<]+)</ac:media-type>(?:.*?)<ac:data>([^<]+)</ac:data>(?:.*?)</ac:resource>(?:.*?)</ac:image>'
 
+            # Collect all image references first, earlier patterns take precedence over overlapping matches
+            references = find_image_references(
+                page_content, [attachment_image_pattern, url_image_pattern, base64_image_pattern])
+
+            # The attachments of the page are listed once for all attachment-based images
+            page_attachments, page_attachments_error = [], None
+            if any(reference.re.pattern == attachment_image_pattern for reference in references):
+                try:
+                    page_attachments = self.client.get_attachments_from_content(page_id)['results']
+                except Exception as e:
+                    page_attachments_error = e
+
             # Process attachment-based images
             def process_attachment_image(match):
                 """Process attachment-based image references and get contextual descriptions"""
@@ -1372,7 +1577,9 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
 
                 try:
                     # Get the image attachment from the page
-                    attachments = self.client.get_attachments_from_content(page_id)['results']
+                    if page_attachments_error is not None:
+                        raise page_attachments_error
+                    attachments = page_attachments
                     attachment = None
 
                     # Find the attachment that matches the filename
@@ -1468,17 +1675,17 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
                     logger.error(f"Error processing base64 image: {str(e)}")
                     return f"[Image: embedded {media_type} - Error: {str(e)}]"
 
-            # Replace each type of image reference with its description
-            processed_content = page_content
-
-            # 1. Process attachment-based images
-            processed_content = re.sub(attachment_image_pattern, process_attachment_image, processed_content)
-
-            # 2. Process URL-based images
-            processed_content = re.sub(url_image_pattern, process_url_image, processed_content)
+            handlers = {
+                attachment_image_pattern: process_attachment_image,
+                url_image_pattern: process_url_image,
+                base64_image_pattern: process_base64_image,
+            }
 
-            # 3. Process base64 embedded images
-            processed_content = re.sub(base64_image_pattern, process_base64_image, processed_content)
+            # Download and describe the images concurrently, then replace the references in one pass
+            descriptions = resolve_concurrently(
+                references, lambda reference: handlers[reference.re.pattern](reference),
+                self.max_concurrent_requests)
+            processed_content = splice(page_content, references, descriptions)
 
             # Convert HTML to markdown for easier readability
             try:
@@ -1492,7 +1699,7 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
         except Exception as e:
             stacktrace = traceback.format_exc()
             logger.error(f"Error processing page with images: {stacktrace}")
-            return f"Error processing page with images: {str(e)}"
+            return ToolException(f"Error processing page with images: {str(e)}")
 
     def get_page_attachments(self, page_id: str, max_content_length: int = 10000, custom_prompt: str = None):
         """
@@ -1738,54 +1945,62 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             return results
         except Exception as e:
             logger.error(f"Error retrieving attachments for page {page_id}: {str(e)}")
-            return f"Error retrieving attachments: {str(e)}"
+            return ToolException(f"Error retrieving attachments: {str(e)}")
 
     def get_available_tools(self):
         return [
             {
                 "name": "create_page",
+                "cache": "write",
                 "ref": self.create_page,
                 "description": self.create_page.__doc__,
                 "args_schema": createPage,
             },
             {
                 "name": "create_pages",
+                "cache": "write",
                 "ref": self.create_pages,
                 "description": self.create_pages.__doc__,
                 "args_schema": createPages,
             },
             {
                 "name": "delete_page",
+                "cache": "write",
                 "ref": self.delete_page,
                 "description": self.delete_page.__doc__,
                 "args_schema": deletePage,
             },
             {
                 "name": "update_page_by_id",
+                "cache": "write",
                 "ref": self.update_page_by_id,
                 "description": self.update_page_by_id.__doc__,
                 "args_schema": updatePageById,
             },
             {
                 "name": "update_page_by_title",
+                "cache": "write",
                 "ref": self.update_page_by_title,
                 "description": self.update_page_by_title.__doc__,
                 "args_schema": updatePageByTitle,
             },
             {
                 "name": "update_pages",
+                "cache": "write",
                 "ref": self.update_pages,
                 "description": self.update_pages.__doc__,
                 "args_schema": updatePages,
             },
             {
                 "name": "update_labels",
+                "cache": "write",
                 "ref": self.update_labels,
                 "description": self.update_labels.__doc__,
                 "args_schema": updateLabels,
             },
             {
                 "name": "get_page_tree",
+                "cache": "read",
                 "ref": self.get_page_tree,
                 "description": self.get_page_tree.__doc__,
                 "args_schema": getPageTree,
@@ -1798,18 +2013,21 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             # },
             {
                 "name": "get_pages_with_label",
+                "cache": "read",
                 "ref": self.get_pages_with_label,
                 "description": self.get_pages_with_label.__doc__,
                 "args_schema": getPagesWithLabel,
             },
             {
                 "name": "list_pages_with_label",
+                "cache": "read",
                 "ref": self.list_pages_with_label,
                 "description": self.list_pages_with_label.__doc__,
                 "args_schema": getPagesWithLabel,
             },
             {
                 "name": "read_page_by_id",
+                "cache": "read",
                 "ref": self.read_page_by_id,
                 "description": self.read_page_by_id.__doc__,
                 "args_schema": pageId,
@@ -1834,12 +2052,14 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             },
             {
                 "name": "get_page_with_image_descriptions",
+                "cache": "read",
                 "ref": self.get_page_with_image_descriptions,
                 "description": self.get_page_with_image_descriptions.__doc__,
                 "args_schema": GetPageWithImageDescriptions,
             },
             {
                 "name": "execute_generic_confluence",
+                "cache": "write",
                 "description": self.execute_generic_confluence.__doc__,
                 "args_schema": сonfluenceInput,
                 "ref": self.execute_generic_confluence,
@@ -1864,12 +2084,14 @@ class ConfluenceAPIWrapper(BaseVectorStoreToolApiWrapper):
             },
             {
                 "name": "get_page_id_by_title",
+                "cache": "read",
                 "ref": self.get_page_id_by_title,
                 "description": self.get_page_id_by_title.__doc__,
                 "args_schema": getPageIdByTitleInput,
             },
             {
                 "name": "get_page_attachments",
+                "cache": "read",
                 "ref": self.get_page_attachments,
                 "description": self.get_page_attachments.__doc__,
                 "args_schema": GetPageAttachmentsInput,
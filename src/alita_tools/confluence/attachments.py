@@ -0,0 +1,86 @@
+"""
+Text extraction of Confluence attachments.
+
+The attachments of a page are downloaded, converted (``convert_from_bytes``, svg rendering) and
+passed to OCR or the LLM by a bounded pool of workers, so a page with many attachments no longer
+waits for each of them in turn. Texts keep the order of the attachments.
+
+Extracted texts are cached on disk by attachment id and version together with the extraction
+settings, so re-indexing a space does not download or OCR an unchanged attachment again. The
+cache is opt-in: ``ALITA_ATTACHMENT_CACHE`` is its path (unset or ``none`` disables it).
+"""
+import hashlib
+import os
+import sqlite3
+from json import dumps
+from logging import getLogger
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.executor import map_ordered
+from ..utils.tool_cache import SqliteCache, ToolCacheBackend
+
+logger = getLogger(__name__)
+
+ATTACHMENT_CACHE_TTL = float(os.environ.get("ALITA_ATTACHMENT_CACHE_TTL", 90 * 24 * 3600))
+ATTACHMENT_CACHE_MAXSIZE = int(os.environ.get("ALITA_ATTACHMENT_CACHE_MAXSIZE", 100000))
+DEFAULT_ATTACHMENT_WORKERS = int(os.environ.get("ALITA_ATTACHMENT_WORKERS", 4))
+
+_attachment_cache: Optional[SqliteCache] = None
+
+
+def get_attachment_cache() -> Optional[ToolCacheBackend]:
+    """Persistent cache of attachment texts at the path in ``ALITA_ATTACHMENT_CACHE``; None if it is unset or ``none``."""
+    global _attachment_cache
+    path = os.environ.get("ALITA_ATTACHMENT_CACHE", "none")
+    if not path or path == "none":
+        return None
+    if _attachment_cache is None or _attachment_cache.path != path:
+        try:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            _attachment_cache = SqliteCache(path, ttl=ATTACHMENT_CACHE_TTL, maxsize=ATTACHMENT_CACHE_MAXSIZE)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Attachment cache is unavailable: {e}")
+            return None
+    return _attachment_cache
+
+
+def attachment_cache_key(base_url: str, attachment: dict, settings: Dict[str, Any]) -> Optional[str]:
+    """Key of an attachment version extracted with `settings`; None if the attachment has no version."""
+    version = (attachment.get("version") or {}).get("number")
+    if not attachment.get("id") or version is None:
+        return None
+    payload = dumps([base_url, attachment["id"], version, attachment["metadata"]["mediaType"], settings],
+                    sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def extract_attachments(attachments: List[dict], extract: Callable[[dict], Optional[str]], base_url: str,
+                        settings: Dict[str, Any], max_workers: Optional[int] = DEFAULT_ATTACHMENT_WORKERS,
+                        cache: Optional[ToolCacheBackend] = None) -> List[str]:
+    """
+    Returns ``title + text`` of every attachment in order, where `extract` returns the text of an
+    attachment or None to skip it. Up to `max_workers` attachments are extracted at the same time;
+    non-empty texts are cached, empty ones (failed downloads) are extracted again next time.
+    """
+    texts: List[Optional[str]] = [None] * len(attachments)
+    # (position, attachment, cache key) of the attachments that have to be extracted
+    misses: List[Tuple[int, dict, Optional[str]]] = []
+    for position, attachment in enumerate(attachments):
+        key = attachment_cache_key(base_url, attachment, settings) if cache is not None else None
+        if key is not None:
+            hit, text = cache.get(key)
+            if hit:
+                texts[position] = text
+                continue
+        misses.append((position, attachment, key))
+
+    def store(position: int, key: Optional[str], text: Optional[str]):
+        texts[position] = text
+        if text and key is not None:
+            cache.set(key, text)
+
+    extracted = map_ordered(lambda miss: extract(miss[1]), misses, max_workers if len(misses) > 1 else 1)
+    for (position, _, key), text in zip(misses, extracted):
+        store(position, key, text)
+    return [attachment["title"] + text for attachment, text in zip(attachments, texts) if text is not None]
@@ -1,3 +1,4 @@
+import hashlib
 from io import BytesIO
 from typing import Optional, List
 from logging import getLogger
@@ -13,10 +14,20 @@ from pdf2image import convert_from_bytes
 from reportlab.graphics import renderPM
 from svglib.svglib import svg2rlg
 
+from .attachments import DEFAULT_ATTACHMENT_WORKERS, extract_attachments, get_attachment_cache
 from .utils import image_to_byte_array, bytes_to_base64
 
 Image.MAX_IMAGE_PIXELS = 300_000_000
 
+ATTACHMENT_MEDIA_TYPES = (
+    "application/pdf",
+    "image/png",
+    "image/jpg",
+    "image/jpeg",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.ms-excel",
+)
+
 
 class AlitaConfluenceLoader(ConfluenceLoader):
 
@@ -61,6 +72,7 @@ class AlitaConfluenceLoader(ConfluenceLoader):
         self.limit = kwargs.get('limit', 10)
         self.max_pages = kwargs.get('max_pages', 1000)
         self.ocr_languages = kwargs.get('ocr_languages')
+        self.max_attachment_workers = kwargs.get('max_attachment_workers', DEFAULT_ATTACHMENT_WORKERS)
         self.keep_markdown_format = kwargs.get('keep_markdown_format', True)
         self.keep_newlines = kwargs.get('keep_newlines', True)
         self.number_of_retries: int = kwargs.get('number_of_retries', 3)
@@ -93,6 +105,7 @@ class AlitaConfluenceLoader(ConfluenceLoader):
     ) -> List[str]:
         """
         Process attachments from a Confluence page and extract text from them.
+        Attachments are extracted concurrently and their texts are cached by attachment version.
         Note: if the attachment is corrupted, it will be skipped and an error will be logged.
         """
 
@@ -103,43 +116,55 @@ class AlitaConfluenceLoader(ConfluenceLoader):
                 "`Pillow` package not found, " "please run `pip install Pillow`"
             )
 
-        attachments = self.confluence.get_attachments_from_content(page_id)["results"]
-        texts = []
-        for attachment in attachments:
-            media_type = attachment["metadata"]["mediaType"]
-            absolute_url = self.base_url + attachment["_links"]["download"]
-            title = attachment["title"]
-            try:
-                if media_type == "application/pdf":
-                    text = title + self.process_pdf(absolute_url, ocr_languages)
-                elif (
-                    media_type == "image/png"
-                    or media_type == "image/jpg"
-                    or media_type == "image/jpeg"
-                ):
-                    text = title + self.process_image(absolute_url, ocr_languages)
-                elif (
-                    media_type == "application/vnd.openxmlformats-officedocument"
-                    ".wordprocessingml.document"
-                ):
-                    text = title + self.process_doc(absolute_url)
-                elif media_type == "application/vnd.ms-excel":
-                    text = title + self.process_xls(absolute_url)
-                # elif media_type == "image/svg+xml":
-                #     text = title + self.process_svg(absolute_url, ocr_languages)
-                else:
-                    continue
-                texts.append(text)
-            except requests.HTTPError as e:
-                if e.response.status_code == 404:
-                    print(f"Attachment not found at {absolute_url}")  # noqa: T201
-                    continue
-                else:
-                    raise
-            except Exception as e:
-                print(f"Error processing attachment {absolute_url}: {e}")
-                continue
-        return texts
+        # the version is part of the cache key
+        attachments = self.confluence.get_attachments_from_content(page_id, expand="version")["results"]
+        return extract_attachments(
+            [attachment for attachment in attachments
+             if attachment["metadata"]["mediaType"] in ATTACHMENT_MEDIA_TYPES],
+            lambda attachment: self._extract_attachment(attachment, ocr_languages),
+            self.base_url,
+            self._attachment_settings(ocr_languages),
+            max_workers=self.max_attachment_workers,
+            cache=get_attachment_cache(),
+        )
+
+    def _attachment_settings(self, ocr_languages: Optional[str] = None) -> dict:
+        """Settings that change the extracted text, part of the attachment cache key."""
+        if self.bins_with_llm and self.llm:
+            model = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None)
+            return {"llm": str(model), "prompt": hashlib.sha256(self.prompt.encode("utf-8")).hexdigest()}
+        return {"ocr_languages": ocr_languages}
+
+    def _extract_attachment(self, attachment: dict, ocr_languages: Optional[str] = None) -> Optional[str]:
+        media_type = attachment["metadata"]["mediaType"]
+        absolute_url = self.base_url + attachment["_links"]["download"]
+        try:
+            if media_type == "application/pdf":
+                return self.process_pdf(absolute_url, ocr_languages)
+            elif (
+                media_type == "image/png"
+                or media_type == "image/jpg"
+                or media_type == "image/jpeg"
+            ):
+                return self.process_image(absolute_url, ocr_languages)
+            elif (
+                media_type == "application/vnd.openxmlformats-officedocument"
+                ".wordprocessingml.document"
+            ):
+                return self.process_doc(absolute_url)
+            elif media_type == "application/vnd.ms-excel":
+                return self.process_xls(absolute_url)
+            # elif media_type == "image/svg+xml":
+            #     return self.process_svg(absolute_url, ocr_languages)
+        except requests.HTTPError as e:
+            if e.response.status_code == 404:
+                print(f"Attachment not found at {absolute_url}")  # noqa: T201
+                return None
+            else:
+                raise
+        except Exception as e:
+            print(f"Error processing attachment {absolute_url}: {e}")
+        return None
 
     def process_pdf(
             self,
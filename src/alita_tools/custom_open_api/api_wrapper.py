@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field, PrivateAttr, model_validator, create_mode
 
 import urllib3
 
+from ..utils.http_session import get_pool_manager
+
 
 class OpenApiConfig(BaseModel):
     spec: str
@@ -19,7 +21,7 @@ class OpenApiWrapper(BaseModel):
     @model_validator(mode='before')
     @classmethod
     def validate_toolkit(cls, values):
-        cls._client = urllib3.PoolManager()
+        cls._client = get_pool_manager()
         return values
 
     def invoke_rest_api_by_spec(self, method: str, url: str, headers: str = "", fields: str = "", body: str = "") -> str:
@@ -1,14 +1,24 @@
 import ast
 import fnmatch
+import hashlib
 import logging
+import os
 import traceback
-from typing import Any, Optional, List, Dict
+from typing import Any, Callable, Optional, List, Dict
 from langchain_core.tools import ToolException
-from pydantic import BaseModel, create_model, Field
+from pydantic import BaseModel, create_model, Field, PrivateAttr, SecretStr
 from .utils import TOOLKIT_SPLITTER
+from .utils import instrumentation
+from .utils.embedding_cache import with_embedding_cache
+from .utils.executor import run_in_executor
+from .utils.index_manifest import (FileManifestStore, IndexManifest, ManifestStore, SqlManifestStore,
+                                   clear_collection, deletable_store, delete_documents, document_id)
+from .utils.tool_cache import call_with_cache
 
 logger = logging.getLogger(__name__)
 
+CHROMA_PERSIST_DIRECTORY = "./indexer_db"
+
 LoaderSchema = create_model(
     "LoaderSchema",
     branch=(Optional[str], Field(
@@ -19,89 +29,167 @@ LoaderSchema = create_model(
                Field(description="A list of file extensions or paths to exclude. If None, no files are excluded."))
 )
 
+
+def is_file_selected(file_path: str, whitelist: Optional[List[str]] = None,
+                     blacklist: Optional[List[str]] = None) -> bool:
+    """Whether a file matches the whitelist (all files if None) and not the blacklist."""
+    if whitelist and not any(fnmatch.fnmatch(file_path, pattern) for pattern in whitelist):
+        return False
+    if blacklist and any(fnmatch.fnmatch(file_path, pattern) for pattern in blacklist):
+        return False
+    return True
+
+
 class BaseToolApiWrapper(BaseModel):
+    _tools_by_name: Optional[Dict[str, dict]] = PrivateAttr(default=None)
+    _cache_namespace: Optional[str] = PrivateAttr(default=None)
 
     def get_available_tools(self):
         raise NotImplementedError("Subclasses should implement this method")
 
+    def _get_tool(self, mode: str) -> Optional[dict]:
+        """Returns the tool registered under ``mode``, building the name -> tool table once per instance."""
+        tools_by_name = self._tools_by_name
+        if tools_by_name is None:
+            tools_by_name = {}
+            for tool in self.get_available_tools():
+                # keep the first definition, as the former linear scan did
+                tools_by_name.setdefault(tool["name"], tool)
+            self._tools_by_name = tools_by_name
+        return tools_by_name.get(mode)
+
+    def _get_cache_namespace(self) -> str:
+        """Identifies the toolkit instance for the tool cache by its class and plain configuration fields."""
+        if self._cache_namespace is None:
+            config = []
+            for field_name in sorted(type(self).model_fields):
+                value = getattr(self, field_name, None)
+                if isinstance(value, SecretStr):
+                    value = value.get_secret_value()
+                if value is None or isinstance(value, (str, int, float, bool)):
+                    config.append((field_name, value))
+            digest = hashlib.sha256(repr(config).encode("utf-8")).hexdigest()[:16]
+            self._cache_namespace = f"{type(self).__name__}-{digest}"
+        return self._cache_namespace
+
+    def _get_cache_state(self) -> Dict[str, Any]:
+        """
+        Mutable instance state that results of cached reads depend on (e.g. the active branch).
+        It is part of every cache key, as instances with the same configuration share a namespace.
+        """
+        return {}
+
+    def _invoke_tool(self, tool: dict, *args: Any, **kwargs: Any):
+        """Calls the tool, going through the tool cache when its definition declares a ``cache`` policy."""
+        if tool.get("cache"):
+            return call_with_cache(self._get_cache_namespace(), tool, args, kwargs, self._get_cache_state())
+        return tool["ref"](*args, **kwargs)
+
     def run(self, mode: str, *args: Any, **kwargs: Any):
         if TOOLKIT_SPLITTER in mode:
             mode = mode.rsplit(TOOLKIT_SPLITTER, maxsplit=1)[1]
-        for tool in self.get_available_tools():
-            if tool["name"] == mode:
-                try:
-                    execution = tool["ref"](*args, **kwargs)
-                    # if not isinstance(execution, str):
-                    #     execution = str(execution)
-                    return execution
-                except Exception as e:
-                    # Catch all tool execution exceptions and provide user-friendly error messages
-                    error_type = type(e).__name__
-                    error_message = str(e)
-                    full_traceback = traceback.format_exc()
-                    
-                    # Log the full exception details for debugging
-                    logger.error(f"Tool execution failed for '{mode}': {error_type}: {error_message}")
-                    logger.error(f"Full traceback:\n{full_traceback}")
-                    logger.debug(f"Tool execution parameters - args: {args}, kwargs: {kwargs}")
-                    
-                    # Provide specific error messages for common issues
-                    if isinstance(e, TypeError) and "unexpected keyword argument" in error_message:
-                        # Extract the problematic parameter name from the error message
-                        import re
-                        match = re.search(r"unexpected keyword argument '(\w+)'", error_message)
-                        if match:
-                            bad_param = match.group(1)
-                            # Try to get expected parameters from the tool's args_schema if available
-                            expected_params = "unknown"
-                            if "args_schema" in tool and hasattr(tool["args_schema"], "__fields__"):
-                                expected_params = list(tool["args_schema"].__fields__.keys())
-                            
-                            user_friendly_message = (
-                                f"Parameter error in tool '{mode}': unexpected parameter '{bad_param}'. "
-                                f"Expected parameters: {expected_params}\n\n"
-                                f"Full traceback:\n{full_traceback}"
-                            )
-                        else:
-                            user_friendly_message = (
-                                f"Parameter error in tool '{mode}': {error_message}\n\n"
-                                f"Full traceback:\n{full_traceback}"
-                            )
-                    elif isinstance(e, TypeError):
-                        user_friendly_message = (
-                            f"Parameter error in tool '{mode}': {error_message}\n\n"
-                            f"Full traceback:\n{full_traceback}"
-                        )
-                    elif isinstance(e, ValueError):
-                        user_friendly_message = (
-                            f"Value error in tool '{mode}': {error_message}\n\n"
-                            f"Full traceback:\n{full_traceback}"
-                        )
-                    elif isinstance(e, KeyError):
-                        user_friendly_message = (
-                            f"Missing required configuration or data in tool '{mode}': {error_message}\n\n"
-                            f"Full traceback:\n{full_traceback}"
-                        )
-                    elif isinstance(e, ConnectionError):
-                        user_friendly_message = (
-                            f"Connection error in tool '{mode}': {error_message}\n\n"
-                            f"Full traceback:\n{full_traceback}"
-                        )
-                    elif isinstance(e, TimeoutError):
-                        user_friendly_message = (
-                            f"Timeout error in tool '{mode}': {error_message}\n\n"
-                            f"Full traceback:\n{full_traceback}"
-                        )
-                    else:
-                        user_friendly_message = (
-                            f"Tool '{mode}' execution failed: {error_type}: {error_message}\n\n"
-                            f"Full traceback:\n{full_traceback}"
-                        )
-                    
-                    # Re-raise with the user-friendly message while preserving the original exception
-                    raise ToolException(user_friendly_message) from e
-        else:
+        tool = self._get_tool(mode)
+        if tool is None:
             raise ValueError(f"Unknown mode: {mode}")
+        try:
+            with instrumentation.tool_call(type(self).__name__, mode) as scope:
+                execution = self._invoke_tool(tool, *args, **kwargs)
+                scope.set_output(execution)
+            # if not isinstance(execution, str):
+            #     execution = str(execution)
+            return execution
+        except Exception as e:
+            # Re-raise with the user-friendly message while preserving the original exception
+            raise self._tool_exception(mode, tool, e, args, kwargs) from e
+
+    async def arun(self, mode: str, *args: Any, **kwargs: Any):
+        """
+        Async counterpart of `run`.
+
+        Tools that define an async implementation under the ``aref`` key are awaited directly,
+        everything else runs `run` in the shared bounded executor.
+        """
+        if TOOLKIT_SPLITTER in mode:
+            mode = mode.rsplit(TOOLKIT_SPLITTER, maxsplit=1)[1]
+        tool = self._get_tool(mode)
+        if tool is None:
+            raise ValueError(f"Unknown mode: {mode}")
+        if tool.get("aref") is None:
+            return await run_in_executor(self.run, mode, *args, **kwargs)
+        try:
+            with instrumentation.tool_call(type(self).__name__, mode) as scope:
+                execution = await tool["aref"](*args, **kwargs)
+                scope.set_output(execution)
+            return execution
+        except Exception as e:
+            raise self._tool_exception(mode, tool, e, args, kwargs) from e
+
+    def _tool_exception(self, mode: str, tool: dict, e: Exception, args: tuple, kwargs: dict) -> ToolException:
+        """Builds a user-friendly ToolException for a failed tool call; must be called from the except block."""
+        # Catch all tool execution exceptions and provide user-friendly error messages
+        error_type = type(e).__name__
+        error_message = str(e)
+        full_traceback = traceback.format_exc()
+        
+        # Log the full exception details for debugging
+        logger.error(f"Tool execution failed for '{mode}': {error_type}: {error_message}")
+        logger.error(f"Full traceback:\n{full_traceback}")
+        logger.debug(f"Tool execution parameters - args: {args}, kwargs: {kwargs}")
+        
+        # Provide specific error messages for common issues
+        if isinstance(e, TypeError) and "unexpected keyword argument" in error_message:
+            # Extract the problematic parameter name from the error message
+            import re
+            match = re.search(r"unexpected keyword argument '(\w+)'", error_message)
+            if match:
+                bad_param = match.group(1)
+                # Try to get expected parameters from the tool's args_schema if available
+                expected_params = "unknown"
+                if "args_schema" in tool and hasattr(tool["args_schema"], "__fields__"):
+                    expected_params = list(tool["args_schema"].__fields__.keys())
+                
+                user_friendly_message = (
+                    f"Parameter error in tool '{mode}': unexpected parameter '{bad_param}'. "
+                    f"Expected parameters: {expected_params}\n\n"
+                    f"Full traceback:\n{full_traceback}"
+                )
+            else:
+                user_friendly_message = (
+                    f"Parameter error in tool '{mode}': {error_message}\n\n"
+                    f"Full traceback:\n{full_traceback}"
+                )
+        elif isinstance(e, TypeError):
+            user_friendly_message = (
+                f"Parameter error in tool '{mode}': {error_message}\n\n"
+                f"Full traceback:\n{full_traceback}"
+            )
+        elif isinstance(e, ValueError):
+            user_friendly_message = (
+                f"Value error in tool '{mode}': {error_message}\n\n"
+                f"Full traceback:\n{full_traceback}"
+            )
+        elif isinstance(e, KeyError):
+            user_friendly_message = (
+                f"Missing required configuration or data in tool '{mode}': {error_message}\n\n"
+                f"Full traceback:\n{full_traceback}"
+            )
+        elif isinstance(e, ConnectionError):
+            user_friendly_message = (
+                f"Connection error in tool '{mode}': {error_message}\n\n"
+                f"Full traceback:\n{full_traceback}"
+            )
+        elif isinstance(e, TimeoutError):
+            user_friendly_message = (
+                f"Timeout error in tool '{mode}': {error_message}\n\n"
+                f"Full traceback:\n{full_traceback}"
+            )
+        else:
+            user_friendly_message = (
+                f"Tool '{mode}' execution failed: {error_type}: {error_message}\n\n"
+                f"Full traceback:\n{full_traceback}"
+            )
+        
+        return ToolException(user_friendly_message)
 
 
 class BaseVectorStoreToolApiWrapper(BaseToolApiWrapper):
@@ -118,10 +206,7 @@ class BaseVectorStoreToolApiWrapper(BaseToolApiWrapper):
         if collection_suffix and len(collection_suffix.strip()) > 7:
             raise ToolException("collection_suffix must be 7 characters or less")
         
-        # Create collection name with suffix if provided
-        collection_name = str(self.collection_name)
-        if collection_suffix and collection_suffix.strip():
-            collection_name = f"{self.collection_name}_{collection_suffix.strip()}"
+        collection_name = self._get_collection_name(collection_suffix)
         
         if self.vectorstore_type == 'PGVector':
             vectorstore_params = {
@@ -136,7 +221,7 @@ class BaseVectorStoreToolApiWrapper(BaseToolApiWrapper):
         elif self.vectorstore_type == 'Chroma':
             vectorstore_params = {
                 "collection_name": collection_name,
-                "persist_directory": "./indexer_db"
+                "persist_directory": CHROMA_PERSIST_DIRECTORY
             }
 
         return VectorStoreWrapper(
@@ -148,6 +233,93 @@ class BaseVectorStoreToolApiWrapper(BaseToolApiWrapper):
             embeddings=embeddings
         )
 
+    def _get_collection_name(self, collection_suffix: str = "") -> str:
+        """ Returns the collection name with the suffix if provided."""
+        if collection_suffix and collection_suffix.strip():
+            return f"{self.collection_name}_{collection_suffix.strip()}"
+        return str(self.collection_name)
+
+    def _get_index_identity(self) -> List[Optional[str]]:
+        """
+        Stable identity of the indexed source (e.g. repository url and name), part of incremental index keys.
+        Never secrets or tuning fields: a changed key orphans the documents recorded under the previous one.
+        """
+        return []
+
+    def _get_index_key(self, *parts: Optional[str]) -> str:
+        """ Key of an incremental index: toolkit class, source identity and `parts` (collection suffix, branch, ...)."""
+        return ":".join(str(part or "") for part in [type(self).__name__, *self._get_index_identity(), *parts])
+
+    def _get_manifest_store(self, collection_suffix: str = "") -> ManifestStore:
+        """ Returns the storage of incremental index manifests, kept with the collection so all workers share it."""
+        collection_name = self._get_collection_name(collection_suffix)
+        if self.vectorstore_type == 'PGVector':
+            return SqlManifestStore(self.connection_string.get_secret_value(), schema=collection_name)
+        return FileManifestStore(os.path.join(CHROMA_PERSIST_DIRECTORY, "index_manifests", collection_name))
+
+    def _get_embeddings(self):
+        """ Returns the configured embedding model behind the persistent embedding cache."""
+        try:
+            from alita_sdk.langchain.interfaces.llm_processor import get_embeddings
+        except ImportError:
+            from src.alita_sdk.langchain.interfaces.llm_processor import get_embeddings
+        return with_embedding_cache(get_embeddings(self.embedding_model, self.embedding_model_params),
+                                    self.embedding_model, self.embedding_model_params)
+
+    def _index_code_incrementally(self, vectorstore, manifest_store: ManifestStore, index_key: str,
+                                  file_versions: Dict[str, str], read_file: Callable[[str], str]):
+        """
+        Indexes only the files added or changed since the previous run of the same index.
+
+        Parameters:
+        - vectorstore: Vector store wrapper returned by ``_init_vector_store``; must support deletion by id.
+        - manifest_store (ManifestStore): Storage of the manifest, returned by ``_get_manifest_store``.
+        - index_key (str): Identifies the index (collection, repository, branch) the manifest belongs to.
+        - file_versions (Dict[str, str]): Blob sha of every file that should be in the index.
+        - read_file (Callable[[str], str]): Reads the content of a file.
+
+        Notes:
+        - Documents of changed and removed files are deleted by the ids recorded in the manifest.
+        - Without a manifest every file is indexed. If the collection holds no manifest of any index,
+          its documents were written by full indexes with unknown ids and it is cleared first.
+        """
+        from .chunkers.code.codeparser import parse_code_files_for_db
+
+        manifest = IndexManifest(index_key, manifest_store)
+        if not manifest.exists:
+            logger.info(f"No manifest for index '{index_key}', re-indexing all files")
+            if manifest_store.is_empty():
+                clear_collection(vectorstore)
+        changed, removed = manifest.diff(file_versions)
+        stale_ids = manifest.state.pop("stale_ids", []) + manifest.document_ids(changed + removed)
+        if not delete_documents(vectorstore, stale_ids):
+            # retried on the next run
+            manifest.state["stale_ids"] = stale_ids
+        for file_path in removed:
+            manifest.remove(file_path)
+        logger.info(f"Incremental index: {len(changed)} new or changed, {len(removed)} removed, "
+                    f"{len(file_versions) - len(changed)} unchanged files")
+        if not changed:
+            manifest.save()
+            return f"Index is up to date: {len(removed)} removed files deleted, no new or changed files"
+
+        file_ids: Dict[str, List[str]] = {}
+
+        def documents():
+            files = ({"file_name": file_path, "file_content": read_file(file_path)} for file_path in changed)
+            for document in parse_code_files_for_db(files):
+                file_path = document.metadata["filename"]
+                ids = file_ids.setdefault(file_path, [])
+                document.id = document_id(index_key, file_path, file_versions[file_path], len(ids))
+                ids.append(document.id)
+                yield document
+
+        result = vectorstore.index_documents(documents())
+        for file_path in changed:
+            manifest.update(file_path, file_versions[file_path], file_ids.get(file_path, []))
+        manifest.save()
+        return result
+
     def search_index(self,
                      query: str,
                      collection_suffix: str = "",
@@ -255,41 +427,50 @@ class BaseCodeToolApiWrapper(BaseVectorStoreToolApiWrapper):
 
         logger.info(f"Files in branch: {_files}")
 
-        def is_whitelisted(file_path: str) -> bool:
-            if whitelist:
-                return any(fnmatch.fnmatch(file_path, pattern) for pattern in whitelist)
-            return True
-
-        def is_blacklisted(file_path: str) -> bool:
-            if blacklist:
-                return any(fnmatch.fnmatch(file_path, pattern) for pattern in blacklist)
-            return False
-
         def file_content_generator():
             for file in _files:
-                if is_whitelisted(file) and not is_blacklisted(file):
+                if is_file_selected(file, whitelist, blacklist):
                     yield {"file_name": file,
                            "file_content": self._read_file(file, branch=branch or self.active_branch)}
 
         return parse_code_files_for_db(file_content_generator())
-    
+
+    def _get_file_versions(self, branch: str) -> Optional[Dict[str, str]]:
+        """
+        Returns the blob sha of every file in the branch, or None when the API does not list them.
+        Subclasses implementing it get incremental indexing.
+        """
+        return None
+
     def index_data(self,
                    branch: Optional[str] = None,
                    whitelist: Optional[List[str]] = None,
                    blacklist: Optional[List[str]] = None,
                    collection_suffix: str = "",
+                   incremental: bool = False,
                    **kwargs) -> str:
-        """Index repository files in the vector store using code parsing."""
-        
-        try:
-            from alita_sdk.langchain.interfaces.llm_processor import get_embeddings
-        except ImportError:
-            from src.alita_sdk.langchain.interfaces.llm_processor import get_embeddings
-        
+        """Index repository files in the vector store using code parsing.
+        With incremental=True only files added or changed since the previous incremental run are fetched and
+        indexed, and documents of removed files are deleted."""
+        branch = branch or self.active_branch
+        # only splits missing from the embedding cache are sent to the model
+        vectorstore = self._init_vector_store(collection_suffix, embeddings=self._get_embeddings())
+        if incremental:
+            file_versions = self._get_file_versions(branch)
+            if file_versions is None:
+                logger.info(f"{type(self).__name__} does not list file versions, indexing all files")
+            elif deletable_store(vectorstore) is None:
+                logger.info("Vector store does not support deletion by id, indexing all files")
+            else:
+                file_versions = {file_path: version for file_path, version in file_versions.items()
+                                 if is_file_selected(file_path, whitelist, blacklist)}
+                index_key = self._get_index_key(collection_suffix, branch)
+                return self._index_code_incrementally(vectorstore, self._get_manifest_store(collection_suffix),
+                                                      index_key, file_versions,
+                                                      lambda file_path: self._read_file(file_path, branch=branch))
         documents = self.loader(
             branch=branch,
             whitelist=whitelist,
             blacklist=blacklist
         )
-        vectorstore = self._init_vector_store(collection_suffix)
-        return vectorstore.index_documents(documents)
\ No newline at end of file
+        return vectorstore.index_documents(documents)
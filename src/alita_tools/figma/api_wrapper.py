@@ -11,6 +11,7 @@ from langchain_core.tools import ToolException
 from pydantic import Field, PrivateAttr, create_model, model_validator, SecretStr
 
 from ..elitea_base import BaseToolApiWrapper
+from ..utils.http_session import get_session
 
 GLOBAL_LIMIT = 10000
 
@@ -252,7 +253,7 @@ class FigmaApiWrapper(BaseToolApiWrapper):
             headers.update(extra_headers)
 
         try:
-            response = requests.request(method, url, headers=headers, json=payload)
+            response = get_session().request(method, url, headers=headers, json=payload)
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
@@ -12,7 +12,9 @@ from .schemas import (
     GitHubRepoConfig
 )
 
-from ..elitea_base import BaseVectorStoreToolApiWrapper
+from ..elitea_base import BaseVectorStoreToolApiWrapper, is_file_selected
+from ..utils.index_manifest import deletable_store
+from ..utils import instrumentation
 
 from langchain_core.callbacks import dispatch_custom_event
 
@@ -36,6 +38,7 @@ indexGitHubRepoParams = create_model(
     whitelist=(Optional[List[str]], Field(description="File extensions or paths to include. Defaults to all files if None.", default=None)),
     blacklist=(Optional[List[str]], Field(description="File extensions or paths to exclude. Defaults to no exclusions if None.", default=None)),
     collection_suffix=(Optional[str], Field(description="Optional suffix for collection name (max 7 characters)", default="", max_length=7)),
+    incremental=(Optional[bool], Field(description="Only index files added or changed since the previous incremental run and delete documents of removed files", default=False)),
 )
 
 searchGitHubIndexParams = create_model(
@@ -244,44 +247,69 @@ class AlitaGitHubAPIWrapper(BaseVectorStoreToolApiWrapper):
         tools = github_tools + graphql_tools + vector_store_tools
         return tools
 
+    def _get_cache_state(self) -> Dict[str, Any]:
+        # reads default to the client's active branch, which set_active_branch changes
+        client = self.github_client_instance
+        return {"repository": client.github_repository if client else self.github_repository,
+                "branch": client.active_branch if client else self.active_branch}
+
+    def _get_index_identity(self) -> List[Optional[str]]:
+        return [self.github_base_url, self.github_repository]
+
     def run(self, name: str, *args: Any, **kwargs: Any):
-        for tool in self.get_available_tools():
-            if tool["name"] == name:
-                # Handle potential dictionary input for args when only one dict is passed
-                if len(args) == 1 and isinstance(args[0], dict) and not kwargs:
-                     kwargs = args[0]
-                     args = () # Clear args
-                try:
-                    return tool["ref"](*args, **kwargs)
-                except TypeError as e:
-                     # Attempt to call with kwargs only if args fail and kwargs exist
-                     if kwargs and not args:
-                         try:
-                             return tool["ref"](**kwargs)
-                         except TypeError:
-                             raise ValueError(f"Argument mismatch for tool '{name}'. Error: {e}") from e
-                     else:
-                         raise ValueError(f"Argument mismatch for tool '{name}'. Error: {e}") from e
-        else:
+        tool = self._get_tool(name)
+        if tool is None:
             raise ValueError(f"Unknown tool name: {name}")
+        # Handle potential dictionary input for args when only one dict is passed
+        if len(args) == 1 and isinstance(args[0], dict) and not kwargs:
+             kwargs = args[0]
+             args = () # Clear args
+        with instrumentation.tool_call(type(self).__name__, name) as scope:
+            result = self._call_tool(name, tool, args, kwargs)
+            scope.set_output(result)
+        return result
+
+    def _call_tool(self, name: str, tool: dict, args: tuple, kwargs: dict):
+        try:
+            return self._invoke_tool(tool, *args, **kwargs)
+        except TypeError as e:
+             # Attempt to call with kwargs only if args fail and kwargs exist
+             if kwargs and not args:
+                 try:
+                     return self._invoke_tool(tool, **kwargs)
+                 except TypeError:
+                     raise ValueError(f"Argument mismatch for tool '{name}'. Error: {e}") from e
+             else:
+                 raise ValueError(f"Argument mismatch for tool '{name}'. Error: {e}") from e
 
     def index_data(self,
                    whitelist: Optional[List[str]] = None,
                    blacklist: Optional[List[str]] = None,
                    collection_suffix: str = "",
+                   incremental: bool = False,
                    **kwargs) -> str:
-        """Index GitHub repository files in the vector store using code parsing."""
-        
-        try:
-            from alita_sdk.langchain.interfaces.llm_processor import get_embeddings
-        except ImportError:
-            from src.alita_sdk.langchain.interfaces.llm_processor import get_embeddings
-        
+        """Index GitHub repository files in the vector store using code parsing.
+        With incremental=True only files added or changed since the previous incremental run are fetched and
+        indexed, and documents of removed files are deleted."""
+        vectorstore = self._init_vector_store(collection_suffix, embeddings=self._get_embeddings())
+        if incremental:
+            file_versions = self.github_client_instance._get_file_versions(self.active_branch, self.github_repository)
+            if file_versions is None:
+                logger.info("Repository tree is too large to list at once, indexing all files")
+            elif deletable_store(vectorstore) is None:
+                logger.info("Vector store does not support deletion by id, indexing all files")
+            else:
+                file_versions = {file_path: version for file_path, version in file_versions.items()
+                                 if is_file_selected(file_path, whitelist, blacklist)}
+                index_key = self._get_index_key(collection_suffix, self.active_branch)
+                return self._index_code_incrementally(
+                    vectorstore, self._get_manifest_store(collection_suffix), index_key, file_versions,
+                    lambda file_path: self.github_client_instance._read_file(
+                        file_path, branch=self.active_branch, repo_name=self.github_repository))
         documents = self.github_client_instance.loader(
             branch=self.active_branch,
             whitelist=whitelist,
             blacklist=blacklist,
             repo_name=self.github_repository
         )
-        vectorstore = self._init_vector_store(collection_suffix)
         return vectorstore.index_documents(documents)
@@ -1,7 +1,6 @@
 from __future__ import annotations
 import re
 import fnmatch
-import tiktoken
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -11,6 +10,7 @@ from github import Auth, Github, GithubIntegration, Repository
 from github.Consts import DEFAULT_BASE_URL
 from langchain_core.tools import ToolException
 
+from ..utils.tokens import token_length
 from .schemas import (
     GitHubAuthConfig,
     GitHubRepoConfig,
@@ -202,6 +202,23 @@ class GitHubClient(BaseModel):
 
         return [file.path for file in files]
 
+    def _get_file_versions(self, ref: str, repo_name: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Get the blob sha of every file in a branch from a single recursive git tree request.
+
+        Args:
+            ref: Branch or commit reference
+            repo_name: Optional repository name to override default
+
+        Returns:
+            Mapping of file path to blob sha, or None if GitHub truncated the tree
+        """
+        repo = self.github_api.get_repo(repo_name) if repo_name else self.github_repo_instance
+        tree = repo.get_git_tree(ref, recursive=True)
+        if tree.raw_data.get("truncated"):
+            return None
+        return {element.path: element.sha for element in tree.tree if element.type == "blob"}
+
     def get_files_from_directory(self, directory_path: str, repo_name: Optional[str] = None) -> str:
         """
         Recursively fetches files from a directory in the repo.
@@ -243,7 +260,7 @@ class GitHubClient(BaseModel):
             }
             return issue_data
         except Exception as e:
-            return f"Failed to get issue: {str(e)}"
+            return ToolException(f"Failed to get issue: {str(e)}")
 
     def list_files_in_main_branch(self, repo_name: Optional[str] = None) -> str:
         """
@@ -343,14 +360,11 @@ class GitHubClient(BaseModel):
             pull = repo.get_pull(number=int(pr_number))
             total_tokens = 0
 
-            def get_tokens(text: str) -> int:
-                return len(tiktoken.get_encoding("cl100k_base").encode(text))
-
             def add_to_dict(data_dict: Dict[str, Any], key: str, value: Any) -> None:
                 nonlocal total_tokens  # Declare total_tokens as nonlocal
                 # Convert value to string only for token counting if it's not already a string
                 value_str = str(value) if not isinstance(value, str) else value
-                tokens = get_tokens(value_str)
+                tokens = token_length(value_str)
                 if total_tokens + tokens <= max_tokens:
                     data_dict[key] = value
                     total_tokens += tokens
@@ -369,10 +383,10 @@ class GitHubClient(BaseModel):
                     break
                 for comment in comments_page:
                     comment_str = str({"body": comment.body, "user": comment.user.login})
-                    if total_tokens + get_tokens(comment_str) > max_tokens:
+                    if total_tokens + token_length(comment_str) > max_tokens:
                         break
                     comments.append(comment_str)
-                    total_tokens += get_tokens(comment_str)
+                    total_tokens += token_length(comment_str)
                 page += 1
             add_to_dict(response_dict, "comments", str(comments))
 
@@ -384,15 +398,15 @@ class GitHubClient(BaseModel):
                     break
                 for commit in commits_page:
                     commit_str = str({"message": commit.commit.message})
-                    if total_tokens + get_tokens(commit_str) > max_tokens:
+                    if total_tokens + token_length(commit_str) > max_tokens:
                         break
                     commits.append(commit_str)
-                    total_tokens += get_tokens(commit_str)
+                    total_tokens += token_length(commit_str)
                 page += 1
             add_to_dict(response_dict, "commits", str(commits))
             return response_dict
         except Exception as e:
-            return f"Failed to get pull request: {str(e)}"
+            return ToolException(f"Failed to get pull request: {str(e)}")
 
     def list_pull_request_diffs(self, pr_number: int, repo_name: Optional[str] = None) -> str:
         """
@@ -427,8 +441,7 @@ class GitHubClient(BaseModel):
                 )
             return data
         except Exception as e:
-            # Return error as JSON instead of plain string
-            return {"error": str(e), "message": f"Failed to get pull request diffs: {str(e)}"}
+            return ToolException(f"Failed to get pull request diffs: {str(e)}")
 
     def create_branch(self, proposed_branch_name: str, repo_name: Optional[str] = None) -> str:
         """
@@ -847,13 +860,15 @@ class GitHubClient(BaseModel):
             str: The file decoded as a string, or an error message if not found
         """
         try:
-            repo = self.github_api.get_repo(repo_name) if repo_name else self.github_repo_instance
-            file = repo.get_contents(file_path, ref=branch)
-            return file.decoded_content.decode("utf-8")
+            return self._get_file_content(file_path, branch, repo_name)
         except Exception as e:
-            from traceback import format_exc
             return f"File not found `{file_path}` on branch `{branch}`. Error: {str(e)}"
 
+    def _get_file_content(self, file_path: str, branch: str, repo_name: Optional[str] = None) -> str:
+        repo = self.github_api.get_repo(repo_name) if repo_name else self.github_repo_instance
+        file = repo.get_contents(file_path, ref=branch)
+        return file.decoded_content.decode("utf-8")
+
     def read_file(self, file_path: str, branch: Optional[str] = None, repo_name: Optional[str] = None) -> str:
         """
         Read a file from the active branch
@@ -865,7 +880,11 @@ class GitHubClient(BaseModel):
         Returns:
             str: The file contents as a string
         """
-        return self._read_file(file_path, branch if branch else self.active_branch, repo_name)
+        branch = branch if branch else self.active_branch
+        try:
+            return self._get_file_content(file_path, branch, repo_name)
+        except Exception as e:
+            return ToolException(f"File not found `{file_path}` on branch `{branch}`. Error: {str(e)}")
 
     def loader(self,
                branch: Optional[str] = None,
@@ -1310,6 +1329,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.get_issue,
                 "name": "get_issue",
+                "cache": "read",
                 "mode": "get_issue",
                 "description": GET_ISSUE_PROMPT,
                 "args_schema": GetIssue,
@@ -1317,6 +1337,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.comment_on_issue,
                 "name": "comment_on_issue",
+                "cache": "write",
                 "mode": "comment_on_issue",
                 "description": COMMENT_ON_ISSUE_PROMPT,
                 "args_schema": CommentOnIssue,
@@ -1331,6 +1352,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.get_pull_request,
                 "name": "get_pull_request",
+                "cache": "read",
                 "mode": "get_pull_request",
                 "description": GET_PR_PROMPT,
                 "args_schema": GetPR,
@@ -1338,6 +1360,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.list_pull_request_diffs,
                 "name": "list_pull_request_diffs",
+                "cache": "read",
                 "mode": "list_pull_request_diffs",
                 "description": LIST_PULL_REQUEST_FILES,
                 "args_schema": GetPR, # Uses repo_name, pr_number
@@ -1345,6 +1368,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.create_pull_request,
                 "name": "create_pull_request",
+                "cache": "write",
                 "mode": "create_pull_request",
                 "description": CREATE_PULL_REQUEST_PROMPT,
                 "args_schema": CreatePR,
@@ -1352,6 +1376,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.create_file,
                 "name": "create_file",
+                "cache": "write",
                 "mode": "create_file",
                 "description": CREATE_FILE_PROMPT,
                 "args_schema": CreateFile,
@@ -1359,6 +1384,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.read_file,
                 "name": "read_file",
+                "cache": "read",
                 "mode": "read_file",
                 "description": READ_FILE_PROMPT,
                 "args_schema": ReadFile,
@@ -1366,6 +1392,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.update_file,
                 "name": "update_file",
+                "cache": "write",
                 "mode": "update_file",
                 "description": UPDATE_FILE_PROMPT,
                 "args_schema": UpdateFile,
@@ -1373,6 +1400,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.delete_file,
                 "name": "delete_file",
+                "cache": "write",
                 "mode": "delete_file",
                 "description": DELETE_FILE_PROMPT,
                 "args_schema": DeleteFile,
@@ -1401,6 +1429,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.set_active_branch,
                 "name": "set_active_branch",
+                "cache": "write",
                 "mode": "set_active_branch",
                 "description": SET_ACTIVE_BRANCH_PROMPT,
                 "args_schema": BranchName,
@@ -1408,6 +1437,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.create_branch,
                 "name": "create_branch",
+                "cache": "write",
                 "mode": "create_branch",
                 "description": CREATE_BRANCH_PROMPT,
                 "args_schema": CreateBranchName,
@@ -1429,6 +1459,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.create_issue,
                 "name": "create_issue",
+                "cache": "write",
                 "mode": "create_issue",
                 "description": CREATE_ISSUE_PROMPT,
                 "args_schema": CreateIssue,
@@ -1436,6 +1467,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.update_issue,
                 "name": "update_issue",
+                "cache": "write",
                 "mode": "update_issue",
                 "description": UPDATE_ISSUE_PROMPT,
                 "args_schema": UpdateIssue,
@@ -1457,6 +1489,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.trigger_workflow,
                 "name": "trigger_workflow",
+                "cache": "write",
                 "mode": "trigger_workflow",
                 "description": self.trigger_workflow.__doc__,
                 "args_schema": TriggerWorkflow,
@@ -1478,6 +1511,7 @@ class GitHubClient(BaseModel):
             {
                 "ref": self.generic_github_api_call,
                 "name": "generic_github_api_call",
+                "cache": "write",
                 "mode": "generic_github_api_call",
                 "description": self.generic_github_api_call.__doc__,
                 "args_schema": GenericGithubAPICall,
@@ -1632,6 +1632,7 @@ class GraphQLClientWrapper(BaseModel):
             {
                 "ref": self.create_issue_on_project,
                 "name": "create_issue_on_project",
+                "cache": "write",
                 "mode": "create_issue_on_project",
                 "description": CREATE_ISSUE_ON_PROJECT_PROMPT,
                 "args_schema": CreateIssueOnProject,
@@ -1639,6 +1640,7 @@ class GraphQLClientWrapper(BaseModel):
             {
                 "ref": self.update_issue_on_project,
                 "name": "update_issue_on_project",
+                "cache": "write",
                 "mode": "update_issue_on_project",
                 "description": UPDATE_ISSUE_ON_PROJECT_PROMPT,
                 "args_schema": UpdateIssueOnProject,
@@ -1,10 +1,11 @@
 from typing import Optional, Type
 
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
 from pydantic import BaseModel, field_validator, Field
 from langchain_core.tools import BaseTool
 from traceback import format_exc
 from .api_wrapper import AlitaGitHubAPIWrapper
+from ..utils.executor import run_in_executor
 
 
 class GitHubAction(BaseTool):
@@ -32,3 +33,15 @@ class GitHubAction(BaseTool):
             return self.api_wrapper.run(self.mode, *args, **kwargs)
         except Exception as e:
             return f"Error: {format_exc()}"
+
+    async def _arun(
+        self,
+        *args,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+        **kwargs,
+    ) -> str:
+        """Use the GitHub API to run an operation in the shared bounded executor."""
+        try:
+            return await run_in_executor(self.api_wrapper.run, self.mode, *args, **kwargs)
+        except Exception as e:
+            return f"Error: {format_exc()}"
@@ -13,8 +13,10 @@ from pydantic import Field, PrivateAttr, model_validator, create_model, SecretSt
 import requests
 
 from ..elitea_base import BaseToolApiWrapper
-from ..llm.img_utils import ImageDescriptionCache
+from ..llm.img_utils import (ImageDescriptionCache, find_image_references, get_image_description_cache,
+                             llm_model_name, resolve_concurrently, splice)
 from ..utils import is_cookie_token, parse_cookie_string
+from ..utils.rate_limit import install_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -400,7 +402,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
     additional_fields: list[str] | str | None = []
     verify_ssl: Optional[bool] = True
     _client: Jira = PrivateAttr()
-    _image_cache: ImageDescriptionCache = PrivateAttr(default_factory=lambda: ImageDescriptionCache(max_size=50))
+    _image_cache: ImageDescriptionCache = PrivateAttr(default_factory=get_image_description_cache)
     issue_search_pattern: str = r'/rest/api/\d+/search'
     llm: Any = None
 
@@ -434,6 +436,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
             cls._client = Jira(url=url, token=token, cloud=cloud, verify_ssl=values['verify_ssl'], api_version=api_version)
         else:
             cls._client = Jira(url=url, username=username, password=api_key, cloud=cloud, verify_ssl=values['verify_ssl'], api_version=api_version)
+        install_rate_limiter(cls._client.session)
         cls.llm=values.get('llm')
         return values
 
@@ -686,7 +689,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
         except Exception:
             stacktrace = format_exc()
             logger.error(f"Unable to extract any comments from the issue: {stacktrace}")
-            return f"Error during the attempt to extract available comments: {stacktrace}"
+            return ToolException(f"Error during the attempt to extract available comments: {stacktrace}")
 
     def add_comments(self, issue_key: str, comment: str):
         """ Add a comment to a Jira issue."""
@@ -869,8 +872,24 @@ class JiraApiWrapper(BaseToolApiWrapper):
         Returns:
             Generated description from the LLM
         """
+        # Use default or custom prompt
+        prompt = custom_prompt if custom_prompt else self._get_default_image_analysis_prompt()
+
+        # Add context information if available
+        if image_name or context_text:
+            prompt += "\n\n## Additional Context Information:\n"
+
+            if image_name:
+                prompt += f"- Image Name/Reference: {image_name}\n"
+
+            if context_text:
+                prompt += f"- Surrounding Content: {context_text}\n"
+
+            prompt += "\nPlease incorporate this contextual information in your description when relevant."
+
         # Check cache first to avoid redundant processing
-        cached_description = self._image_cache.get(image_data, image_name)
+        model = llm_model_name(self.llm)
+        cached_description = self._image_cache.get(image_data, prompt, model)
         if cached_description:
             logger.info(f"Using cached description for image: {image_name}")
             return cached_description
@@ -909,21 +928,6 @@ class JiraApiWrapper(BaseToolApiWrapper):
                 logger.warning(f"Error converting image {image_name}: {str(conv_error)}")
                 return f"[Error converting image {image_name}: {str(conv_error)}]"
 
-            # Use default or custom prompt
-            prompt = custom_prompt if custom_prompt else self._get_default_image_analysis_prompt()
-
-            # Add context information if available
-            if image_name or context_text:
-                prompt += "\n\n## Additional Context Information:\n"
-
-                if image_name:
-                    prompt += f"- Image Name/Reference: {image_name}\n"
-
-                if context_text:
-                    prompt += f"- Surrounding Content: {context_text}\n"
-
-                prompt += "\nPlease incorporate this contextual information in your description when relevant."
-
             # Perform LLM invocation with image
             result = llm.invoke([
                 HumanMessage(
@@ -940,7 +944,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
             description = result.content
 
             # Cache the result for future use
-            self._image_cache.set(image_data, description, image_name)
+            self._image_cache.set(image_data, description, prompt, model)
 
             return description
         except Exception as e:
@@ -1021,7 +1025,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
         This method will:
         1. Extract the specified field content from Jira
         2. Detect images in the content
-        3. Retrieve and process each image with an LLM, providing surrounding context
+        3. Retrieve and process the images with an LLM concurrently, providing surrounding context
         4. Replace image references with the generated text descriptions
 
         Args:
@@ -1042,7 +1046,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
                 existing_fields = [key for key, value in self._client.issue(jira_issue_key).get("fields").items() if
                                 value is not None]
                 existing_fields_str = ', '.join(existing_fields)
-                return f"Unable to find field '{field_name}' or it's empty. Available fields are: {existing_fields_str}"
+                return ToolException(f"Unable to find field '{field_name}' or it's empty. Available fields are: {existing_fields_str}")
 
             # Handle multiple images or non-string content
             if isinstance(field_content, list):
@@ -1100,8 +1104,10 @@ class JiraApiWrapper(BaseToolApiWrapper):
                     logger.error(f"Error processing image {image_ref}: {str(img_e)}")
                     return f"[Image: {image_ref} - Error: {str(img_e)}]"
 
-            # Replace each image reference with its description
-            augmented_content = re.sub(image_pattern, process_image_match, field_content)
+            # Download and describe the images concurrently, then replace the references in one pass
+            references = find_image_references(field_content, [image_pattern])
+            descriptions = resolve_concurrently(references, process_image_match)
+            augmented_content = splice(field_content, references, descriptions)
 
             return f"Field '{field_name}' from issue '{jira_issue_key}' with image descriptions:\n\n{augmented_content}"
 
@@ -1109,7 +1115,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
             from traceback import format_exc
             stacktrace = format_exc()
             logger.error(f"Error processing field with images: {stacktrace}")
-            return f"Error processing field with images: {str(e)}"
+            return ToolException(f"Error processing field with images: {str(e)}")
 
     def get_comments_with_image_descriptions(self, jira_issue_key: str, prompt: Optional[str] = None, context_radius: int = 500):
         """
@@ -1118,7 +1124,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
         This method will:
         1. Extract all comments from the specified Jira issue
         2. Detect images in each comment
-        3. Retrieve and process each image with an LLM, providing surrounding context
+        3. Retrieve and process the images with an LLM concurrently, providing surrounding context
         4. Replace image references with the generated text descriptions
 
         Args:
@@ -1144,60 +1150,70 @@ class JiraApiWrapper(BaseToolApiWrapper):
             # Regular expression to find image references in Jira markup
             image_pattern = r'!([^!|]+)(?:\|[^!]*)?!'
 
-            # Process each comment
-            for comment in comments['comments']:
-                comment_body = comment.get('body', '')
-                if not comment_body:
-                    continue
+            # Function to process images in comment text
+            def process_image_match(reference):
+                """Process each image reference and get its contextual description"""
+                comment_body, match = reference
+                image_ref = match.group(1)
+                full_match = match.group(0)  # The complete image reference with markers
 
-                comment_author = comment.get('author', {}).get('displayName', 'Unknown')
-                comment_created = comment.get('created', 'Unknown date')
+                logger.info(f"Processing image reference: {image_ref} (full match: {full_match})")
 
-                # Function to process images in comment text
-                def process_image_match(match):
-                    """Process each image reference and get its contextual description"""
-                    image_ref = match.group(1)
-                    full_match = match.group(0)  # The complete image reference with markers
+                try:
+                    # Use the AttachmentResolver to find the attachment
+                    attachment = attachment_resolver.find_attachment(image_ref)
 
-                    logger.info(f"Processing image reference: {image_ref} (full match: {full_match})")
+                    if not attachment:
+                        logger.warning(f"Could not find attachment for reference: {image_ref}")
+                        return f"[Image: {image_ref} - attachment not found]"
 
-                    try:
-                        # Use the AttachmentResolver to find the attachment
-                        attachment = attachment_resolver.find_attachment(image_ref)
+                    # Get the content URL and download the image
+                    content_url = attachment.get('content')
+                    if not content_url:
+                        logger.error(f"No content URL found in attachment: {attachment}")
+                        return f"[Image: {image_ref} - no content URL]"
 
-                        if not attachment:
-                            logger.warning(f"Could not find attachment for reference: {image_ref}")
-                            return f"[Image: {image_ref} - attachment not found]"
+                    image_name = attachment.get('filename', image_ref)
+
+                    # Collect surrounding content
+                    context_text = self._collect_context_for_image(comment_body, full_match, context_radius)
 
-                        # Get the content URL and download the image
-                        content_url = attachment.get('content')
-                        if not content_url:
-                            logger.error(f"No content URL found in attachment: {attachment}")
-                            return f"[Image: {image_ref} - no content URL]"
+                    # Download the image data
+                    logger.info(f"Downloading image from URL: {content_url}")
+                    image_data = self._download_attachment(content_url)
 
-                        image_name = attachment.get('filename', image_ref)
+                    if not image_data:
+                        logger.error(f"Failed to download image from URL: {content_url}")
+                        return f"[Image: {image_ref} - download failed]"
 
-                        # Collect surrounding content
-                        context_text = self._collect_context_for_image(comment_body, full_match, context_radius)
+                    # Process with LLM (will use cache if available)
+                    description = self._process_image_with_llm(image_data, image_name, context_text, prompt)
+                    return f"[Image {image_name} Description: {description}]"
 
-                        # Download the image data
-                        logger.info(f"Downloading image from URL: {content_url}")
-                        image_data = self._download_attachment(content_url)
+                except Exception as e:
+                    logger.error(f"Error retrieving attachment {image_ref}: {str(e)}")
+                    return f"[Image: {image_ref} - Error: {str(e)}]"
 
-                        if not image_data:
-                            logger.error(f"Failed to download image from URL: {content_url}")
-                            return f"[Image: {image_ref} - download failed]"
+            # Collect the image references of all comments
+            comment_references = []
+            for comment in comments['comments']:
+                comment_body = comment.get('body', '')
+                if comment_body:
+                    comment_references.append((comment, find_image_references(comment_body, [image_pattern])))
 
-                        # Process with LLM (will use cache if available)
-                        description = self._process_image_with_llm(image_data, image_name, context_text, prompt)
-                        return f"[Image {image_name} Description: {description}]"
+            # Download and describe the images of all comments concurrently
+            descriptions = iter(resolve_concurrently(
+                [(comment['body'], match) for comment, references in comment_references for match in references],
+                process_image_match))
 
-                    except Exception as e:
-                        logger.error(f"Error retrieving attachment {image_ref}: {str(e)}")
-                        return f"[Image: {image_ref} - Error: {str(e)}]"
+            # Process each comment
+            for comment, references in comment_references:
+                comment_body = comment['body']
+                comment_author = comment.get('author', {}).get('displayName', 'Unknown')
+                comment_created = comment.get('created', 'Unknown date')
 
                 # Process the comment body by replacing image references with descriptions
-                processed_body = re.sub(image_pattern, process_image_match, comment_body)
+                processed_body = splice(comment_body, references, [next(descriptions) for _ in references])
 
                 # Add the processed comment to our results
                 processed_comments.append({
@@ -1219,7 +1235,7 @@ class JiraApiWrapper(BaseToolApiWrapper):
         except Exception as e:
             stacktrace = format_exc()
             logger.error(f"Error processing comments with images: {stacktrace}")
-            return f"Error processing comments with images: {str(e)}"
+            return ToolException(f"Error processing comments with images: {str(e)}")
 
     def get_available_tools(self):
         return [
@@ -1231,30 +1247,35 @@ class JiraApiWrapper(BaseToolApiWrapper):
             },
             {
                 "name": "create_issue",
+                "cache": "write",
                 "description": self.create_issue.__doc__,
                 "args_schema": JiraCreateIssue,
                 "ref": self.create_issue,
             },
             {
                 "name": "update_issue",
+                "cache": "write",
                 "description": self.update_issue.__doc__,
                 "args_schema": JiraUpdateIssue,
                 "ref": self.update_issue,
             },
             {
                 "name": "modify_labels",
+                "cache": "write",
                 "description": self.modify_labels.__doc__,
                 "args_schema": ModifyLabels,
                 "ref": self.modify_labels,
             },
             {
                 "name": "list_comments",
+                "cache": "read",
                 "description": self.list_comments.__doc__,
                 "args_schema": ListCommentsInput,
                 "ref": self.list_comments,
             },
             {
                 "name": "add_comments",
+                "cache": "write",
                 "description": self.add_comments.__doc__,
                 "args_schema": AddCommentInput,
                 "ref": self.add_comments,
@@ -1267,48 +1288,56 @@ class JiraApiWrapper(BaseToolApiWrapper):
             },
             {
                 "name": "set_issue_status",
+                "cache": "write",
                 "description": self.set_issue_status.__doc__,
                 "args_schema": SetIssueStatus,
                 "ref": self.set_issue_status,
             },
             {
                 "name": "get_specific_field_info",
+                "cache": "read",
                 "description": self.get_specific_field_info.__doc__,
                 "args_schema": GetSpecificFieldInfo,
                 "ref": self.get_specific_field_info,
             },
             {
                 "name": "get_field_with_image_descriptions",
+                "cache": "read",
                 "description": self.get_field_with_image_descriptions.__doc__,
                 "args_schema": GetFieldWithImageDescriptions,
                 "ref": self.get_field_with_image_descriptions,
             },
             {
                 "name": "get_comments_with_image_descriptions",
+                "cache": "read",
                 "description": self.get_comments_with_image_descriptions.__doc__,
                 "args_schema": GetCommentsWithImageDescriptions,
                 "ref": self.get_comments_with_image_descriptions,
             },
             {
                 "name": "get_remote_links",
+                "cache": "read",
                 "description": self.get_remote_links.__doc__,
                 "args_schema": GetRemoteLinks,
                 "ref": self.get_remote_links,
             },
             {
                 "name": "link_issues",
+                "cache": "write",
                 "description": self.link_issues.__doc__,
                 "args_schema": LinkIssues,
                 "ref": self.link_issues,
             },
             {
                 "name": "get_attachments_content",
+                "cache": "read",
                 "description": self.get_attachments_content.__doc__,
                 "args_schema": GetRemoteLinks,
                 "ref": self.get_attachments_content,
             },
             {
                 "name": "execute_generic_rq",
+                "cache": "write",
                 "ref": self.execute_generic_rq,
                 "description": self.execute_generic_rq.__doc__,
                 "args_schema": JiraInput,
@@ -1,43 +1,253 @@
+"""
+Cache of LLM image descriptions shared by the Confluence and Jira toolkits.
+
+Descriptions are keyed by the sha256 of the image, the sha256 of the prompt it was described
+with (which includes the image name and the surrounding text) and the model, so a diagram on an
+unchanged page is only described once. Recently used descriptions are kept in memory and evicted
+least recently used first by total size. The process-wide cache can also keep them in a local
+sqlite file, opt-in: ``ALITA_IMAGE_DESCRIPTION_CACHE`` is its path (unset or ``none`` keeps them in
+memory only) and its size is kept under ``ALITA_IMAGE_DESCRIPTION_CACHE_MAX_BYTES``.
+
+Images of a page are described in two phases: :func:`find_image_references` collects the
+references, :func:`resolve_concurrently` downloads and describes them with a bounded pool of
+threads and :func:`splice` puts the descriptions in place in one pass.
+"""
 import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+from ..utils.executor import map_ordered
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "alita_tools", "image_descriptions.sqlite")
+DEFAULT_MAX_BYTES = int(os.environ.get("ALITA_IMAGE_DESCRIPTION_CACHE_MAX_BYTES", 256 * 1024 ** 2))
+DEFAULT_MEMORY_MAX_BYTES = int(os.environ.get("ALITA_IMAGE_DESCRIPTION_MEMORY_MAX_BYTES", 16 * 1024 ** 2))
+# eviction removes descriptions until the store is this fraction of max_bytes
+EVICTION_TARGET = 0.9
+DEFAULT_IMAGE_WORKERS = int(os.environ.get("ALITA_IMAGE_DESCRIPTION_WORKERS", 4))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def llm_model_name(llm: Any) -> str:
+    """Name of the model behind an LLM client, part of the description cache key."""
+    for attribute in ("model_name", "model", "deployment_name"):
+        name = getattr(llm, attribute, None)
+        if isinstance(name, str) and name:
+            return name
+    return type(llm).__name__
+
+
+class ImageDescriptionStore:
+    """sqlite-backed description store shared between processes, with LRU eviction by total size."""
+
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS image_descriptions "
+                         "(key TEXT PRIMARY KEY, size INTEGER, accessed REAL, description TEXT)")
+            conn.execute("CREATE INDEX IF NOT EXISTS image_descriptions_accessed ON image_descriptions (accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT description FROM image_descriptions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE image_descriptions SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def set(self, key: str, description: str):
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO image_descriptions (key, size, accessed, description) "
+                         "VALUES (?, ?, ?, ?)", (key, len(description.encode("utf-8")), time.time(), description))
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM image_descriptions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICTION_TARGET)
+        removed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM image_descriptions ORDER BY accessed"):
+            stale.append((key,))
+            removed += size
+            if removed >= excess:
+                break
+        conn.executemany("DELETE FROM image_descriptions WHERE key = ?", stale)
+        logger.debug(f"Evicted {len(stale)} image descriptions ({removed} bytes) from {self.path}")
+
+    def size(self) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM image_descriptions").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM image_descriptions")
+
+
+@dataclass
+class ImageCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self) -> str:
+        return f"Image description cache: {self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate)"
 
 
 class ImageDescriptionCache:
     """Cache for image descriptions to avoid processing the same image multiple times"""
 
-    def __init__(self, max_size=50):
-        self.cache = {}  # content_hash -> description
-        self.max_size = max_size
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_MAX_BYTES, store: Optional[ImageDescriptionStore] = None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self.stats = ImageCacheStats()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
 
-    def get(self, image_data, image_name=""):
-        """Get a cached description if available"""
-        if not image_data:
-            return None
+    @staticmethod
+    def key(image_data: bytes, prompt: str = "", model: str = "") -> str:
+        image_hash = hashlib.sha256(image_data).hexdigest()
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"{image_hash}:{prompt_hash}:{model}"
 
-        # Generate a content hash for the image
-        content_hash = hashlib.md5(image_data).hexdigest()
+    @property
+    def size(self) -> int:
+        """Bytes of the descriptions held in memory."""
+        return self._bytes
 
-        # Create a composite key that includes the image name when available
-        cache_key = f"{content_hash}_{image_name}" if image_name else content_hash
+    def _remember(self, key: str, description: str):
+        # called with the lock held
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key).encode("utf-8"))
+        self._entries[key] = description
+        self._bytes += len(description.encode("utf-8"))
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            self._bytes -= len(self._entries.popitem(last=False)[1].encode("utf-8"))
 
-        return self.cache.get(cache_key)
+    def get(self, image_data: Optional[bytes], prompt: str = "", model: str = "") -> Optional[str]:
+        """Get a cached description if available"""
+        if not image_data:
+            return None
+        key = self.key(image_data, prompt, model)
+        with self._lock:
+            description = self._entries.get(key)
+            if description is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return description
+        if self.store is not None:
+            try:
+                description = self.store.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Image description store is unavailable: {e}")
+        with self._lock:
+            if description is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._remember(key, description)
+        return description
 
-    def set(self, image_data, description, image_name=""):
+    def set(self, image_data: Optional[bytes], description: str, prompt: str = "", model: str = ""):
         """Cache a description for an image"""
         if not image_data or not description:
             return
+        key = self.key(image_data, prompt, model)
+        with self._lock:
+            self._remember(key, description)
+        if self.store is not None:
+            try:
+                self.store.set(key, description)
+            except sqlite3.Error as e:
+                logger.warning(f"Image description store is unavailable: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+
+_cache: Optional[ImageDescriptionCache] = None
+_cache_setting: Optional[str] = None
+_cache_lock = Lock()
+
+
+def get_image_description_cache() -> ImageDescriptionCache:
+    """
+    Returns the process-wide cache, persisted to the store at the path in
+    ``ALITA_IMAGE_DESCRIPTION_CACHE``; in memory only if that is unset, ``none`` or unavailable.
+    """
+    global _cache, _cache_setting
+    setting = os.environ.get("ALITA_IMAGE_DESCRIPTION_CACHE", "none")
+    with _cache_lock:
+        if _cache is None or _cache_setting != setting:
+            store = None
+            if setting and setting != "none":
+                try:
+                    store = ImageDescriptionStore(setting)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Image description store is unavailable, caching in memory only: {e}")
+            _cache = ImageDescriptionCache(store=store)
+            _cache_setting = setting
+    return _cache
+
+
+def find_image_references(content: str, patterns: Sequence[str]) -> List[re.Match]:
+    """
+    Matches of `patterns` in `content` ordered by position, found as if the patterns were
+    substituted one after another: each pattern is searched with the matches of the earlier ones
+    masked, and a match overlapping an earlier one is dropped.
+    """
+    references: List[re.Match] = []
+    masked = content
+    for pattern in patterns:
+        for match in re.finditer(pattern, masked):
+            if not any(match.start() < other.end() and other.start() < match.end() for other in references):
+                references.append(match)
+        references.sort(key=lambda match: match.start())
+        masked = splice(content, references, ["\0" * (match.end() - match.start()) for match in references])
+    return references
+
+
+def resolve_concurrently(items: Sequence[T], resolve: Callable[[T], R],
+                         max_workers: Optional[int] = DEFAULT_IMAGE_WORKERS) -> List[R]:
+    """Returns ``[resolve(item) for item in items]`` with up to `max_workers` items resolved at the same time."""
+    return list(map_ordered(resolve, items, max_workers if len(items) > 1 else 1))
+
 
-        # Generate content hash
-        content_hash = hashlib.md5(image_data).hexdigest()
-
-        # Create a composite key that includes the image name when available
-        cache_key = f"{content_hash}_{image_name}" if image_name else content_hash
-
-        # Only cache if we have room or if evicting one entry is enough
-        if len(self.cache) < self.max_size:
-            self.cache[cache_key] = description
-        else:
-            # Simple LRU: just remove a random entry if we're at capacity
-            if len(self.cache) >= self.max_size:
-                # Remove one entry to make room
-                self.cache.pop(next(iter(self.cache)))
-                self.cache[cache_key] = description
\ No newline at end of file
+def splice(content: str, matches: Sequence[re.Match], replacements: Sequence[str]) -> str:
+    """Replaces non-overlapping `matches`, ordered by position, with `replacements` in one pass."""
+    parts: List[str] = []
+    position = 0
+    for match, replacement in zip(matches, replacements):
+        parts.append(content[position:match.start()])
+        parts.append(replacement)
+        position = match.end()
+    parts.append(content[position:])
+    return "".join(parts)
@@ -0,0 +1,116 @@
+"""
+Caching of toolkit configuration schemas.
+
+``toolkit_config_schema()`` builds pydantic models with ``create_model`` on every call,
+which is wasteful for callers (e.g. UI backends) that request the schemas repeatedly.
+Schemas are memoized per process and keyed by the package version, and can be dumped
+to a prebuilt JSON artifact so that JSON schemas are served without importing toolkits.
+"""
+import json
+import logging
+import os
+from importlib.metadata import PackageNotFoundError, version
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_NAME = "alita_tools"
+SCHEMA_ARTIFACT_ENV = "ALITA_TOOLS_SCHEMA_ARTIFACT"
+DEFAULT_SCHEMA_ARTIFACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "toolkit_schemas.json")
+
+_models: Dict[tuple, Any] = {}
+_json_schemas: Dict[tuple, List[dict]] = {}
+_lock = Lock()
+_package_version: Optional[str] = None
+
+
+def package_version() -> str:
+    global _package_version
+    if _package_version is None:
+        try:
+            _package_version = version(PACKAGE_NAME)
+        except PackageNotFoundError:
+            _package_version = "unknown"
+    return _package_version
+
+
+def get_toolkit_model(module: str, class_name: str):
+    """Returns the (memoized) config schema model of a registered toolkit class."""
+    key = (package_version(), module, class_name)
+    model = _models.get(key)
+    if model is None:
+        from . import _resolve
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                model = _resolve(module, class_name).toolkit_config_schema()
+                _models[key] = model
+    return model
+
+
+def get_toolkit_models() -> list:
+    """Returns config schema models of all registered toolkits, in registry order."""
+    from . import _TOOLKITS_REGISTRY
+    return [get_toolkit_model(module, class_name) for module, class_name in _TOOLKITS_REGISTRY]
+
+
+def _artifact_path(path: Optional[str] = None) -> str:
+    return path or os.environ.get(SCHEMA_ARTIFACT_ENV) or DEFAULT_SCHEMA_ARTIFACT
+
+
+def load_schema_artifact(path: Optional[str] = None) -> Optional[List[dict]]:
+    """Loads prebuilt JSON schemas, or returns None if the artifact is missing or stale."""
+    artifact = _artifact_path(path)
+    if not os.path.isfile(artifact):
+        return None
+    try:
+        with open(artifact, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Unable to read toolkit schema artifact '{artifact}': {e}")
+        return None
+    current_version = package_version()
+    # development builds without package metadata can not tell whether the artifact matches
+    if current_version == "unknown" or data.get("version") != current_version:
+        logger.info(f"Ignoring toolkit schema artifact '{artifact}' built for version {data.get('version')}")
+        return None
+    return data.get("schemas")
+
+
+def get_toolkit_json_schemas(path: Optional[str] = None) -> List[dict]:
+    """
+    Returns JSON schemas of all registered toolkits.
+
+    The prebuilt artifact is used when it matches the installed package version,
+    otherwise schemas are generated (importing toolkit modules) and memoized.
+    """
+    key = (package_version(), _artifact_path(path))
+    schemas = _json_schemas.get(key)
+    if schemas is None:
+        schemas = load_schema_artifact(path)
+        if schemas is None:
+            schemas = [model.model_json_schema() for model in get_toolkit_models()]
+        _json_schemas[key] = schemas
+    return schemas
+
+
+def build_schema_artifact(path: Optional[str] = None) -> str:
+    """Generates JSON schemas of all registered toolkits and writes them to the artifact."""
+    artifact = _artifact_path(path)
+    schemas = [model.model_json_schema() for model in get_toolkit_models()]
+    with open(artifact, "w", encoding="utf-8") as f:
+        json.dump({"version": package_version(), "schemas": schemas}, f)
+    return artifact
+
+
+def clear_cache():
+    _models.clear()
+    _json_schemas.clear()
+    global _package_version
+    _package_version = None
+
+
+if __name__ == "__main__":
+    import sys
+    print(build_schema_artifact(sys.argv[1] if len(sys.argv) > 1 else None))
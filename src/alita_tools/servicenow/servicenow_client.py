@@ -1,6 +1,7 @@
-import requests
 from pydantic import SecretStr
 
+from ..utils.http_session import get_session
+
 # TODO: Minimal client to perform calls, needed features for full functionality:
 #  create_incident, update_incident
 
@@ -42,7 +43,7 @@ class ServiceNowClient(object):
 
         if number_of_entries:
             endpoint_url += f"&sysparm_limit={number_of_entries}"
-        response = requests.get(
+        response = get_session().get(
             url=endpoint_url,
             auth=(self.username, self.password.get_secret_value()),
             headers={"Content-Type": "application/json", "Accept": "application/json"}
@@ -56,7 +57,7 @@ class ServiceNowClient(object):
         for key, value in args.items():
             if value is not None:
                 update_dict[key] = value
-        response = requests.post(
+        response = get_session().post(
             url=endpoint_url,
             auth=(self.username, self.password.get_secret_value()),
             headers={"Content-Type": "application/json", "Accept": "application/json"},
@@ -76,7 +77,7 @@ class ServiceNowClient(object):
         for key, value in args.items():
             if value is not None:
                 update_dict[key] = value
-        response = requests.patch(
+        response = get_session().patch(
             url=endpoint_url,
             auth=(self.username, self.password.get_secret_value()),
             headers={"Content-Type": "application/json", "Accept": "application/json"},
@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 
 import jwt
-import requests
+
+from ..utils.http_session import get_session
 
 class SharepointAuthorizationHelper:
 
@@ -28,7 +29,7 @@ class SharepointAuthorizationHelper:
             'refresh_token': self.token_json,
             'scope': self.scope
         }
-        response = requests.post(url, headers=headers, data=data)
+        response = get_session().post(url, headers=headers, data=data)
         if response.status_code == 200:
             return response.json()["access_token"]
         else:
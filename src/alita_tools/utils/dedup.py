@@ -0,0 +1,194 @@
+"""
+Near-duplicate chunk detection before embedding.
+
+Every chunk gets a MinHash signature of its word shingles. An LSH index over bands of the
+signatures finds earlier chunks that are likely similar, and the share of equal signature
+values (an estimate of the Jaccard similarity) decides. Near-duplicates are dropped, so
+boilerplate repeated across pages (templated pages, copied acceptance criteria, footers) is
+embedded once.
+
+The source of every dropped duplicate is recorded in :attr:`NearDuplicateFilter.duplicate_sources`
+under the source of the chunk it duplicates, so callers can re-index duplicating sources when the
+kept one changes. With ``merge_window`` kept chunks are also held back for that many further
+chunks; the sources of duplicates found meanwhile are listed in their ``duplicate_sources`` metadata.
+
+Chunks are streamed. Every band table and the signatures of kept chunks are LRU maps of at most
+``max_entries`` entries, so memory does not grow with the size of the input.
+"""
+import logging
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+DEFAULT_SOURCE_KEYS = ("source", "id", "filename")
+
+
+class DedupConfig(BaseModel):
+    """Configuration of the near-duplicate stage"""
+    threshold: float = Field(default=0.85, ge=0.0, le=1.0,
+                             description="Estimated Jaccard similarity from which a chunk is a duplicate")
+    num_perm: int = Field(default=64, gt=0, description="Number of MinHash permutations")
+    bands: int = Field(default=8, gt=0, description="Number of LSH bands, must divide num_perm")
+    shingle_size: int = Field(default=5, gt=0, description="Words per shingle")
+    max_entries: int = Field(default=100000, gt=0, description="Maximum entries of every band table")
+    merge_window: int = Field(default=0, ge=0,
+                              description="Chunks a kept chunk is held back to collect sources of its duplicates")
+
+    @model_validator(mode='after')
+    def validate_bands(self):
+        if self.num_perm % self.bands:
+            raise ValueError("bands must divide num_perm")
+        return self
+
+
+@dataclass
+class DedupStats:
+    chunks: int = 0
+    duplicates: int = 0
+    merged_sources: int = 0
+
+    @property
+    def embeddings_saved(self) -> int:
+        return self.duplicates
+
+    def report(self) -> str:
+        return (f"Near-duplicate filter: {self.duplicates} of {self.chunks} chunks skipped "
+                f"({self.embeddings_saved} embeddings saved)")
+
+
+class MinHasher:
+    """MinHash signatures of word shingles, with permutations ``(a * h + b) mod (2^61 - 1)``."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        # a, b < 2^32 and 32-bit shingle hashes keep a * h + b below 2^64
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> List[str]:
+        words = re.findall(r"\w+", text.lower())
+        if len(words) <= self.shingle_size:
+            return [" ".join(words)]
+        return list({" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)})
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self.shingles(text)
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME).min(axis=0)
+
+
+class NearDuplicateFilter:
+    """Streaming near-duplicate filter over chunk documents, see the module docstring."""
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, bands: int = 8, shingle_size: int = 5,
+                 max_entries: int = 100000, merge_window: int = 0,
+                 source_keys: Tuple[str, ...] = DEFAULT_SOURCE_KEYS):
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.threshold = threshold
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.merge_window = merge_window
+        self.source_keys = source_keys
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.tables: List["OrderedDict[int, int]"] = [OrderedDict() for _ in range(bands)]
+        self.signatures: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        # source of every chunk in signatures
+        self.chunk_sources: Dict[int, Optional[str]] = {}
+        # source of kept chunks -> sources of the duplicates dropped in their favour
+        self.duplicate_sources: Dict[Optional[str], List[str]] = {}
+        self.stats = DedupStats()
+        self._next_id = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "NearDuplicateFilter":
+        return cls(**DedupConfig(**(config or {})).model_dump())
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        return [hash(signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(len(self.tables))]
+
+    def _find(self, band_keys: List[int], signature: np.ndarray) -> Optional[int]:
+        checked = set()
+        for table, key in zip(self.tables, band_keys):
+            candidate = table.get(key)
+            if candidate is None or candidate in checked:
+                continue
+            checked.add(candidate)
+            candidate_signature = self.signatures.get(candidate)
+            if candidate_signature is not None and np.mean(candidate_signature == signature) >= self.threshold:
+                self.signatures.move_to_end(candidate)
+                return candidate
+        return None
+
+    def _add(self, band_keys: List[int], signature: np.ndarray, source: Optional[str]) -> int:
+        chunk_id = self._next_id
+        self._next_id += 1
+        for table, key in zip(self.tables, band_keys):
+            table[key] = chunk_id
+            table.move_to_end(key)
+            if len(table) > self.max_entries:
+                table.popitem(last=False)
+        self.signatures[chunk_id] = signature
+        self.chunk_sources[chunk_id] = source
+        if len(self.signatures) > self.max_entries:
+            self.chunk_sources.pop(self.signatures.popitem(last=False)[0], None)
+        return chunk_id
+
+    def source(self, document: Any) -> Optional[str]:
+        """Source of a chunk: the first of ``source_keys`` set in its metadata."""
+        for key in self.source_keys:
+            if document.metadata.get(key):
+                return str(document.metadata[key])
+        return None
+
+    def filter(self, documents: Iterable[Any]) -> Generator[Any, None, None]:
+        """Yields the documents that are not near-duplicates of an earlier one, in input order."""
+        # kept chunk id -> (document, sources of its duplicates)
+        pending: "OrderedDict[int, Tuple[Any, List[str]]]" = OrderedDict()
+
+        def release(document: Any, sources: List[str]) -> Any:
+            if sources:
+                document.metadata["duplicate_sources"] = "; ".join(sources)
+            return document
+
+        for document in documents:
+            self.stats.chunks += 1
+            signature = self.hasher.signature(document.page_content)
+            band_keys = self._band_keys(signature)
+            duplicate_of = self._find(band_keys, signature)
+            source = self.source(document)
+            if duplicate_of is None:
+                chunk_id = self._add(band_keys, signature, source)
+                if not self.merge_window:
+                    yield document
+                    continue
+                pending[chunk_id] = (document, [])
+                if len(pending) > self.merge_window:
+                    yield release(*pending.popitem(last=False)[1])
+                continue
+            self.stats.duplicates += 1
+            kept_source = self.chunk_sources.get(duplicate_of)
+            if not source or source == kept_source:
+                continue
+            dropped = self.duplicate_sources.setdefault(kept_source, [])
+            if source not in dropped:
+                dropped.append(source)
+                self.stats.merged_sources += 1
+            if duplicate_of in pending:
+                sources = pending[duplicate_of][1]
+                if source not in sources:
+                    sources.append(source)
+        while pending:
+            yield release(*pending.popitem(last=False)[1])
+        logger.info(self.stats.report())
@@ -0,0 +1,196 @@
+"""
+Persistent content-addressed cache of document embeddings.
+
+Vectors are keyed by the embedding model id, its parameters and the sha256 of the text, so
+re-indexing unchanged content (or re-embedding overlapping chunker batches) only sends cache
+misses to the embedding model. Wrap an embedding model with :func:`with_embedding_cache`.
+
+Caching is opt-in: ``ALITA_EMBEDDING_CACHE`` is the path of a local sqlite file (unset or ``none``
+disables caching) whose size is kept under ``ALITA_EMBEDDING_CACHE_MAX_BYTES`` by evicting least
+recently used vectors.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from array import array
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "alita_tools", "embeddings.sqlite")
+DEFAULT_MAX_BYTES = int(os.environ.get("ALITA_EMBEDDING_CACHE_MAX_BYTES", 1024 ** 3))
+# eviction removes vectors until the store is this fraction of max_bytes
+EVICTION_TARGET = 0.9
+# keeps IN (...) lists below the sqlite host parameter limit
+_QUERY_BATCH = 500
+# writes after which the running size is recounted, as other processes write to the store too
+RECOUNT_WRITES = 256
+
+
+class EmbeddingCacheStore:
+    """sqlite-backed vector store shared between processes, with LRU eviction by total size."""
+
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS embeddings "
+                         "(key TEXT PRIMARY KEY, size INTEGER, accessed REAL, vector BLOB)")
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings (accessed)")
+            self._total = self._count(conn)
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        if not keys:
+            return found
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            for i in range(0, len(keys), _QUERY_BATCH):
+                batch = keys[i:i + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch)
+                for key, blob in rows:
+                    found[key] = array("d", blob).tolist()
+            conn.executemany("UPDATE embeddings SET accessed = ? WHERE key = ?", [(now, key) for key in found])
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]):
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vector in items.items():
+            blob = array("d", vector).tobytes()
+            rows.append((key, len(blob), now, blob))
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, size, accessed, vector) VALUES (?, ?, ?, ?)",
+                             rows)
+            # replaced vectors are counted twice until the next recount, which only evicts earlier
+            self._total += sum(row[1] for row in rows)
+            self._writes += 1
+            if self._writes >= RECOUNT_WRITES:
+                self._total = self._count(conn)
+                self._writes = 0
+            if self._total > self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = self._count(conn)
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICTION_TARGET)
+        removed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM embeddings ORDER BY accessed"):
+            stale.append((key,))
+            removed += size
+            if removed >= excess:
+                break
+        conn.executemany("DELETE FROM embeddings WHERE key = ?", stale)
+        self._total -= removed
+        logger.debug(f"Evicted {len(stale)} embeddings ({removed} bytes) from {self.path}")
+
+    def size(self) -> int:
+        with self._lock, self._connect() as conn:
+            return self._count(conn)
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM embeddings")
+            self._total = 0
+
+
+def model_namespace(model_id: Optional[str], params: Optional[Dict[str, Any]] = None) -> str:
+    """Identifies an embedding model configuration; params are hashed, never stored."""
+    description = json.dumps({"model": model_id, "params": params or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends cache misses to the wrapped model."""
+
+    def __init__(self, embeddings: Embeddings, model_id: Optional[str], params: Optional[Dict[str, Any]] = None,
+                 store: Optional[EmbeddingCacheStore] = None):
+        self.embeddings = embeddings
+        self.namespace = model_namespace(model_id, params)
+        self.store = store or get_embedding_store()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        return f"{self.namespace}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        cached = self.store.get_many(list(dict.fromkeys(keys)))
+        # every distinct missing text is embedded once, in first-seen order
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        self.hits += sum(1 for key in keys if key in cached)
+        self.misses += len(missing)
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            embedded = dict(zip(missing.keys(), vectors))
+            self.store.set_many(embedded)
+            cached.update(embedded)
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        # query embeddings may differ from document embeddings for the same text
+        return self.embeddings.embed_query(text)
+
+    def __getattr__(self, item):
+        # expose attributes of the wrapped model (e.g. ``model`` or ``client``)
+        if item == "embeddings":
+            raise AttributeError(item)
+        return getattr(self.embeddings, item)
+
+
+_store: Optional[EmbeddingCacheStore] = None
+_store_lock = Lock()
+
+
+def get_embedding_store() -> Optional[EmbeddingCacheStore]:
+    """Returns the process-wide store at the path in ``ALITA_EMBEDDING_CACHE``; ``None`` if it is unset or ``none``."""
+    global _store
+    setting = os.environ.get("ALITA_EMBEDDING_CACHE", "none")
+    if not setting or setting == "none":
+        return None
+    if _store is None or _store.path != setting:
+        with _store_lock:
+            if _store is None or _store.path != setting:
+                _store = EmbeddingCacheStore(setting)
+    return _store
+
+
+def with_embedding_cache(embeddings: Embeddings, model_id: Optional[str],
+                         params: Optional[Dict[str, Any]] = None) -> Embeddings:
+    """Wraps an embedding model with the persistent cache unless caching is disabled or unavailable."""
+    if embeddings is None or isinstance(embeddings, CachedEmbeddings):
+        return embeddings
+    try:
+        store = get_embedding_store()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Embedding cache is unavailable, embedding without it: {e}")
+        return embeddings
+    if store is None:
+        return embeddings
+    return CachedEmbeddings(embeddings, model_id, params, store)
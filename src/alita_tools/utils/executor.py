@@ -0,0 +1,76 @@
+"""
+Bounded thread pool used by the async execution path of toolkits.
+
+Most toolkit clients (atlassian, PyGithub, azure-devops, ...) are synchronous. Their async
+entry points run the blocking call here instead of on the event loop's default executor,
+so that the number of threads stays bounded no matter how many tool calls are in flight.
+
+:func:`map_ordered` runs the remote calls of a single tool (pages, attachments, images) on a
+small pool of its own, yielding results in input order.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional, TypeVar
+
+ASYNC_MAX_WORKERS = int(os.environ.get("ALITA_TOOLS_ASYNC_WORKERS", 64))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS, thread_name_prefix="alita-tools")
+    return _executor
+
+
+async def run_in_executor(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Runs a blocking callable in the shared bounded pool, preserving context variables."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(ctx.run, func, *args, **kwargs))
+
+
+def shutdown_executor(wait: bool = True):
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def map_ordered(func: Callable[[T], R], items: Iterable[T], max_workers: Optional[int]) -> Iterator[R]:
+    """
+    Yields ``func(item)`` for every item in order, with up to `max_workers` items in progress.
+
+    Items are submitted as results are consumed, so at most `max_workers` results are held. A
+    generator closed early cancels the items not started yet.
+    """
+    max_workers = max_workers or 1
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    pending: Deque[Future] = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for item in items:
+            # a context per task keeps remote calls attributed to the running tool
+            pending.append(executor.submit(contextvars.copy_context().run, func, item))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
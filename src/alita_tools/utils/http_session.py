@@ -0,0 +1,132 @@
+"""
+Shared pooled HTTP sessions for REST toolkits.
+
+Bare ``requests.get/post`` calls open a new TCP+TLS connection every time. Toolkits
+should use :func:`get_session` instead: sessions are shared per (verify, proxies)
+combination and keep per-host keep-alive connection pools. Shared sessions never
+store cookies, so state cannot leak between toolkits that talk to the same host.
+
+Defaults can be changed with :func:`configure` or the ``ALITA_HTTP_*`` environment variables.
+"""
+import os
+from dataclasses import dataclass, replace
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+import urllib3
+
+from .rate_limit import RateLimitedAdapter
+
+
+@dataclass(frozen=True)
+class HttpSessionConfig:
+    # number of per-host connection pools kept by each session
+    pool_connections: int = int(os.environ.get("ALITA_HTTP_POOL_CONNECTIONS", 32))
+    # connections kept alive per host
+    pool_maxsize: int = int(os.environ.get("ALITA_HTTP_POOL_MAXSIZE", 32))
+    # default (connect, read) timeout applied when the caller does not pass one
+    connect_timeout: float = float(os.environ.get("ALITA_HTTP_CONNECT_TIMEOUT", 10))
+    read_timeout: Optional[float] = (float(os.environ["ALITA_HTTP_READ_TIMEOUT"])
+                                     if os.environ.get("ALITA_HTTP_READ_TIMEOUT") else None)
+    # retries for failed connection attempts only (never for requests that reached the server)
+    max_retries: int = int(os.environ.get("ALITA_HTTP_MAX_RETRIES", 0))
+    verify: Union[bool, str] = True
+    proxies: Optional[Tuple[Tuple[str, str], ...]] = None
+
+    @property
+    def timeout(self) -> Tuple[float, Optional[float]]:
+        return self.connect_timeout, self.read_timeout
+
+
+class _RejectAllCookies(DefaultCookiePolicy):
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+class PooledSession(requests.Session):
+    """``requests.Session`` with a default timeout, rate limiting and no cookie persistence."""
+
+    def __init__(self, config: HttpSessionConfig):
+        super().__init__()
+        self.config = config
+        adapter = RateLimitedAdapter(pool_connections=config.pool_connections,
+                                     pool_maxsize=config.pool_maxsize,
+                                     max_retries=config.max_retries)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.verify = config.verify
+        if config.proxies:
+            self.proxies.update(dict(config.proxies))
+        self.cookies.set_policy(_RejectAllCookies())
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.config.timeout)
+        return super().request(method, url, **kwargs)
+
+
+_config = HttpSessionConfig()
+_sessions: Dict[HttpSessionConfig, PooledSession] = {}
+_pool_managers: Dict[HttpSessionConfig, urllib3.PoolManager] = {}
+_lock = Lock()
+
+
+def configure(**kwargs) -> HttpSessionConfig:
+    """Changes the defaults used for sessions created afterwards (e.g. ``pool_maxsize=64``)."""
+    global _config
+    with _lock:
+        _config = replace(_config, **kwargs)
+    return _config
+
+
+def _resolve_config(verify: Optional[Union[bool, str]], proxies: Optional[dict]) -> HttpSessionConfig:
+    overrides = {}
+    if verify is not None:
+        overrides["verify"] = verify
+    if proxies:
+        overrides["proxies"] = tuple(sorted(proxies.items()))
+    return replace(_config, **overrides) if overrides else _config
+
+
+def get_session(verify: Optional[Union[bool, str]] = None, proxies: Optional[dict] = None) -> PooledSession:
+    """Returns the shared pooled session for the given SSL verification and proxy settings."""
+    config = _resolve_config(verify, proxies)
+    session = _sessions.get(config)
+    if session is None:
+        with _lock:
+            session = _sessions.get(config)
+            if session is None:
+                session = PooledSession(config)
+                _sessions[config] = session
+    return session
+
+
+def get_pool_manager(verify: Optional[bool] = None, proxies: Optional[dict] = None) -> urllib3.PoolManager:
+    """Returns a shared ``urllib3`` pool manager for clients that work with urllib3 directly."""
+    config = _resolve_config(verify, proxies)
+    manager = _pool_managers.get(config)
+    if manager is None:
+        with _lock:
+            manager = _pool_managers.get(config)
+            if manager is None:
+                kwargs = dict(num_pools=config.pool_connections, maxsize=config.pool_maxsize,
+                              timeout=urllib3.Timeout(connect=config.connect_timeout, read=config.read_timeout))
+                if config.verify is False:
+                    kwargs["cert_reqs"] = "CERT_NONE"
+                proxy_url = dict(config.proxies or ()).get("https") or dict(config.proxies or ()).get("http")
+                manager = urllib3.ProxyManager(proxy_url, **kwargs) if proxy_url else urllib3.PoolManager(**kwargs)
+                _pool_managers[config] = manager
+    return manager
+
+
+def close_sessions():
+    """Closes all shared sessions and pool managers (e.g. on worker shutdown)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        for manager in _pool_managers.values():
+            manager.clear()
+        _sessions.clear()
+        _pool_managers.clear()
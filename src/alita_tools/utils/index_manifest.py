@@ -0,0 +1,254 @@
+"""
+Manifests of what an index already holds, for incremental re-indexing.
+
+A manifest maps every indexed source (a repository path, a page id, ...) to the version it was
+indexed at (a blob sha, a page version) and to the ids of the documents written for it. Diffing
+the manifest against the current listing yields the sources to fetch again and those whose
+documents must be removed, so unchanged sources are neither fetched, parsed nor embedded.
+
+Manifests are stored with the collection they describe, so every worker indexing the collection
+sees the same manifest: in an ``index_manifests`` table of the PGVector database
+(:class:`SqlManifestStore`) or in JSON files under the Chroma persist directory
+(:class:`FileManifestStore`). A collection holding no manifest at all was written by full indexes
+only, whose document ids are unknown, so it is cleared before its first incremental run.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ids per deletion request when clearing a collection
+DELETE_BATCH = 1000
+
+
+class ManifestStore:
+    """Interface of manifest storages; manifests are JSON strings keyed by index key."""
+
+    def load(self, key: str) -> Optional[str]:
+        raise NotImplementedError("Subclasses should implement this method")
+
+    def save(self, key: str, data: str):
+        raise NotImplementedError("Subclasses should implement this method")
+
+    def is_empty(self) -> bool:
+        """Whether no manifest of any index is stored for the collection."""
+        raise NotImplementedError("Subclasses should implement this method")
+
+
+class FileManifestStore(ManifestStore):
+    """One JSON file per index key in a directory next to the collection data."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, data: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        # readers see either the previous or the new manifest, never a partial one
+        os.replace(tmp_path, path)
+
+    def is_empty(self) -> bool:
+        try:
+            return not any(name.endswith(".json") for name in os.listdir(self.directory))
+        except FileNotFoundError:
+            return True
+
+
+_engines: Dict[str, Any] = {}
+_engines_lock = Lock()
+
+
+def _get_engine(connection_string: str) -> Any:
+    """One engine (and connection pool) per database for all index runs of the process."""
+    from sqlalchemy import create_engine
+
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is None:
+            engine = _engines[connection_string] = create_engine(connection_string)
+    return engine
+
+
+class SqlManifestStore(ManifestStore):
+    """Manifests in an ``index_manifests`` table of the database (and schema) holding the collection."""
+
+    def __init__(self, connection_string: str, schema: Optional[str] = None):
+        self.engine = _get_engine(connection_string)
+        self.table = f'"{schema}".index_manifests' if schema else "index_manifests"
+        self._created = False
+
+    def _ensure_table(self, conn):
+        from sqlalchemy import text
+
+        if not self._created:
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, data TEXT)"))
+            self._created = True
+
+    def load(self, key: str) -> Optional[str]:
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            self._ensure_table(conn)
+            row = conn.execute(text(f"SELECT data FROM {self.table} WHERE key = :key"), {"key": key}).fetchone()
+        return row[0] if row else None
+
+    def save(self, key: str, data: str):
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            self._ensure_table(conn)
+            conn.execute(text(f"DELETE FROM {self.table} WHERE key = :key"), {"key": key})
+            conn.execute(text(f"INSERT INTO {self.table} (key, data) VALUES (:key, :data)"),
+                         {"key": key, "data": data})
+
+    def is_empty(self) -> bool:
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            self._ensure_table(conn)
+            return conn.execute(text(f"SELECT 1 FROM {self.table} LIMIT 1")).fetchone() is None
+
+
+class IndexManifest:
+    """Indexed version and document ids of every source of one index, persisted in a :class:`ManifestStore`."""
+
+    def __init__(self, key: str, store: ManifestStore):
+        self.key = key
+        self.store = store
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.state: Dict[str, Any] = {}
+        # False until a manifest was loaded: the collection may hold documents of unknown ids
+        self.exists = False
+        self.load()
+
+    def load(self):
+        try:
+            raw = self.store.load(self.key)
+            data = json.loads(raw) if raw is not None else None
+        except Exception as e:
+            # an unreadable manifest only costs a full re-index
+            logger.warning(f"Ignoring unreadable index manifest '{self.key}': {e}")
+            return
+        if isinstance(data, dict) and data.get("key") == self.key:
+            self.entries = data.get("entries", {})
+            self.state = data.get("state", {})
+            self.exists = True
+
+    def save(self):
+        self.store.save(self.key, json.dumps({"key": self.key, "entries": self.entries, "state": self.state}))
+        self.exists = True
+
+    def diff(self, versions: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """
+        Compares the current ``source -> version`` listing with the manifest.
+
+        Returns:
+            Tuple[List[str], List[str]]: sources that are new or changed (in listing order) and
+            sources that are no longer listed.
+        """
+        changed = [source for source, version in versions.items()
+                   if self.entries.get(source, {}).get("version") != version]
+        removed = [source for source in self.entries if source not in versions]
+        return changed, removed
+
+    def document_ids(self, sources: Iterable[str]) -> List[str]:
+        """Ids of the documents indexed for ``sources``."""
+        ids = []
+        for source in sources:
+            ids.extend(self.entries.get(source, {}).get("ids", []))
+        return ids
+
+    def update(self, source: str, version: str, ids: List[str]):
+        self.entries[source] = {"version": version, "ids": ids}
+
+    def remove(self, source: str):
+        self.entries.pop(source, None)
+
+    def clear(self):
+        self.entries = {}
+        self.state = {}
+
+
+def document_id(key: str, source: str, version: str, index: int) -> str:
+    """Deterministic document id, so re-writing a source version replaces its documents."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{key}\n{source}\n{version}\n{index}"))
+
+
+def deletable_store(vectorstore: Any) -> Optional[Any]:
+    """
+    The langchain ``VectorStore`` behind an alita ``VectorStoreWrapper`` (its ``vectoradapter``) if
+    it implements ``delete(ids=...)``, otherwise None: incremental indexes must then be rebuilt in full.
+    """
+    from langchain_core.vectorstores import VectorStore
+
+    store = getattr(getattr(vectorstore, "vectoradapter", None), "vectorstore", None) \
+        or getattr(vectorstore, "vectorstore", None)
+    if not isinstance(store, VectorStore) or type(store).delete is VectorStore.delete:
+        return None
+    return store
+
+
+def delete_documents(vectorstore: Any, ids: List[str]) -> bool:
+    """
+    Deletes documents by id from the store returned by :func:`deletable_store`.
+
+    Returns:
+        bool: False if the store does not support deletion by id or the deletion failed.
+    """
+    if not ids:
+        return True
+    store = deletable_store(vectorstore)
+    if store is None:
+        logger.warning(f"Vector store does not support deletion by id, {len(ids)} stale documents are kept")
+        return False
+    try:
+        if store.delete(ids=ids) is False:
+            raise RuntimeError("the store reported a failed deletion")
+    except Exception as e:
+        logger.warning(f"Failed to delete {len(ids)} stale documents: {e}")
+        return False
+    return True
+
+
+def clear_collection(vectorstore: Any) -> bool:
+    """
+    Deletes every document of the collection, through the public methods of the langchain Chroma
+    (``get``) or PGVector (``delete_collection``/``create_collection``) store behind the wrapper.
+
+    Returns:
+        bool: False if the store supports neither or the deletion failed.
+    """
+    store = deletable_store(vectorstore)
+    try:
+        if store is not None and callable(getattr(store, "get", None)):
+            ids = store.get(include=[])["ids"]
+            for start in range(0, len(ids), DELETE_BATCH):
+                store.delete(ids=ids[start:start + DELETE_BATCH])
+            return True
+        if store is not None and hasattr(store, "delete_collection") and hasattr(store, "create_collection"):
+            store.delete_collection()
+            store.create_collection()
+            return True
+    except Exception as e:
+        logger.warning(f"Failed to clear the collection: {e}")
+        return False
+    logger.warning("Vector store does not support clearing the collection")
+    return False
@@ -0,0 +1,247 @@
+"""
+Per-tool latency, payload size and call-count instrumentation.
+
+Tool executions (``BaseToolApiWrapper.run`` / ``BaseAction._run``) are recorded per toolkit and
+tool name once at least one sink is registered with :func:`add_sink`; without sinks the
+instrumentation is a shared no-op scope. Remote HTTP calls made while a tool runs (through
+the rate-limited adapter) are attributed to that tool.
+
+Sinks:
+
+- :class:`InMemoryStatsSink` - plain stats dict, see :meth:`InMemoryStatsSink.snapshot`;
+- :class:`PrometheusSink` - Prometheus text exposition format, see :meth:`PrometheusSink.export`;
+- :class:`OpenTelemetrySink` - records into instruments created from an OpenTelemetry ``Meter``;
+- :class:`CallbackSink` - calls any function with each :class:`ToolCallStats`.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import TOOLKIT_SPLITTER
+
+# upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+
+@dataclass
+class ToolCallStats:
+    toolkit: str
+    tool: str
+    latency: float = 0.0
+    remote_calls: int = 0
+    bytes_received: int = 0
+    output_size: int = 0
+    error: bool = False
+
+
+class InstrumentationSink:
+
+    def record(self, stats: ToolCallStats):
+        raise NotImplementedError("Subclasses should implement this method")
+
+
+class CallbackSink(InstrumentationSink):
+
+    def __init__(self, callback: Callable[[ToolCallStats], Any]):
+        self.callback = callback
+
+    def record(self, stats: ToolCallStats):
+        self.callback(stats)
+
+
+class InMemoryStatsSink(InstrumentationSink):
+    """Aggregates stats per (toolkit, tool) in process memory."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._stats: Dict[Tuple[str, str], dict] = {}
+        self._lock = Lock()
+
+    def record(self, stats: ToolCallStats):
+        key = (stats.toolkit, stats.tool)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    "count": 0, "errors": 0, "latency_sum": 0.0, "latency_max": 0.0,
+                    "latency_buckets": [0] * len(self.buckets),
+                    "remote_calls": 0, "bytes_received": 0, "output_size": 0,
+                }
+            entry["count"] += 1
+            entry["errors"] += int(stats.error)
+            entry["latency_sum"] += stats.latency
+            entry["latency_max"] = max(entry["latency_max"], stats.latency)
+            for i, bound in enumerate(self.buckets):
+                if stats.latency <= bound:
+                    entry["latency_buckets"][i] += 1
+                    break
+            entry["remote_calls"] += stats.remote_calls
+            entry["bytes_received"] += stats.bytes_received
+            entry["output_size"] += stats.output_size
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """Returns ``{toolkit: {tool: stats}}`` with non-cumulative latency bucket counts."""
+        with self._lock:
+            result: Dict[str, Dict[str, dict]] = {}
+            for (toolkit, tool), entry in self._stats.items():
+                result.setdefault(toolkit, {})[tool] = {
+                    **entry,
+                    "latency_buckets": dict(zip(self.buckets, entry["latency_buckets"])),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class PrometheusSink(InMemoryStatsSink):
+
+    def __init__(self, prefix: str = "alita_tool", buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(buckets)
+        self.prefix = prefix
+
+    def export(self) -> str:
+        """Renders the collected stats in the Prometheus text exposition format."""
+        p = self.prefix
+        lines = [
+            f"# TYPE {p}_latency_seconds histogram",
+        ]
+        counters = {
+            "calls_total": "count", "errors_total": "errors", "remote_calls_total": "remote_calls",
+            "bytes_received_total": "bytes_received", "output_bytes_total": "output_size",
+        }
+        with self._lock:
+            items = sorted(self._stats.items())
+            for (toolkit, tool), entry in items:
+                labels = f'toolkit="{_escape(toolkit)}",tool="{_escape(tool)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, entry["latency_buckets"]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{p}_latency_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{p}_latency_seconds_sum{{{labels}}} {entry['latency_sum']}")
+                lines.append(f"{p}_latency_seconds_count{{{labels}}} {entry['count']}")
+            for name, field in counters.items():
+                lines.append(f"# TYPE {p}_{name} counter")
+                for (toolkit, tool), entry in items:
+                    labels = f'toolkit="{_escape(toolkit)}",tool="{_escape(tool)}"'
+                    lines.append(f"{p}_{name}{{{labels}}} {entry[field]}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetrySink(InstrumentationSink):
+    """Records into instruments of an OpenTelemetry ``Meter`` (``opentelemetry.metrics.get_meter(...)``)."""
+
+    def __init__(self, meter: Any, prefix: str = "alita.tool"):
+        self.latency = meter.create_histogram(f"{prefix}.latency", unit="s", description="Tool execution latency")
+        self.calls = meter.create_counter(f"{prefix}.calls", description="Tool executions")
+        self.errors = meter.create_counter(f"{prefix}.errors", description="Failed tool executions")
+        self.remote_calls = meter.create_counter(f"{prefix}.remote_calls", description="Remote HTTP calls")
+        self.bytes_received = meter.create_counter(f"{prefix}.bytes_received", unit="By",
+                                                   description="Bytes received from remote services")
+        self.output_size = meter.create_histogram(f"{prefix}.output_size", unit="By", description="Tool output size")
+
+    def record(self, stats: ToolCallStats):
+        attributes = {"toolkit": stats.toolkit, "tool": stats.tool}
+        self.latency.record(stats.latency, attributes)
+        self.calls.add(1, attributes)
+        if stats.error:
+            self.errors.add(1, attributes)
+        self.remote_calls.add(stats.remote_calls, attributes)
+        self.bytes_received.add(stats.bytes_received, attributes)
+        self.output_size.record(stats.output_size, attributes)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_sinks: List[InstrumentationSink] = []
+_current_call: ContextVar[Optional[ToolCallStats]] = ContextVar("alita_tool_call", default=None)
+
+
+def add_sink(sink: InstrumentationSink) -> InstrumentationSink:
+    _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink: InstrumentationSink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def clear_sinks():
+    _sinks.clear()
+
+
+def is_enabled() -> bool:
+    return bool(_sinks)
+
+
+def record_remote_call(bytes_received: int = 0):
+    """Attributes a remote call to the tool being executed in the current context, if any."""
+    stats = _current_call.get()
+    if stats is not None:
+        stats.remote_calls += 1
+        stats.bytes_received += bytes_received
+
+
+class _ToolCallScope:
+    __slots__ = ("stats", "_token", "_start")
+
+    def __init__(self, toolkit: str, tool: str):
+        self.stats = ToolCallStats(toolkit=toolkit, tool=tool)
+
+    def __enter__(self) -> "_ToolCallScope":
+        self._token = _current_call.set(self.stats)
+        self._start = time.perf_counter()
+        return self
+
+    def set_output(self, output: Any):
+        if isinstance(output, Exception):
+            # most tools report failures by returning a ToolException
+            self.stats.error = True
+        if isinstance(output, (str, bytes)):
+            self.stats.output_size = len(output)
+        elif output is not None:
+            self.stats.output_size = len(str(output))
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stats.latency = time.perf_counter() - self._start
+        self.stats.error = self.stats.error or exc_type is not None
+        _current_call.reset(self._token)
+        for sink in list(_sinks):
+            sink.record(self.stats)
+        return False
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopScope":
+        return self
+
+    def set_output(self, output: Any):
+        pass
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+def tool_call(toolkit: str, tool: str):
+    """
+    Returns a context manager recording one tool execution.
+
+    Nested scopes (e.g. ``BaseAction._run`` calling ``BaseToolApiWrapper.run``) are recorded once, by the outer one.
+    """
+    if not _sinks or _current_call.get() is not None:
+        return _NOOP_SCOPE
+    if TOOLKIT_SPLITTER in tool:
+        tool = tool.rsplit(TOOLKIT_SPLITTER, maxsplit=1)[1]
+    return _ToolCallScope(toolkit, tool)
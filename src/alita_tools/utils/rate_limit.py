@@ -0,0 +1,250 @@
+"""
+Rate-limit-aware request scheduling shared by all REST toolkits.
+
+Every host gets a :class:`HostLimiter` holding a token bucket and an adaptive
+concurrency limit. Requests to a host are not throttled until it reports a quota
+(``X-RateLimit-*`` headers) or answers 429; from then on limits follow what it reports:
+
+- ``Retry-After`` (on 429/503) pauses the host until the given time;
+- ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` set the bucket rate just below
+  the remaining quota for the current window;
+- throttling responses halve the concurrency limit, successful responses grow it back.
+
+Sessions opt in through :func:`install_rate_limiter`, which mounts a
+:class:`RateLimitedAdapter` that waits for a slot before sending and retries throttled requests
+(503 only for idempotent methods, as the server may have applied the request).
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import instrumentation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = float(os.environ.get("ALITA_RATE_LIMIT_RPS", 20))
+DEFAULT_BURST = float(os.environ.get("ALITA_RATE_LIMIT_BURST", 20))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("ALITA_RATE_LIMIT_MAX_CONCURRENCY", 16))
+DEFAULT_MAX_RETRIES = int(os.environ.get("ALITA_RATE_LIMIT_MAX_RETRIES", 5))
+# fraction of the reported remaining quota the bucket is allowed to use
+QUOTA_HEADROOM = 0.9
+# longest pause honoured from a single Retry-After / reset header
+MAX_WAIT_SECONDS = 300.0
+
+THROTTLED_STATUSES = (429, 503)
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"))
+
+
+def _parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """Returns the number of seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(value: Optional[str], now: float) -> Optional[float]:
+    """Returns seconds until the quota window resets; accepts epoch seconds or a delta."""
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    # values that look like epoch timestamps are absolute
+    return max(0.0, reset - now) if reset > 1e9 else reset
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long the caller has to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate if self.rate > 0 else MAX_WAIT_SECONDS
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+
+class HostLimiter:
+    """Token bucket, pause window and AIMD concurrency limit of a single host."""
+
+    def __init__(self, host: str, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.host = host
+        self.default_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self.in_flight = 0
+        # the bucket and the concurrency limit apply once the host reported a quota or a 429
+        self.limited = False
+        self.paused_until = 0.0
+        self._successes = 0
+        self._throttled = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self.limited and self.in_flight >= self.concurrency:
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            wait = self.paused_until - time.monotonic()
+            if self.limited:
+                wait = max(wait, self.bucket.reserve())
+            if wait > 0:
+                time.sleep(min(wait, MAX_WAIT_SECONDS))
+            yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify()
+
+    def observe(self, status_code: int, headers: Mapping[str, str]):
+        """Adapts the limits of the host to a received response."""
+        now_wall, now = time.time(), time.monotonic()
+        retry_after = _parse_retry_after(headers.get("Retry-After"), now_wall)
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = _parse_reset(headers.get("X-RateLimit-Reset"), now_wall)
+        with self._cond:
+            if status_code == 429 or remaining is not None:
+                self.limited = True
+            if status_code in THROTTLED_STATUSES:
+                self.concurrency = max(1, self.concurrency // 2)
+                self._successes = 0
+                self._throttled += 1
+                wait = retry_after if retry_after is not None else reset
+                if wait is None:
+                    # no hint from the server: back off exponentially over consecutive throttles
+                    wait = 2.0 ** self._throttled
+                self.paused_until = max(self.paused_until, now + min(wait, MAX_WAIT_SECONDS))
+            else:
+                self._throttled = 0
+                self._successes += 1
+                if self._successes >= self.concurrency and self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    self._successes = 0
+                    self._cond.notify()
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+        window = reset if reset else 1.0
+        if remaining <= 0:
+            with self._cond:
+                self.paused_until = max(self.paused_until, now + min(window, MAX_WAIT_SECONDS))
+        else:
+            self.bucket.set_rate(min(self.default_rate, QUOTA_HEADROOM * remaining / max(window, 1e-3)))
+
+
+class RateLimitScheduler:
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, url_or_host: str) -> HostLimiter:
+        host = urlsplit(url_or_host).netloc or url_or_host
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._hosts.setdefault(
+                    host, HostLimiter(host, self.rate, self.burst, self.max_concurrency))
+        return limiter
+
+
+_scheduler = RateLimitScheduler()
+
+
+def get_scheduler() -> RateLimitScheduler:
+    return _scheduler
+
+
+def _received_bytes(response: requests.Response, stream: bool) -> int:
+    if not stream:
+        # requests reads non-streamed bodies right after the adapter returns anyway
+        return len(response.content or b"")
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except ValueError:
+        return 0
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTP adapter that schedules requests through the shared :class:`RateLimitScheduler`."""
+
+    def __init__(self, *args, scheduler: Optional[RateLimitScheduler] = None,
+                 throttle_retries: int = DEFAULT_MAX_RETRIES, **kwargs):
+        self.scheduler = scheduler or get_scheduler()
+        self.throttle_retries = throttle_retries
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        limiter = self.scheduler.limiter(request.url)
+        # streamed bodies (files, generators) cannot be replayed
+        replayable = request.body is None or isinstance(request.body, (bytes, str))
+        idempotent = (request.method or "GET").upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            with limiter.slot():
+                response = super().send(request, *args, **kwargs)
+            limiter.observe(response.status_code, response.headers)
+            if instrumentation.is_enabled():
+                instrumentation.record_remote_call(_received_bytes(response, kwargs.get("stream", False)))
+            if response.status_code not in THROTTLED_STATUSES or not replayable or attempt >= self.throttle_retries:
+                return response
+            if response.status_code == 503 and not idempotent:
+                # unlike a 429, a 503 does not guarantee that the request was not applied
+                return response
+            attempt += 1
+            logger.warning(f"{limiter.host} responded {response.status_code}, "
+                           f"retrying ({attempt}/{self.throttle_retries})")
+            response.close()
+
+
+def install_rate_limiter(session: requests.Session, **adapter_kwargs) -> requests.Session:
+    """Mounts a :class:`RateLimitedAdapter` for http(s) on an existing session (e.g. an atlassian client's)."""
+    adapter = RateLimitedAdapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
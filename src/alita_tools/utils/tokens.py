@@ -0,0 +1,77 @@
+"""
+Shared token counting with the ``cl100k_base`` encoding.
+
+The encoder is loaded once per process and token counts are memoized by the sha1 of the text
+(the texts themselves are not kept, they can be whole diffs), so chunkers
+and output truncation that look at the same split several times encode it only once.
+Use :func:`count_tokens` for many texts at once: cache misses are encoded together with
+``encode_batch``.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Tuple
+
+import tiktoken
+
+ENCODING_NAME = "cl100k_base"
+MEMO_MAXSIZE = int(os.environ.get("ALITA_TOKEN_MEMO_MAXSIZE", 16384))
+
+_encoder = None
+_memo: "OrderedDict[bytes, int]" = OrderedDict()
+_lock = Lock()
+
+
+def get_encoder() -> tiktoken.Encoding:
+    global _encoder
+    if _encoder is None:
+        with _lock:
+            if _encoder is None:
+                _encoder = tiktoken.get_encoding(ENCODING_NAME)
+    return _encoder
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest()
+
+
+def count_tokens(texts: List[str]) -> List[int]:
+    """Returns the number of tokens of every text, in order."""
+    counts: List[int] = [0] * len(texts)
+    # digest -> (text, positions)
+    missing: "OrderedDict[bytes, Tuple[str, List[int]]]" = OrderedDict()
+    digests = [_digest(text) for text in texts]
+    with _lock:
+        for i, (text, digest) in enumerate(zip(texts, digests)):
+            count = _memo.get(digest)
+            if count is None:
+                missing.setdefault(digest, (text, []))[1].append(i)
+            else:
+                _memo.move_to_end(digest)
+                counts[i] = count
+    if not missing:
+        return counts
+    encoder = get_encoder()
+    if len(missing) == 1:
+        # encode_batch spins up a thread pool, not worth it for a single text
+        encoded = [encoder.encode(next(iter(missing.values()))[0], disallowed_special=())]
+    else:
+        encoded = encoder.encode_batch([text for text, _ in missing.values()], disallowed_special=())
+    with _lock:
+        for (digest, (_, positions)), tokens in zip(missing.items(), encoded):
+            for i in positions:
+                counts[i] = len(tokens)
+            _memo[digest] = len(tokens)
+        while len(_memo) > MEMO_MAXSIZE:
+            _memo.popitem(last=False)
+    return counts
+
+
+def token_length(text: str) -> int:
+    return count_tokens([text])[0]
+
+
+def clear_token_cache():
+    with _lock:
+        _memo.clear()
@@ -0,0 +1,195 @@
+"""
+Read-through cache for tool results.
+
+Tools opt in through their ``get_available_tools`` definition:
+
+- ``"cache": "read"`` - the result is cached, keyed by toolkit configuration, the mutable state the
+  toolkit reports with ``_get_cache_state`` (e.g. the active branch) and call arguments;
+- ``"cache": "write"`` - a successful or failed call drops every cached read of the same toolkit instance.
+
+Errors are never cached, neither raised exceptions nor exceptions returned as results (``return ToolException(...)``);
+plain results are cached whatever their text.
+
+Caching is opt-in: the backend is selected with ``ALITA_TOOLS_CACHE`` (``none`` - default, ``memory``
+or ``sqlite:<path>``) and ``ALITA_TOOLS_CACHE_TTL`` (seconds), or programmatically with
+:func:`set_cache_backend`.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_READ = "read"
+CACHE_WRITE = "write"
+
+DEFAULT_TTL = float(os.environ.get("ALITA_TOOLS_CACHE_TTL", 300))
+DEFAULT_MAXSIZE = int(os.environ.get("ALITA_TOOLS_CACHE_MAXSIZE", 1024))
+
+_MISS = object()
+
+
+class ToolCacheBackend:
+    """Interface of cache backends; keys are ``<namespace>:<tool>:<arguments hash>``."""
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        raise NotImplementedError("Subclasses should implement this method")
+
+    def set(self, key: str, value: Any):
+        raise NotImplementedError("Subclasses should implement this method")
+
+    def invalidate(self, prefix: str):
+        raise NotImplementedError("Subclasses should implement this method")
+
+    def clear(self):
+        raise NotImplementedError("Subclasses should implement this method")
+
+
+class InMemoryLRUCache(ToolCacheBackend):
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, prefix: str):
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SqliteCache(ToolCacheBackend):
+    """Persistent backend shared between processes; values must be picklable."""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE):
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = Lock()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS tool_cache "
+                         "(key TEXT PRIMARY KEY, expires REAL, accessed REAL, value BLOB)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT expires, value FROM tool_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+            if row[0] < now:
+                conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+                return False, None
+            conn.execute("UPDATE tool_cache SET accessed = ? WHERE key = ?", (now, key))
+        return True, pickle.loads(row[1])
+
+    def set(self, key: str, value: Any):
+        try:
+            blob = pickle.dumps(value)
+        except Exception as e:
+            logger.debug(f"Tool result for '{key}' is not cacheable: {e}")
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO tool_cache (key, expires, accessed, value) VALUES (?, ?, ?, ?)",
+                         (key, now + self.ttl, now, blob))
+            conn.execute("DELETE FROM tool_cache WHERE key IN (SELECT key FROM tool_cache "
+                         "ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+
+    def invalidate(self, prefix: str):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM tool_cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM tool_cache")
+
+
+def _backend_from_env() -> Optional[ToolCacheBackend]:
+    setting = os.environ.get("ALITA_TOOLS_CACHE", "none")
+    if setting == "memory":
+        return InMemoryLRUCache()
+    if setting.startswith("sqlite:"):
+        return SqliteCache(setting[len("sqlite:"):])
+    return None
+
+
+_backend: Any = _MISS
+
+
+def get_cache_backend() -> Optional[ToolCacheBackend]:
+    global _backend
+    if _backend is _MISS:
+        _backend = _backend_from_env()
+    return _backend
+
+
+def set_cache_backend(backend: Optional[ToolCacheBackend]):
+    """Replaces the process-wide backend; ``None`` disables caching."""
+    global _backend
+    _backend = backend
+
+
+def cache_key(namespace: str, tool_name: str, args: tuple, kwargs: dict, state: Optional[dict] = None) -> str:
+    arguments = json.dumps([args, kwargs, state or {}], sort_keys=True, default=str)
+    return f"{namespace}:{tool_name}:{hashlib.sha256(arguments.encode('utf-8')).hexdigest()}"
+
+
+def is_error_result(value: Any) -> bool:
+    """Whether a tool result is an error, which must not be cached; tools mark errors by returning an exception."""
+    return isinstance(value, Exception)
+
+
+def call_with_cache(namespace: str, tool: dict, args: tuple, kwargs: dict, state: Optional[dict] = None) -> Any:
+    """Calls ``tool["ref"]`` honouring its ``cache`` metadata; `state` is the toolkit state reads depend on."""
+    policy = tool.get("cache")
+    backend = get_cache_backend() if policy else None
+    if backend is None:
+        return tool["ref"](*args, **kwargs)
+    if policy == CACHE_WRITE:
+        try:
+            return tool["ref"](*args, **kwargs)
+        finally:
+            # a failed write may still have been applied remotely
+            backend.invalidate(f"{namespace}:")
+    key = cache_key(namespace, tool["name"], args, kwargs, state)
+    hit, value = backend.get(key)
+    if hit:
+        return value
+    value = tool["ref"](*args, **kwargs)
+    if not is_error_result(value):
+        backend.set(key, value)
+    return value
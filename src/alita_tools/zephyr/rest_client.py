@@ -5,8 +5,6 @@ import time
 from json import dumps
 from urllib.parse import urlencode
 
-import requests
-
 try:
     from oauthlib.oauth1.rfc5849 import SIGNATURE_RSA_SHA512 as SIGNATURE_RSA
 except ImportError:
@@ -15,6 +13,8 @@ from requests import HTTPError
 
 from atlassian.request_utils import get_default_logger
 
+from ..utils.http_session import get_session
+
 log = get_default_logger(__name__)
 
 
@@ -147,7 +147,7 @@ class ZephyrRestAPI(object):
         if files is None:
             data = None if not data else dumps(data)
         headers = headers or self.headers
-        response = requests.Session().request(
+        response = get_session().request(
             method=method,
             url=url,
             headers=headers,
@@ -8,6 +8,7 @@ from pydantic import create_model, PrivateAttr
 from pydantic.fields import Field
 
 from ..elitea_base import BaseToolApiWrapper
+from ..utils.rate_limit import install_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -279,6 +280,7 @@ class ZephyrScaleApiWrapper(BaseToolApiWrapper):
         # else:
         # Cloud version is enabled for now
         cls._api = ZephyrScale(token=values['token']).api
+        install_rate_limiter(cls._api.session._session)
         return values
 
     def get_tests(self, project_key: str = None, folder_id: str = None, maxResults: Optional[int] = 10, startAt: Optional[int] = 0):
@@ -1328,30 +1330,35 @@ class ZephyrScaleApiWrapper(BaseToolApiWrapper):
             },
             {
                 "name": "get_test",
+                "cache": "read",
                 "description": self.get_test.__doc__,
                 "args_schema": ZephyrGetTestCase,
                 "ref": self.get_test,
             },
             {
                 "name": "get_test_steps",
+                "cache": "read",
                 "description": self.get_test_steps.__doc__,
                 "args_schema": ZephyrGetTestCase,
                 "ref": self.get_test_steps,
             },
             {
                 "name": "create_test_case",
+                "cache": "write",
                 "description": self.create_test_case.__doc__,
                 "args_schema": ZephyrCreateTestCase,
                 "ref": self.create_test_case,
             },
             {
                 "name": "add_test_steps",
+                "cache": "write",
                 "description": self.add_test_steps.__doc__,
                 "args_schema": ZephyrTestStepsInputModel,
                 "ref": self.add_test_steps,
             },
             {
                 "name": "update_test_steps",
+                "cache": "write",
                 "description": self.update_test_steps.__doc__,
                 "args_schema": ZephyrUpdateTestSteps,
                 "ref": self.update_test_steps,
@@ -1364,24 +1371,28 @@ class ZephyrScaleApiWrapper(BaseToolApiWrapper):
             },
             {
                 "name": "update_test_case",
+                "cache": "write",
                 "description": self.update_test_case.__doc__,
                 "args_schema": ZephyrUpdateTestCase,
                 "ref": self.update_test_case,
             },
             {
                 "name": "get_links",
+                "cache": "read",
                 "description": self.get_links.__doc__,
                 "args_schema": ZephyrGetLinks,
                 "ref": self.get_links,
             },
             {
                 "name": "create_issue_links",
+                "cache": "write",
                 "description": self.create_issue_links.__doc__,
                 "args_schema": ZephyrCreateIssueLinks,
                 "ref": self.create_issue_links,
             },
             {
                 "name": "create_web_links",
+                "cache": "write",
                 "description": self.create_web_links.__doc__,
                 "args_schema": ZephyrCreateWebLinks,
                 "ref": self.create_web_links,
@@ -1400,12 +1411,14 @@ class ZephyrScaleApiWrapper(BaseToolApiWrapper):
             },
             {
                 "name": "get_test_script",
+                "cache": "read",
                 "description": self.get_test_script.__doc__,
                 "args_schema": ZephyrGetTestScript,
                 "ref": self.get_test_script,
             },
             {
                 "name": "create_test_script",
+                "cache": "write",
                 "description": self.create_test_script.__doc__,
                 "args_schema": ZephyrCreateTestScript,
                 "ref": self.create_test_script,
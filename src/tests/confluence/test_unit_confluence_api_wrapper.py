@@ -1,13 +1,18 @@
 import pytest
 from unittest.mock import MagicMock, patch
 import json
+import re
 import base64
 from io import BytesIO
+from types import SimpleNamespace
 from PIL import Image
 
 from alita_tools.confluence.api_wrapper import ConfluenceAPIWrapper
+from alita_tools.utils.index_manifest import FileManifestStore
 from langchain_core.documents import Document
 from langchain_core.tools import ToolException
+from pydantic import SecretStr
+from langchain_core.vectorstores import VectorStore
 from langchain_community.document_loaders.confluence import ContentFormat
 
 
@@ -218,6 +223,212 @@ class TestConfluenceAPIWrapper:
         mock_confluence_client.get_page_by_id.assert_called_once()
         api_wrapper.process_page.assert_called_once()
     
+    @staticmethod
+    def _page(page_id, restricted_users=()):
+        return {
+            'id': page_id,
+            'title': f'Page {page_id}',
+            'status': 'current',
+            'body': {'view': {'value': f'<p>Content {page_id}</p>'}},
+            'version': {'number': 1},
+            'restrictions': {'read': {'restrictions': {'user': {'results': list(restricted_users)},
+                                                       'group': {'results': []}}}},
+            '_links': {'webui': f'/pages/{page_id}'}
+        }
+
+    @pytest.mark.positive
+    def test_get_pages_by_id_concurrent_in_order(self, api_wrapper, mock_confluence_client):
+        """Test that pages are fetched concurrently with one request each and yielded in input order."""
+        import time
+        page_ids = [str(i) for i in range(8)]
+
+        def get_page_by_id(page_id, expand):
+            # later pages finish first
+            time.sleep(0.01 * (8 - int(page_id)))
+            return self._page(page_id, restricted_users=[{'username': 'admin'}] if page_id == '3' else [])
+
+        mock_confluence_client.get_page_by_id.side_effect = get_page_by_id
+        api_wrapper.max_concurrent_requests = 4
+        pages = list(api_wrapper.get_pages_by_id(page_ids))
+
+        assert [page.metadata['id'] for page in pages] == ['0', '1', '2', '4', '5', '6', '7']
+        assert mock_confluence_client.get_page_by_id.call_count == 8
+        expand = mock_confluence_client.get_page_by_id.call_args.kwargs['expand']
+        assert 'restrictions.read.restrictions.user' in expand
+        assert 'restrictions.read.restrictions.group' in expand
+        mock_confluence_client.get_all_restrictions_for_content.assert_not_called()
+
+    @pytest.mark.positive
+    def test_get_pages_by_id_restricted_content_included(self, api_wrapper, mock_confluence_client):
+        """Test that restrictions are neither expanded nor checked when restricted content is included."""
+        mock_confluence_client.get_page_by_id.side_effect = lambda page_id, expand: self._page(page_id, ['admin'])
+        api_wrapper.include_restricted_content = True
+        api_wrapper.max_concurrent_requests = 1
+        pages = list(api_wrapper.get_pages_by_id(['1', '2']))
+
+        assert [page.metadata['id'] for page in pages] == ['1', '2']
+        assert 'restrictions' not in mock_confluence_client.get_page_by_id.call_args.kwargs['expand']
+
+    @pytest.mark.positive
+    def test_search_pages_follows_next_cursor(self, api_wrapper, mock_confluence_client):
+        """Test that CQL search expands page bodies, follows _links.next and stops at max_pages."""
+        responses = {
+            'rest/api/content/search': {'results': [self._page('1'), self._page('2', ['admin'])],
+                                        '_links': {'next': '/rest/api/content/search?cursor=a'}},
+            'rest/api/content/search?cursor=a': {'results': [self._page('3'), self._page('4')],
+                                                 '_links': {'next': '/rest/api/content/search?cursor=b'}},
+        }
+        mock_confluence_client.get.side_effect = lambda path, params=None: responses[path]
+        api_wrapper.limit = 2
+        api_wrapper.max_pages = 3
+
+        import ast
+        result = api_wrapper.search_pages("test query")
+
+        assert [page['page_id'] for page in ast.literal_eval(result)] == ['1', '3']
+        assert mock_confluence_client.get.call_count == 2
+        params = mock_confluence_client.get.call_args_list[0].kwargs['params']
+        assert params['limit'] == 2
+        assert 'body.view' in params['expand'] and 'restrictions.read.restrictions.user' in params['expand']
+        mock_confluence_client.get_page_by_id.assert_not_called()
+        mock_confluence_client.cql.assert_not_called()
+
+    @pytest.fixture
+    def incremental_index(self, api_wrapper, mock_confluence_client, tmp_path, monkeypatch):
+        """Fake space, loader and vector store for incremental index runs."""
+        space = {"versions": {"1": "2024-05-01T10:00:00.000Z", "2": "2024-05-01T11:00:00.000Z"}, "content": {}}
+        loaded, queries = [], []
+
+        def get(path, params=None):
+            queries.append(params["cql"])
+            pages = [{"id": page_id, "version": {"when": when}} for page_id, when in space["versions"].items()]
+            since = re.search(r'lastmodified >= "([^"]+)"', params["cql"])
+            if since:
+                pages = [page for page in pages if page["version"]["when"][:10] >= since.group(1)]
+            return {"results": pages, "_links": {}}
+
+        def loader(**params):
+            loaded.append(list(params["page_ids"]))
+            for page_id in params["page_ids"]:
+                when = space["versions"][page_id]
+                content = space["content"].get(page_id) or f"Page {page_id} at {when}"
+                yield Document(page_content=content, metadata={"id": page_id, "when": when,
+                                                               "source": f"https://confluence/{page_id}"})
+
+        class Store(VectorStore):
+            def __init__(self):
+                self.documents = {}
+                self.vectoradapter = SimpleNamespace(vectorstore=self)
+
+            def index_documents(self, documents):
+                for document in documents:
+                    self.documents[document.id] = document.page_content
+                return "indexed"
+
+            def delete(self, ids=None, **kwargs):
+                for id_ in ids:
+                    self.documents.pop(id_, None)
+
+            def similarity_search(self, query, k=4, **kwargs):
+                return []
+
+            @classmethod
+            def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+                return cls()
+
+        store = Store()
+        mock_confluence_client.get.side_effect = get
+        monkeypatch.setattr(api_wrapper, "_loader", loader)
+        monkeypatch.setattr(api_wrapper, "_get_embeddings", lambda: None)
+        monkeypatch.setattr(api_wrapper, "_init_vector_store", lambda *args, **kwargs: store)
+        monkeypatch.setattr(api_wrapper, "_get_manifest_store", lambda *args: FileManifestStore(str(tmp_path)))
+        index = lambda **kwargs: api_wrapper.index_data(content_format="view", chunking_tool="none",
+                                                        incremental=True, **kwargs)
+        return SimpleNamespace(space=space, loaded=loaded, queries=queries, store=store, index=index)
+
+    @pytest.mark.positive
+    def test_index_data_incremental(self, incremental_index):
+        """Test that incremental runs load only new or modified pages and delete documents of removed pages."""
+        space, loaded, store, index = (incremental_index.space, incremental_index.loaded, incremental_index.store,
+                                       incremental_index.index)
+        index()
+        assert loaded == [["1", "2"]]
+        # the whole scope is listed in a stable order
+        assert incremental_index.queries[0].endswith(" order by created asc")
+        space["versions"] = {"2": "2024-05-02T09:00:00.000Z", "3": "2024-05-02T09:30:00.000Z"}
+        index()
+        # one day before the watermark of the first run
+        assert incremental_index.queries[-1].endswith('lastmodified >= "2024-04-30"')
+        assert loaded[1] == ["2", "3"]
+        assert sorted(store.documents.values()) == ["Page 2 at 2024-05-02T09:00:00.000Z",
+                                                    "Page 3 at 2024-05-02T09:30:00.000Z"]
+        assert "up to date" in index()
+        assert len(loaded) == 2
+
+    @pytest.mark.positive
+    def test_index_data_incremental_caps_loading_only(self, incremental_index):
+        """Test that max_pages limits the pages loaded per run, not the pages diffed with the manifest."""
+        incremental_index.index(max_pages=1)
+        incremental_index.index(max_pages=1)
+        assert incremental_index.loaded == [["1"], ["2"]]
+        assert "up to date" in incremental_index.index(max_pages=1)
+
+    @pytest.mark.positive
+    def test_index_data_incremental_loads_held_back_modified_pages(self, incremental_index):
+        """Test that an indexed page modified and held back by max_pages is loaded once the watermark passed it."""
+        space, store = incremental_index.space, incremental_index.store
+        incremental_index.index()
+        space["versions"] = {"3": "2024-05-20T09:00:00.000Z", "2": "2024-05-10T09:00:00.000Z",
+                             "1": "2024-05-01T10:00:00.000Z"}
+        incremental_index.index(max_pages=1)
+        assert incremental_index.loaded[-1] == ["3"]
+        # the watermark moved to 2024-05-20, page 2 is no longer returned as modified
+        incremental_index.index(max_pages=1)
+        assert incremental_index.loaded[-1] == ["2"]
+        assert sorted(store.documents.values()) == ["Page 1 at 2024-05-01T10:00:00.000Z",
+                                                    "Page 2 at 2024-05-10T09:00:00.000Z",
+                                                    "Page 3 at 2024-05-20T09:00:00.000Z"]
+        assert "up to date" in incremental_index.index(max_pages=1)
+
+    @pytest.mark.positive
+    def test_index_data_incremental_tracks_duplicate_pages(self, incremental_index):
+        """Test that pages dropped as duplicates are recorded and loaded again when the kept page changes."""
+        space, loaded = incremental_index.space, incremental_index.loaded
+        footer = " ".join(f"word{i}" for i in range(100))
+        space["content"] = {"1": footer, "2": footer}
+        incremental_index.index(deduplicate=True)
+        assert list(incremental_index.store.documents.values()) == [footer]
+        assert "up to date" in incremental_index.index(deduplicate=True)
+
+        space["versions"]["1"] = "2024-05-02T09:00:00.000Z"
+        space["content"]["1"] = "Rewritten page"
+        incremental_index.index(deduplicate=True)
+        assert loaded[-1] == ["1", "2"]
+        assert sorted(incremental_index.store.documents.values()) == ["Rewritten page", footer]
+
+    @pytest.mark.positive
+    def test_index_data_incremental_reloads_on_settings_change(self, incremental_index):
+        """Test that changed content settings reload every page instead of starting a new index."""
+        incremental_index.index()
+        assert "up to date" in incremental_index.index(max_pages=5)
+        incremental_index.index(include_comments=True)
+        assert incremental_index.loaded[-1] == ["1", "2"]
+        assert len(incremental_index.store.documents) == 2
+
+    @pytest.mark.negative
+    def test_index_key_ignores_secrets(self, api_wrapper):
+        """Test that the incremental index key depends on the source identity only, not on credentials."""
+        key = api_wrapper._get_index_key("sfx")
+        api_wrapper.token = SecretStr("rotated")
+        api_wrapper.limit = 50
+        assert api_wrapper._get_index_key("sfx") == key == "ConfluenceAPIWrapper:https://confluence.example.com:TEST:sfx"
+
+    @pytest.mark.negative
+    def test_index_scope_strips_order_by(self, api_wrapper):
+        """Test that an ORDER BY of the CQL query is removed before the scope is combined with other clauses."""
+        scope = api_wrapper._index_scope_cql({"cql": 'space = TEST and title ~ "order by" ORDER BY created DESC'})
+        assert scope == '(space = TEST and title ~ "order by")'
+
     @pytest.mark.positive
     def test_get_page_with_image_descriptions(self, api_wrapper, mock_confluence_client):
         """Test get_page_with_image_descriptions method."""
@@ -253,6 +464,42 @@ class TestConfluenceAPIWrapper:
         mock_confluence_client.get_page_by_id.assert_called_once_with("12345", expand="body.storage")
         api_wrapper._download_image.assert_called_once()
         api_wrapper._process_image_with_llm.assert_called_once()
+
+    @pytest.mark.positive
+    def test_get_page_with_image_descriptions_concurrent(self, api_wrapper, mock_confluence_client):
+        """Test that images are described concurrently and the descriptions are spliced in page order."""
+        import threading
+        import time
+        images = ''.join(f'<p>Step {i}</p><ac:image><ri:attachment ri:filename="shot-{i}.png" /></ac:image>'
+                         for i in range(6))
+        mock_confluence_client.get_page_by_id.return_value = {
+            'id': '12345', 'title': 'Page With Images',
+            'body': {'storage': {'value': images + '<ac:image><ri:url ri:value="https://example.com/logo.png" />'
+                                                  '</ac:image>'}}
+        }
+        mock_confluence_client.get_attachments_from_content.return_value = {'results': [
+            {'title': f'shot-{i}.png', '_links': {'download': f'/download/attachments/12345/shot-{i}.png'}}
+            for i in range(6)]}
+        api_wrapper._download_image = MagicMock(side_effect=lambda url: url.encode())
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def describe(image_data, image_name, context_text, prompt):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            # earlier images finish later
+            time.sleep(0.01 * (7 - int(image_name[5]) if image_name.startswith('shot') else 0))
+            with lock:
+                running[0] -= 1
+            return f"described {image_name}"
+
+        api_wrapper._process_image_with_llm = describe
+        result = api_wrapper.get_page_with_image_descriptions("12345")
+        positions = [result.find(f"described shot-{i}.png") for i in range(6)] + [result.find("described logo.png")]
+        assert -1 not in positions and positions == sorted(positions)
+        assert peak[0] > 1
+        # the attachments are listed once for all images of the page
+        mock_confluence_client.get_attachments_from_content.assert_called_once_with("12345")
     
     @pytest.mark.positive
     def test_parse_payload_params_valid(self):
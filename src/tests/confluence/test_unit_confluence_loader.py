@@ -205,3 +205,73 @@ class TestAlitaConfluenceLoader:
         assert call_args[0].content[0]['type'] == 'text'
         assert call_args[0].content[1]['type'] == 'image_url'
         assert 'fake_base64_string' in call_args[0].content[1]['image_url']['url']
+
+    @staticmethod
+    def _attachment(attachment_id, title, media_type="image/png", version=1):
+        return {"id": attachment_id, "title": title, "version": {"number": version},
+                "metadata": {"mediaType": media_type},
+                "_links": {"download": f"/download/attachments/12345/{title}"}}
+
+    @pytest.mark.positive
+    def test_process_attachment_concurrent_in_order(self, confluence_loader, monkeypatch):
+        """Test that attachments are extracted concurrently and texts keep the attachment order."""
+        import threading
+        import time
+        monkeypatch.setenv("ALITA_ATTACHMENT_CACHE", "none")
+        confluence_loader.confluence.get_attachments_from_content.return_value = {"results": [
+            self._attachment("1", "a.png"), self._attachment("2", "b.bin", "application/zip"),
+            self._attachment("3", "c.png"), self._attachment("4", "d.png")]}
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def process_image(link, ocr_languages=None):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            # the first attachment finishes last
+            time.sleep(0.1 if link.endswith("a.png") else 0.02)
+            with lock:
+                running[0] -= 1
+            return f" text of {link.rsplit('/', 1)[-1]}"
+
+        confluence_loader.process_image = process_image
+        texts = confluence_loader.process_attachment("12345")
+        assert texts == ["a.png text of a.png", "c.png text of c.png", "d.png text of d.png"]
+        assert peak[0] > 1
+
+    @pytest.mark.positive
+    def test_process_attachment_cached_by_version(self, confluence_loader, monkeypatch, tmp_path):
+        """Test that an unchanged attachment is not extracted again and a new version is."""
+        monkeypatch.setenv("ALITA_ATTACHMENT_CACHE", str(tmp_path / "attachments.sqlite"))
+        confluence_loader.process_image = MagicMock(side_effect=[" first", " second", ""])
+        get_attachments = confluence_loader.confluence.get_attachments_from_content
+        get_attachments.return_value = {"results": [self._attachment("1", "a.png")]}
+        assert confluence_loader.process_attachment("12345") == ["a.png first"]
+        assert confluence_loader.process_attachment("12345") == ["a.png first"]
+        assert confluence_loader.process_image.call_count == 1
+        get_attachments.assert_called_with("12345", expand="version")
+        get_attachments.return_value = {"results": [self._attachment("1", "a.png", version=2)]}
+        assert confluence_loader.process_attachment("12345") == ["a.png second"]
+        # a failed download gives an empty text, which is not cached
+        get_attachments.return_value = {"results": [self._attachment("1", "a.png", version=3)]}
+        assert confluence_loader.process_attachment("12345") == ["a.png"]
+        confluence_loader.process_image.side_effect = [" third"]
+        assert confluence_loader.process_attachment("12345") == ["a.png third"]
+
+    @pytest.mark.negative
+    def test_attachment_cache_is_opt_in(self, monkeypatch, tmp_path):
+        """Test that attachment texts are only persisted when ALITA_ATTACHMENT_CACHE names a store."""
+        from alita_tools.confluence.attachments import get_attachment_cache
+        monkeypatch.delenv("ALITA_ATTACHMENT_CACHE", raising=False)
+        assert get_attachment_cache() is None
+        monkeypatch.setenv("ALITA_ATTACHMENT_CACHE", str(tmp_path / "attachments.sqlite"))
+        assert get_attachment_cache() is not None
+
+    @pytest.mark.negative
+    def test_process_attachment_skips_failed(self, confluence_loader, monkeypatch):
+        """Test that an attachment failing to process is skipped."""
+        monkeypatch.setenv("ALITA_ATTACHMENT_CACHE", "none")
+        confluence_loader.confluence.get_attachments_from_content.return_value = {"results": [
+            self._attachment("1", "a.png"), self._attachment("2", "b.png")]}
+        confluence_loader.process_image = MagicMock(side_effect=[ValueError("broken image"), " text"])
+        confluence_loader.max_attachment_workers = 1
+        assert confluence_loader.process_attachment("12345") == ["b.png text"]
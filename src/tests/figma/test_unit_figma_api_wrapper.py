@@ -22,11 +22,11 @@ class TestFigmaApiWrapper:
 
     @pytest.fixture
     def mock_requests(self):
-        with patch('alita_tools.figma.api_wrapper.requests') as mock_requests:
+        with patch('alita_tools.figma.api_wrapper.get_session') as mock_get_session:
             mock_response = MagicMock()
             mock_response.json.return_value = {"success": True}
-            mock_requests.request.return_value = mock_response
-            yield mock_requests
+            mock_get_session.return_value.request.return_value = mock_response
+            yield mock_get_session.return_value
 
     @pytest.mark.positive
     def test_init_with_token(self, mock_figmapy):
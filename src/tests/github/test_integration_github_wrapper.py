@@ -2,6 +2,7 @@ import os
 import pytest
 from src.alita_tools.github import AlitaGitHubAPIWrapper
 import json
+from langchain_core.tools import ToolException
 from datetime import datetime, timedelta
 from json import dumps  # Add this import
 
@@ -381,9 +382,7 @@ class TestGitHubAPIWrapper:
                     assert "changes" in diff
         else:
             # If error response, it should be a properly formatted error object
-            assert isinstance(diffs, dict)
-            if "error" in diffs:
-                assert "message" in diffs
+            assert isinstance(diffs, ToolException)
 
     def test_get_commits(self, github_api_wrapper):
         """Test getting commits from a repository."""
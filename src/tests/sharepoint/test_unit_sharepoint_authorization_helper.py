@@ -33,9 +33,10 @@ class TestSharepointAuthorizationHelper:
         assert auth_helper.access_token is None
 
     @pytest.mark.positive
-    @patch('alita_tools.sharepoint.authorization_helper.requests.post')
-    def test_refresh_access_token_success(self, mock_post, auth_helper):
+    @patch('alita_tools.sharepoint.authorization_helper.get_session')
+    def test_refresh_access_token_success(self, mock_get_session, auth_helper):
         """Test successful token refresh."""
+        mock_post = mock_get_session.return_value.post
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"access_token": "new-access-token"}
@@ -57,9 +58,10 @@ class TestSharepointAuthorizationHelper:
         )
 
     @pytest.mark.negative
-    @patch('alita_tools.sharepoint.authorization_helper.requests.post')
-    def test_refresh_access_token_failure(self, mock_post, auth_helper):
+    @patch('alita_tools.sharepoint.authorization_helper.get_session')
+    def test_refresh_access_token_failure(self, mock_get_session, auth_helper):
         """Test failed token refresh."""
+        mock_post = mock_get_session.return_value.post
         mock_response = MagicMock()
         mock_response.status_code = 400
         mock_response.text = "Error refreshing token"
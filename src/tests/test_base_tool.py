@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import MagicMock
 
 import pytest
@@ -143,3 +144,22 @@ class TestBaseAction:
         result = action._run()
 
         assert result == "Unknown action"
+
+    @pytest.mark.positive
+    def test_arun_runs_sync_wrapper_in_executor(self):
+        """Test that _arun falls back to the synchronous `run` of the API wrapper."""
+        action = BaseAction(api_wrapper=MockApiWrapper(), name="valid_action")
+
+        result = asyncio.run(action._arun("arg1"))
+
+        assert result == "Success!"
+
+    @pytest.mark.negative
+    def test_arun_returns_tool_exception(self):
+        """Test that _arun catches an exception and returns a ToolException."""
+        action = BaseAction(api_wrapper=MockApiWrapper(), name="exception_action")
+
+        result = asyncio.run(action._arun())
+
+        assert isinstance(result, ToolException)
+        assert str(result) == "An exception occurred: Simulated exception"
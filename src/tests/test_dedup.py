@@ -0,0 +1,75 @@
+import random
+
+import pytest
+from langchain_core.documents import Document
+
+from alita_tools.utils.dedup import DedupConfig, NearDuplicateFilter
+
+WORDS = ("release pipeline service cluster database migration rollback monitoring alert latency "
+         "dashboard incident owner runbook environment permission schema endpoint retry cache").split()
+
+
+def text(seed, words=200):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def doc(content, source):
+    return Document(page_content=content, metadata={"source": source})
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestNearDuplicateFilter:
+    @pytest.mark.positive
+    def test_exact_and_near_duplicates_are_dropped(self):
+        """Test that copies and copies with a changed word are skipped and distinct chunks kept in order."""
+        footer = text(0)
+        edited = footer.split()
+        edited[100] = "changed"
+        documents = [doc(footer, "page-1"), doc(text(1), "page-1"), doc(footer, "page-2"),
+                     doc(" ".join(edited), "page-3"), doc(text(2), "page-3")]
+        dedup = NearDuplicateFilter()
+        kept = list(dedup.filter(documents))
+        assert [d.page_content for d in kept] == [footer, text(1), text(2)]
+        assert (dedup.stats.chunks, dedup.stats.duplicates, dedup.stats.embeddings_saved) == (5, 2, 2)
+        assert "duplicate_sources" not in kept[0].metadata
+
+    @pytest.mark.positive
+    def test_merge_window_keeps_duplicate_sources(self):
+        """Test that sources of duplicates seen while a chunk is held back are added to its metadata."""
+        footer = text(0)
+        documents = [doc(footer, "page-1"), doc(text(1), "page-1"), doc(footer, "page-2"),
+                     doc(footer, "page-1"), doc(text(2), "page-3"), doc(text(3), "page-4"), doc(footer, "page-5")]
+        dedup = NearDuplicateFilter(merge_window=2)
+        kept = list(dedup.filter(documents))
+        assert [d.page_content for d in kept] == [footer, text(1), text(2), text(3)]
+        # page-5 arrives after the footer chunk left the window
+        assert kept[0].metadata["duplicate_sources"] == "page-2"
+        assert dedup.duplicate_sources == {"page-1": ["page-2", "page-5"]}
+        assert (dedup.stats.duplicates, dedup.stats.merged_sources) == (3, 2)
+
+    @pytest.mark.positive
+    def test_duplicate_sources_are_recorded_without_merge_window(self):
+        """Test that the source of every dropped duplicate is recorded under the source of the kept chunk."""
+        footer = text(0)
+        documents = [doc(footer, "page-1"), doc(footer, "page-2"), doc(footer, "page-1"), doc(footer, "page-3")]
+        dedup = NearDuplicateFilter()
+        assert [d.metadata["source"] for d in dedup.filter(documents)] == ["page-1"]
+        assert dedup.duplicate_sources == {"page-1": ["page-2", "page-3"]}
+
+    @pytest.mark.positive
+    def test_tables_are_bounded(self):
+        """Test that band tables and signatures never exceed max_entries."""
+        dedup = NearDuplicateFilter(max_entries=10)
+        assert len(list(dedup.filter(doc(text(seed), "page") for seed in range(50)))) == 50
+        assert all(len(table) <= 10 for table in dedup.tables)
+        assert len(dedup.signatures) == len(dedup.chunk_sources) == 10
+
+    @pytest.mark.negative
+    def test_invalid_config(self):
+        """Test that bands must divide the number of permutations."""
+        with pytest.raises(ValueError):
+            NearDuplicateFilter(num_perm=64, bands=7)
+        with pytest.raises(ValueError):
+            DedupConfig(num_perm=64, bands=7)
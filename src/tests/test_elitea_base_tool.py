@@ -1,4 +1,7 @@
+import asyncio
+
 import pytest
+from langchain_core.tools import ToolException
 
 from alita_tools.elitea_base import BaseToolApiWrapper, TOOLKIT_SPLITTER
 
@@ -41,6 +44,21 @@ class TestBaseToolApiWrapper:
         with pytest.raises(ValueError, match="Unknown mode: tool3"):
             wrapper.run("tool3")
 
+    @pytest.mark.positive
+    def test_run_builds_tool_table_once(self):
+        """Test that repeated `run` calls reuse the tool table instead of rebuilding the tool list."""
+        class CountingToolApiWrapper(MockToolApiWrapper):
+            def get_available_tools(self):
+                calls.append(1)
+                return super().get_available_tools()
+
+        calls = []
+        wrapper = CountingToolApiWrapper()
+        for _ in range(3):
+            assert wrapper.run("tool1") == "Tool1 executed"
+        assert wrapper.run("tool2", "arg") == "Tool2 executed with args: ('arg',)"
+        assert len(calls) == 1
+
     @pytest.mark.negative
     def test_get_available_tools_not_implemented(self):
         """Test that calling `get_available_tools` directly on `BaseToolApiWrapper` raises NotImplementedError."""
@@ -68,4 +86,43 @@ class TestBaseToolApiWrapper:
 
         wrapper = FailingToolApiWrapper()
         with pytest.raises(Exception, match="Simulated tool failure"):
-            wrapper.run("tool_fail")
\ No newline at end of file
+            wrapper.run("tool_fail")
+
+    @pytest.mark.positive
+    def test_arun_falls_back_to_run(self):
+        """Test that `arun` executes synchronous tools through `run`."""
+        wrapper = MockToolApiWrapper()
+        result = asyncio.run(wrapper.arun(f"prefix{TOOLKIT_SPLITTER}tool2", "arg1"))
+        assert result == "Tool2 executed with args: ('arg1',)"
+
+    @pytest.mark.positive
+    def test_arun_awaits_async_tool(self):
+        """Test that `arun` awaits the async implementation when a tool provides one."""
+        async def async_tool(*args, **kwargs):
+            return "Async tool executed"
+
+        class AsyncToolApiWrapper(BaseToolApiWrapper):
+            def get_available_tools(self):
+                return [{"name": "tool1", "ref": lambda: "Sync tool executed", "aref": async_tool}]
+
+        assert asyncio.run(AsyncToolApiWrapper().arun("tool1")) == "Async tool executed"
+
+    @pytest.mark.negative
+    def test_arun_wraps_async_tool_exception(self):
+        """Test that `arun` reports async tool failures as ToolException."""
+        async def failing_tool(*args, **kwargs):
+            raise ValueError("bad value")
+
+        class AsyncToolApiWrapper(BaseToolApiWrapper):
+            def get_available_tools(self):
+                return [{"name": "tool1", "ref": lambda: None, "aref": failing_tool}]
+
+        with pytest.raises(ToolException, match="Value error in tool 'tool1': bad value"):
+            asyncio.run(AsyncToolApiWrapper().arun("tool1"))
+
+    @pytest.mark.negative
+    def test_arun_unknown_mode(self):
+        """Test that `arun` raises exception for unknown mode."""
+        with pytest.raises(ValueError, match="Unknown mode: tool3"):
+            asyncio.run(MockToolApiWrapper().arun("tool3"))
+
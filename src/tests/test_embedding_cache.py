@@ -0,0 +1,104 @@
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from alita_tools.utils.embedding_cache import CachedEmbeddings, EmbeddingCacheStore, with_embedding_cache
+
+
+class CountingEmbeddings(Embeddings):
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5, -1.25] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 0.0, 0.0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingCacheStore(str(tmp_path / "embeddings.sqlite"))
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestEmbeddingCache:
+    @pytest.mark.positive
+    def test_only_misses_are_embedded(self, store):
+        """Test that cached texts are not sent to the model again and order is preserved."""
+        model = CountingEmbeddings()
+        cached = CachedEmbeddings(model, "model", {"dim": 3}, store)
+        first = cached.embed_documents(["a", "bb"])
+        second = cached.embed_documents(["ccc", "a", "bb", "ccc"])
+        assert model.calls == [["a", "bb"], ["ccc"]]
+        assert second == [[3.0, 0.5, -1.25], first[0], first[1], [3.0, 0.5, -1.25]]
+        assert (cached.hits, cached.misses) == (2, 3)
+
+    @pytest.mark.positive
+    def test_cache_is_persistent(self, store, tmp_path):
+        """Test that vectors survive reopening the store."""
+        CachedEmbeddings(CountingEmbeddings(), "model", None, store).embed_documents(["persisted"])
+        model = CountingEmbeddings()
+        reopened = EmbeddingCacheStore(str(tmp_path / "embeddings.sqlite"))
+        assert CachedEmbeddings(model, "model", None, reopened).embed_documents(["persisted"]) == [[9.0, 0.5, -1.25]]
+        assert model.calls == []
+
+    @pytest.mark.positive
+    def test_keys_depend_on_model_and_params(self, store):
+        """Test that the same text is embedded again for another model or other parameters."""
+        model = CountingEmbeddings()
+        CachedEmbeddings(model, "model", {"dim": 3}, store).embed_documents(["text"])
+        CachedEmbeddings(model, "model", {"dim": 4}, store).embed_documents(["text"])
+        CachedEmbeddings(model, "other", {"dim": 3}, store).embed_documents(["text"])
+        assert len(model.calls) == 3
+
+    @pytest.mark.positive
+    def test_size_based_eviction(self, tmp_path):
+        """Test that least recently used vectors are evicted once the store exceeds its size."""
+        # each vector takes 3 * 8 bytes
+        store = EmbeddingCacheStore(str(tmp_path / "small.sqlite"), max_bytes=24 * 3)
+        model = CountingEmbeddings()
+        cached = CachedEmbeddings(model, "model", None, store)
+        for text in ["a", "b", "c", "d"]:
+            cached.embed_documents([text])
+        assert store.size() <= 24 * 3
+        cached.embed_documents(["d"])
+        cached.embed_documents(["a"])
+        assert model.calls[-1] == ["a"]
+        assert model.calls.count(["d"]) == 1
+
+    @pytest.mark.negative
+    def test_disabled_cache_returns_model(self, monkeypatch):
+        """Test that ALITA_EMBEDDING_CACHE=none leaves the model unwrapped."""
+        monkeypatch.setenv("ALITA_EMBEDDING_CACHE", "none")
+        model = CountingEmbeddings()
+        assert with_embedding_cache(model, "model") is model
+
+    @pytest.mark.negative
+    def test_cache_is_opt_in(self, monkeypatch, tmp_path):
+        """Test that the model is only wrapped when ALITA_EMBEDDING_CACHE names a store."""
+        monkeypatch.delenv("ALITA_EMBEDDING_CACHE", raising=False)
+        model = CountingEmbeddings()
+        assert with_embedding_cache(model, "model") is model
+        monkeypatch.setenv("ALITA_EMBEDDING_CACHE", str(tmp_path / "embeddings.sqlite"))
+        assert isinstance(with_embedding_cache(model, "model"), CachedEmbeddings)
+
+    @pytest.mark.positive
+    def test_running_size_triggers_eviction(self, tmp_path):
+        """Test that the size is tracked without recounting the store on every write."""
+        store = EmbeddingCacheStore(str(tmp_path / "small.sqlite"), max_bytes=24 * 3)
+        for key in ["a", "b", "c"]:
+            store.set_many({key: [1.0, 2.0, 3.0]})
+        assert store._total == store.size() == 24 * 3
+        store.set_many({"d": [1.0, 2.0, 3.0]})
+        assert store._total == store.size() <= 24 * 3
+
+    @pytest.mark.positive
+    def test_queries_are_not_cached(self, store):
+        """Test that query embeddings always go to the model."""
+        model = CountingEmbeddings()
+        cached = CachedEmbeddings(model, "model", None, store)
+        assert cached.embed_query("abc") == [3.0, 0.0, 0.0]
+        assert model.calls == []
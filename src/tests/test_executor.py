@@ -0,0 +1,55 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from alita_tools.utils.executor import map_ordered
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestMapOrdered:
+    @pytest.mark.positive
+    def test_results_keep_input_order_with_bounded_concurrency(self):
+        """Test that results are yielded in input order while at most max_workers items run at the same time."""
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def work(item):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            # earlier items finish later
+            time.sleep(0.005 * (10 - item))
+            with lock:
+                running[0] -= 1
+            return item * 2
+
+        assert list(map_ordered(work, range(10), max_workers=3)) == [item * 2 for item in range(10)]
+        assert 1 < peak[0] <= 3
+
+    @pytest.mark.positive
+    def test_single_worker_runs_in_the_calling_thread(self):
+        """Test that one worker calls the function sequentially without a pool."""
+        threads = list(map_ordered(lambda item: threading.current_thread(), [1, 2], max_workers=None))
+        assert threads == [threading.current_thread()] * 2
+
+    @pytest.mark.positive
+    def test_tasks_run_in_the_caller_context(self):
+        """Test that context variables of the caller, such as the instrumentation scope, are seen by every task."""
+        scope = contextvars.ContextVar("scope", default=None)
+        scope.set("tool")
+        assert list(map_ordered(lambda item: scope.get(), range(4), max_workers=2)) == ["tool"] * 4
+
+    @pytest.mark.negative
+    def test_errors_are_raised_in_order(self):
+        """Test that an item failing is raised when its result is reached."""
+        def work(item):
+            if item == 2:
+                raise ValueError("broken item")
+            return item
+
+        results = map_ordered(work, [0, 1, 2, 3], max_workers=2)
+        assert [next(results), next(results)] == [0, 1]
+        with pytest.raises(ValueError):
+            next(results)
@@ -0,0 +1,58 @@
+import pytest
+
+from alita_tools.utils import http_session
+
+
+@pytest.fixture(autouse=True)
+def reset_sessions():
+    http_session.close_sessions()
+    yield
+    http_session.close_sessions()
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestHttpSession:
+    @pytest.mark.positive
+    def test_session_is_shared(self):
+        """Test that sessions with the same settings are reused."""
+        assert http_session.get_session() is http_session.get_session()
+        assert http_session.get_session(verify=False) is http_session.get_session(verify=False)
+
+    @pytest.mark.positive
+    def test_session_per_settings(self):
+        """Test that SSL and proxy settings get their own session."""
+        default = http_session.get_session()
+        insecure = http_session.get_session(verify=False)
+        proxied = http_session.get_session(proxies={"https": "http://proxy:3128"})
+        assert len({id(default), id(insecure), id(proxied)}) == 3
+        assert insecure.verify is False
+        assert proxied.proxies["https"] == "http://proxy:3128"
+
+    @pytest.mark.positive
+    def test_pool_size_is_configurable(self, monkeypatch):
+        """Test that pool sizes from configure() are applied to new sessions."""
+        monkeypatch.setattr(http_session, "_config", http_session.HttpSessionConfig())
+        http_session.configure(pool_maxsize=5)
+        adapter = http_session.get_session().get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 5
+
+    @pytest.mark.negative
+    def test_cookies_are_not_persisted(self):
+        """Test that shared sessions do not keep cookies between callers."""
+        import requests
+        session = http_session.get_session()
+        cookie = requests.cookies.create_cookie("JSESSIONID", "secret", domain="example.com")
+        assert session.cookies.get_policy().set_ok(cookie, None) is False
+
+    @pytest.mark.positive
+    def test_default_timeout_is_applied(self, monkeypatch):
+        """Test that requests get the configured timeout unless the caller passes one."""
+        import requests
+        captured = {}
+        monkeypatch.setattr(requests.Session, "request", lambda self, method, url, **kwargs: captured.update(kwargs))
+        session = http_session.get_session()
+        session.get("https://example.com")
+        assert captured["timeout"] == session.config.timeout
+        session.get("https://example.com", timeout=3)
+        assert captured["timeout"] == 3
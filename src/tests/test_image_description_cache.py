@@ -0,0 +1,86 @@
+import pytest
+
+from alita_tools.llm.img_utils import (ImageDescriptionCache, ImageDescriptionStore, find_image_references,
+                                       get_image_description_cache, llm_model_name, resolve_concurrently, splice)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ImageDescriptionStore(str(tmp_path / "image_descriptions.sqlite"))
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestImageDescriptionCache:
+    @pytest.mark.positive
+    def test_key_includes_prompt_and_model(self):
+        """Test that the same image described with another prompt or model is a miss."""
+        cache = ImageDescriptionCache()
+        cache.set(b"image", "a diagram", "prompt", "gpt-4o")
+        assert cache.get(b"image", "prompt", "gpt-4o") == "a diagram"
+        assert cache.get(b"image", "other prompt", "gpt-4o") is None
+        assert cache.get(b"image", "prompt", "claude") is None
+        assert cache.get(None, "prompt", "gpt-4o") is None
+        assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+    @pytest.mark.positive
+    def test_lru_eviction_by_size(self):
+        """Test that the least recently used descriptions are evicted once the byte limit is exceeded."""
+        cache = ImageDescriptionCache(max_bytes=20)
+        cache.set(b"one", "x" * 8)
+        cache.set(b"two", "y" * 8)
+        assert cache.get(b"one") == "x" * 8
+        cache.set(b"three", "z" * 8)
+        assert cache.get(b"two") is None
+        assert cache.get(b"one") == "x" * 8
+        assert cache.size == 16
+
+    @pytest.mark.positive
+    def test_descriptions_are_persistent(self, store, tmp_path):
+        """Test that a new cache over the same store finds descriptions of another instance."""
+        ImageDescriptionCache(store=store).set(b"image", "a diagram", "prompt", "model")
+        other = ImageDescriptionCache(store=ImageDescriptionStore(str(tmp_path / "image_descriptions.sqlite")))
+        assert other.get(b"image", "prompt", "model") == "a diagram"
+        assert other.stats.hits == 1
+
+    @pytest.mark.positive
+    def test_store_evicts_by_size(self, tmp_path):
+        """Test that the store stays under its byte limit by removing least recently used entries."""
+        store = ImageDescriptionStore(str(tmp_path / "image_descriptions.sqlite"), max_bytes=100)
+        for i in range(10):
+            store.set(f"key-{i}", "d" * 30)
+        assert store.size() <= 100
+        assert store.get("key-9") == "d" * 30
+        assert store.get("key-0") is None
+
+    @pytest.mark.positive
+    def test_process_wide_cache(self, monkeypatch, tmp_path):
+        """Test that toolkits share one cache and that ``none`` keeps descriptions in memory only."""
+        monkeypatch.setenv("ALITA_IMAGE_DESCRIPTION_CACHE", str(tmp_path / "image_descriptions.sqlite"))
+        cache = get_image_description_cache()
+        assert get_image_description_cache() is cache
+        assert cache.store is not None
+        monkeypatch.setenv("ALITA_IMAGE_DESCRIPTION_CACHE", "none")
+        assert get_image_description_cache().store is None
+        # the store is opt-in
+        monkeypatch.delenv("ALITA_IMAGE_DESCRIPTION_CACHE")
+        assert get_image_description_cache().store is None
+
+    @pytest.mark.positive
+    def test_llm_model_name(self):
+        """Test that the model name is read from the usual client attributes."""
+        class Client:
+            model_name = "gpt-4o"
+
+        assert llm_model_name(Client()) == "gpt-4o"
+        assert llm_model_name(None) == "NoneType"
+
+    @pytest.mark.positive
+    def test_find_resolve_and_splice(self):
+        """Test that references of several patterns are found in order and replaced in one pass."""
+        content = "a <img:one> b [url:two] c <img:three>"
+        references = find_image_references(content, [r"<img:(\w+)>", r"\[url:(\w+)\]", r"<img:one> b"])
+        assert [match.group(0) for match in references] == ["<img:one>", "[url:two]", "<img:three>"]
+        descriptions = resolve_concurrently(references, lambda match: match.group(1).upper(), max_workers=2)
+        assert descriptions == ["ONE", "TWO", "THREE"]
+        assert splice(content, references, descriptions) == "a ONE b TWO c THREE"
@@ -0,0 +1,207 @@
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.vectorstores import VectorStore
+
+from alita_tools.utils.index_manifest import (FileManifestStore, IndexManifest, SqlManifestStore, clear_collection,
+                                              deletable_store, delete_documents, document_id)
+
+
+class FakeVectorStore(VectorStore):
+    """Stands in for the alita VectorStoreWrapper and its langchain store: records indexed documents and deletions."""
+
+    def __init__(self):
+        self.documents = {}
+        self.vectoradapter = SimpleNamespace(vectorstore=self)
+
+    def index_documents(self, documents):
+        documents = list(documents)
+        for document in documents:
+            self.documents[document.id] = document
+        return f"indexed {len(documents)}"
+
+    def delete(self, ids=None, **kwargs):
+        for id_ in ids:
+            self.documents.pop(id_, None)
+        return True
+
+    def get(self, include=None):
+        return {"ids": list(self.documents)}
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return []
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        return cls()
+
+
+class AppendOnlyVectorStore(FakeVectorStore):
+    delete = VectorStore.delete
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestIndexManifest:
+    @pytest.mark.positive
+    def test_diff_reports_changed_and_removed(self, tmp_path):
+        """Test that new and changed sources are reported in listing order and missing ones as removed."""
+        manifest = IndexManifest("key", FileManifestStore(str(tmp_path)))
+        manifest.update("a.py", "1", ["id-a"])
+        manifest.update("b.py", "1", ["id-b"])
+        manifest.update("c.py", "1", ["id-c"])
+        changed, removed = manifest.diff({"d.py": "1", "a.py": "1", "b.py": "2"})
+        assert changed == ["d.py", "b.py"]
+        assert removed == ["c.py"]
+        assert manifest.document_ids(changed + removed) == ["id-b", "id-c"]
+
+    @pytest.mark.positive
+    def test_manifest_is_persisted_per_key(self, tmp_path):
+        """Test that a saved manifest is loaded back for the same key only."""
+        manifest = IndexManifest("key", FileManifestStore(str(tmp_path)))
+        manifest.update("a.py", "1", ["id-a"])
+        manifest.state["watermark"] = "2024-01-01"
+        manifest.save()
+        loaded = IndexManifest("key", FileManifestStore(str(tmp_path)))
+        assert loaded.entries == {"a.py": {"version": "1", "ids": ["id-a"]}}
+        assert loaded.state == {"watermark": "2024-01-01"}
+        assert IndexManifest("other", FileManifestStore(str(tmp_path))).entries == {}
+
+    @pytest.mark.positive
+    def test_manifest_is_shared_through_the_database(self, tmp_path):
+        """Test that a manifest saved by one worker is loaded by another one connected to the same database."""
+        connection_string = f"sqlite:///{tmp_path / 'collection.db'}"
+        manifest = IndexManifest("key", SqlManifestStore(connection_string))
+        assert manifest.exists is False
+        manifest.update("a.py", "1", ["id-a"])
+        manifest.save()
+        manifest.update("a.py", "2", ["id-a2"])
+        manifest.save()
+        loaded = IndexManifest("key", SqlManifestStore(connection_string))
+        # runs share the engine and its connection pool
+        assert loaded.store.engine is manifest.store.engine
+        assert loaded.exists is True
+        assert loaded.entries == {"a.py": {"version": "2", "ids": ["id-a2"]}}
+
+    @pytest.mark.negative
+    def test_corrupt_manifest_is_ignored(self, tmp_path):
+        """Test that an unreadable manifest starts an empty one instead of failing the index run."""
+        store = FileManifestStore(str(tmp_path))
+        with open(store._path("key"), "w") as f:
+            f.write("{not json")
+        manifest = IndexManifest("key", store)
+        assert manifest.entries == {}
+        assert manifest.exists is False
+
+    @pytest.mark.positive
+    def test_document_id_is_deterministic(self):
+        """Test that ids depend on the index, source, version and chunk position."""
+        assert document_id("key", "a.py", "1", 0) == document_id("key", "a.py", "1", 0)
+        assert len({document_id("key", "a.py", "1", 0), document_id("key", "a.py", "1", 1),
+                    document_id("key", "a.py", "2", 0), document_id("other", "a.py", "1", 0)}) == 4
+
+    @pytest.mark.positive
+    def test_delete_documents_uses_the_langchain_store(self):
+        """Test that deletion goes to the langchain vector store behind the wrapper's adapter."""
+        langchain_store = FakeVectorStore()
+        langchain_store.documents = {"id-a": None, "id-b": None}
+        wrapper = SimpleNamespace(vectoradapter=SimpleNamespace(vectorstore=langchain_store))
+        assert deletable_store(wrapper) is langchain_store
+        assert delete_documents(wrapper, ["id-a"]) is True
+        assert list(langchain_store.documents) == ["id-b"]
+
+    @pytest.mark.negative
+    def test_delete_documents_reports_failures(self):
+        """Test that stores without deletion by id are detected and failing deletions are reported, not raised."""
+        assert deletable_store(object()) is None
+        assert deletable_store(AppendOnlyVectorStore()) is None
+        assert delete_documents(AppendOnlyVectorStore(), ["id-a"]) is False
+
+        class FailingVectorStore(FakeVectorStore):
+            def delete(self, ids=None, **kwargs):
+                raise RuntimeError("connection lost")
+
+        assert delete_documents(FailingVectorStore(), ["id-a"]) is False
+        assert delete_documents(object(), []) is True
+
+    @pytest.mark.positive
+    def test_clear_collection(self):
+        """Test that every document of a store listing its ids is deleted, and unsupported stores are reported."""
+        store = FakeVectorStore()
+        store.documents = {f"id-{i}": None for i in range(2500)}
+        assert clear_collection(store) is True
+        assert store.documents == {}
+        assert clear_collection(AppendOnlyVectorStore()) is False
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestIncrementalCodeIndex:
+    @pytest.fixture
+    def wrapper(self):
+        pytest.importorskip("langchain.schema")
+        from alita_tools.elitea_base import BaseCodeToolApiWrapper
+
+        class Repo(BaseCodeToolApiWrapper):
+            files: dict = {}
+            reads: list = []
+
+            def _read_file(self, file_path, branch):
+                self.reads.append(file_path)
+                return self.files[file_path][1]
+
+        return Repo()
+
+    @pytest.mark.positive
+    def test_only_changed_files_are_read_and_stale_documents_deleted(self, wrapper, tmp_path):
+        """Test that a second run reads changed files only and replaces the documents of changed and removed files."""
+        store = FakeVectorStore()
+        # written by a full index, which records no ids
+        store.documents["full-index-id"] = SimpleNamespace(page_content="def alpha(): pass")
+        manifests = FileManifestStore(str(tmp_path))
+        wrapper.files = {"a.py": ("1", "def alpha(): pass"), "b.py": ("1", "def beta(): pass"),
+                         "c.py": ("1", "def gamma(): pass")}
+        versions = lambda: {path: version for path, (version, _) in wrapper.files.items()}
+        wrapper._index_code_incrementally(store, manifests, "key", versions(),
+                                          lambda path: wrapper._read_file(path, "main"))
+        assert sorted(d.page_content for d in store.documents.values()) == ["def alpha(): pass", "def beta(): pass",
+                                                                      "def gamma(): pass"]
+
+        wrapper.reads.clear()
+        wrapper.files = {"a.py": ("1", "def alpha(): pass"), "b.py": ("2", "def beta(): return 2"),
+                         "d.py": ("1", "def delta(): pass")}
+        wrapper._index_code_incrementally(store, manifests, "key", versions(),
+                                          lambda path: wrapper._read_file(path, "main"))
+        assert wrapper.reads == ["b.py", "d.py"]
+        assert sorted(d.page_content for d in store.documents.values()) == ["def alpha(): pass",
+                                                                            "def beta(): return 2",
+                                                                            "def delta(): pass"]
+
+        wrapper.reads.clear()
+        assert "up to date" in wrapper._index_code_incrementally(
+            store, manifests, "key", versions(), lambda path: wrapper._read_file(path, "main"))
+        assert wrapper.reads == []
+
+    @pytest.mark.negative
+    def test_store_without_deletion_is_indexed_in_full(self, wrapper, monkeypatch):
+        """Test that incremental indexing falls back to a full index when documents cannot be deleted by id."""
+        store = AppendOnlyVectorStore()
+        monkeypatch.setattr(type(wrapper), "_init_vector_store", lambda self, *args, **kwargs: store)
+        monkeypatch.setattr(type(wrapper), "_get_embeddings", lambda self: None)
+        monkeypatch.setattr(type(wrapper), "_get_file_versions", lambda self, branch: {"a.py": "1"})
+        monkeypatch.setattr(type(wrapper), "_get_manifest_store",
+                            lambda self, suffix: pytest.fail("the manifest must not be used"))
+        monkeypatch.setattr(type(wrapper), "loader", lambda self, **kwargs: iter([SimpleNamespace(id=None)]))
+        assert wrapper.index_data(branch="main", incremental=True) == "indexed 1"
+
+    @pytest.mark.negative
+    def test_collection_with_other_manifests_is_not_cleared(self, wrapper, tmp_path):
+        """Test that the first run of an index does not clear documents recorded by other indexes of the collection."""
+        store = FakeVectorStore()
+        store.documents["other-index-id"] = SimpleNamespace(page_content="def other(): pass")
+        manifests = FileManifestStore(str(tmp_path))
+        IndexManifest("other", manifests).save()
+        wrapper.files = {"a.py": ("1", "def alpha(): pass")}
+        wrapper._index_code_incrementally(store, manifests, "key", {"a.py": "1"},
+                                          lambda path: wrapper._read_file(path, "main"))
+        assert sorted(d.page_content for d in store.documents.values()) == ["def alpha(): pass", "def other(): pass"]
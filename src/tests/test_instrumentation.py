@@ -0,0 +1,133 @@
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from langchain_core.tools import ToolException
+
+from alita_tools.base.tool import BaseAction
+from alita_tools.elitea_base import BaseToolApiWrapper
+from alita_tools.utils import instrumentation
+from alita_tools.utils.instrumentation import (CallbackSink, InMemoryStatsSink, OpenTelemetrySink, PrometheusSink,
+                                               ToolCallStats)
+from alita_tools.utils.rate_limit import RateLimitScheduler, RateLimitedAdapter
+
+
+class FetchWrapper(BaseToolApiWrapper):
+
+    def fetch(self, query: str = ""):
+        return f"result for {query}"
+
+    def fail(self):
+        raise RuntimeError("boom")
+
+    def get_available_tools(self):
+        return [
+            {"name": "fetch", "description": "", "args_schema": None, "ref": self.fetch},
+            {"name": "fail", "description": "", "args_schema": None, "ref": self.fail},
+        ]
+
+
+@pytest.fixture
+def sink():
+    sink = instrumentation.add_sink(InMemoryStatsSink())
+    yield sink
+    instrumentation.clear_sinks()
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestInstrumentation:
+    @pytest.mark.positive
+    def test_disabled_without_sinks(self):
+        """Test that no scope is recorded while no sink is registered."""
+        instrumentation.clear_sinks()
+        assert not instrumentation.is_enabled()
+        assert instrumentation.tool_call("Toolkit", "tool") is instrumentation._NOOP_SCOPE
+
+    @pytest.mark.positive
+    def test_run_records_latency_and_output(self, sink):
+        """Test that BaseToolApiWrapper.run records call count and output size per tool."""
+        wrapper = FetchWrapper()
+        wrapper.run("toolkit___fetch", query="abc")
+        wrapper.run("fetch", query="abc")
+        stats = sink.snapshot()["FetchWrapper"]["fetch"]
+        assert stats["count"] == 2
+        assert stats["errors"] == 0
+        assert stats["output_size"] == 2 * len("result for abc")
+        assert sum(stats["latency_buckets"].values()) == 2
+
+    @pytest.mark.negative
+    def test_run_records_errors(self, sink):
+        """Test that failing tools are counted as errors."""
+        with pytest.raises(ToolException):
+            FetchWrapper().run("fail")
+        assert sink.snapshot()["FetchWrapper"]["fail"]["errors"] == 1
+
+    @pytest.mark.positive
+    def test_base_action_records_once(self, sink):
+        """Test that BaseAction._run and the nested wrapper run are recorded as one call."""
+        action = BaseAction(api_wrapper=FetchWrapper(), name="toolkit___fetch", description="")
+        assert action._run(query="q") == "result for q"
+        assert sink.snapshot()["FetchWrapper"]["fetch"]["count"] == 1
+
+    @pytest.mark.negative
+    def test_base_action_records_returned_exception(self, sink):
+        """Test that a ToolException returned by BaseAction is counted as an error."""
+        action = BaseAction(api_wrapper=FetchWrapper(), name="fail", description="")
+        assert isinstance(action._run(), ToolException)
+        assert sink.snapshot()["FetchWrapper"]["fail"]["errors"] == 1
+
+    @pytest.mark.positive
+    def test_remote_calls_are_attributed_to_tool(self, sink):
+        """Test that requests sent through the rate-limited adapter count towards the running tool."""
+        adapter = RateLimitedAdapter(scheduler=RateLimitScheduler())
+        request = requests.Request("GET", "https://example.com/api").prepare()
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(b"0123456789")
+
+        def fetch_remote():
+            adapter.send(request)
+            return "ok"
+
+        with patch("requests.adapters.HTTPAdapter.send", return_value=response):
+            with instrumentation.tool_call("Toolkit", "remote") as scope:
+                scope.set_output(fetch_remote())
+            # outside of a tool call nothing is attributed
+            instrumentation.record_remote_call(100)
+        stats = sink.snapshot()["Toolkit"]["remote"]
+        assert stats["remote_calls"] == 1
+        assert stats["bytes_received"] == 10
+
+    @pytest.mark.positive
+    def test_prometheus_export(self):
+        """Test the Prometheus text format of collected stats."""
+        sink = PrometheusSink()
+        sink.record(ToolCallStats("Toolkit", "tool", latency=0.2, remote_calls=3, bytes_received=50, output_size=7))
+        text = sink.export()
+        assert 'alita_tool_latency_seconds_bucket{toolkit="Toolkit",tool="tool",le="0.1"} 0' in text
+        assert 'alita_tool_latency_seconds_bucket{toolkit="Toolkit",tool="tool",le="0.25"} 1' in text
+        assert 'alita_tool_latency_seconds_bucket{toolkit="Toolkit",tool="tool",le="+Inf"} 1' in text
+        assert 'alita_tool_remote_calls_total{toolkit="Toolkit",tool="tool"} 3' in text
+        assert 'alita_tool_bytes_received_total{toolkit="Toolkit",tool="tool"} 50' in text
+
+    @pytest.mark.positive
+    def test_opentelemetry_sink(self):
+        """Test that the OpenTelemetry sink records into meter instruments with toolkit/tool attributes."""
+        meter = MagicMock()
+        sink = OpenTelemetrySink(meter)
+        sink.record(ToolCallStats("Toolkit", "tool", latency=0.5))
+        meter.create_histogram.return_value.record.assert_any_call(0.5, {"toolkit": "Toolkit", "tool": "tool"})
+        meter.create_counter.return_value.add.assert_any_call(1, {"toolkit": "Toolkit", "tool": "tool"})
+
+    @pytest.mark.positive
+    def test_callback_sink(self):
+        """Test that the callback sink receives every recorded call."""
+        received = []
+        instrumentation.add_sink(CallbackSink(received.append))
+        try:
+            FetchWrapper().run("fetch")
+        finally:
+            instrumentation.clear_sinks()
+        assert [(stats.toolkit, stats.tool) for stats in received] == [("FetchWrapper", "fetch")]
@@ -0,0 +1,91 @@
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain.schema")
+
+from langchain_core.documents import Document
+
+from alita_tools.chunkers.sematic import proposal_chunker as module
+from alita_tools.utils.tool_cache import InMemoryLRUCache
+
+
+class FakeLLM:
+    """Structured-output LLM returning one chunk titled after the analyzed split."""
+    model_name = "fake-model"
+
+    def __init__(self, delays=None):
+        self.calls = []
+        self.delays = delays or {}
+        self.running, self.peak = 0, 0
+        self._lock = threading.Lock()
+
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, prompt):
+        split = prompt.to_messages()[-1].content[len("Content: "):]
+        with self._lock:
+            self.calls.append(split)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delays.get(split, 0))
+        with self._lock:
+            self.running -= 1
+        return SimpleNamespace(chunks=[SimpleNamespace(chunk_title=f"title {split}", chunk_summary="summary",
+                                                       propositions=[split])])
+
+
+class FailingCache(InMemoryLRUCache):
+    def set(self, key, value):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def documents(count):
+    return [Document(page_content=f"doc {i}", metadata={"source": f"page-{i}"}) for i in range(count)]
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestProposalChunker:
+    @pytest.mark.positive
+    def test_chunks_keep_document_order_with_concurrency(self, monkeypatch):
+        """Test that splits analyzed concurrently across documents are yielded in input order."""
+        monkeypatch.setenv("ALITA_PROPOSAL_CACHE", "none")
+        # short documents are analyzed whole, without loading the tokenizer
+        monkeypatch.setattr(module, "tiktoken_length", len)
+        # earlier documents finish later
+        llm = FakeLLM(delays={f"doc {i}": 0.01 * (6 - i) for i in range(6)})
+        chunks = list(module.proposal_chunker(iter(documents(6)), {"llm": llm, "max_concurrency": 3}))
+        titles = [chunk for chunk in chunks if chunk.metadata["chunk_type"] == "title"]
+        assert [chunk.page_content for chunk in titles] == [f"title doc {i}" for i in range(6)]
+        assert [chunk.metadata["source"] for chunk in titles] == [f"page-{i}" for i in range(6)]
+        assert all(chunk.metadata["chunk_id"] == 1 for chunk in titles)
+        assert 1 < llm.peak <= 3
+
+    @pytest.mark.positive
+    def test_cache_hits_skip_the_llm(self):
+        """Test that a split analyzed before by the same model is served from the cache."""
+        llm = FakeLLM()
+        chunker = module.AgenticChunker(llm=llm, cache=InMemoryLRUCache())
+        first = chunker.add_propositions("doc 0")
+        assert chunker.add_propositions("doc 0") == first
+        assert llm.calls == ["doc 0"]
+
+    @pytest.mark.negative
+    def test_cache_errors_do_not_abort_chunking(self, caplog):
+        """Test that a failing cache write is logged and the analysis is still returned."""
+        chunker = module.AgenticChunker(llm=FakeLLM(), cache=FailingCache())
+        assert chunker.add_propositions("doc 0")[0]["title"] == "title doc 0"
+        assert "Proposal cache is unavailable" in caplog.text
+
+    @pytest.mark.negative
+    def test_cache_is_opt_in(self, monkeypatch, tmp_path):
+        """Test that split analyses are only persisted when ALITA_PROPOSAL_CACHE names a store."""
+        monkeypatch.delenv("ALITA_PROPOSAL_CACHE", raising=False)
+        assert module.get_proposal_cache() is None
+        monkeypatch.setenv("ALITA_PROPOSAL_CACHE", str(tmp_path / "proposals.sqlite"))
+        assert module.get_proposal_cache() is not None
@@ -0,0 +1,108 @@
+import io
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from alita_tools.utils.rate_limit import HostLimiter, RateLimitScheduler, RateLimitedAdapter, TokenBucket
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestRateLimit:
+    @pytest.mark.positive
+    def test_token_bucket_waits_when_empty(self):
+        """Test that the bucket only asks callers to wait once the burst is used up."""
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+    @pytest.mark.positive
+    def test_retry_after_pauses_host(self):
+        """Test that a 429 with Retry-After pauses the host and halves concurrency."""
+        limiter = HostLimiter("example.com", max_concurrency=8)
+        limiter.observe(429, {"Retry-After": "7"})
+        assert limiter.concurrency == 4
+        assert limiter.paused_until - time.monotonic() == pytest.approx(7, abs=0.5)
+
+    @pytest.mark.positive
+    def test_remaining_quota_sets_rate(self):
+        """Test that X-RateLimit headers keep the rate just below the remaining quota."""
+        limiter = HostLimiter("example.com", rate=100)
+        limiter.observe(200, {"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": str(time.time() + 10)})
+        assert limiter.bucket.rate == pytest.approx(4.5, abs=0.1)
+
+    @pytest.mark.positive
+    def test_concurrency_recovers_after_successes(self):
+        """Test that the concurrency limit grows back after successful responses."""
+        limiter = HostLimiter("example.com", max_concurrency=4)
+        limiter.observe(429, {"Retry-After": "0"})
+        for _ in range(2):
+            limiter.observe(200, {})
+        assert limiter.concurrency == 3
+
+    @pytest.mark.positive
+    def test_host_is_not_throttled_without_limits(self):
+        """Test that a host is only throttled once it reports a quota or answers 429."""
+        limiter = HostLimiter("example.com", rate=1, burst=1, max_concurrency=1)
+        start = time.monotonic()
+        for _ in range(3):
+            with limiter.slot():
+                pass
+        assert time.monotonic() - start < 0.5
+        limiter.observe(200, {})
+        assert not limiter.limited
+        limiter.observe(429, {"Retry-After": "0"})
+        assert limiter.limited
+
+    @pytest.mark.positive
+    def test_scheduler_keys_by_host(self):
+        """Test that the scheduler keeps one limiter per host."""
+        scheduler = RateLimitScheduler()
+        assert scheduler.limiter("https://a.example.com/x") is scheduler.limiter("https://a.example.com/y")
+        assert scheduler.limiter("https://a.example.com/x") is not scheduler.limiter("https://b.example.com/x")
+
+    @pytest.mark.positive
+    def test_adapter_retries_throttled_requests(self):
+        """Test that the adapter retries a throttled request after the server-provided delay."""
+        adapter = RateLimitedAdapter(scheduler=RateLimitScheduler())
+        request = requests.Request("GET", "https://example.com/api").prepare()
+        responses = [make_response(429, {"Retry-After": "0"}), make_response(200)]
+        with patch("requests.adapters.HTTPAdapter.send", side_effect=responses) as send:
+            response = adapter.send(request)
+        assert response.status_code == 200
+        assert send.call_count == 2
+
+    @pytest.mark.negative
+    def test_adapter_does_not_replay_streamed_body(self):
+        """Test that requests with streamed bodies are not retried."""
+        adapter = RateLimitedAdapter(scheduler=RateLimitScheduler())
+        request = requests.Request("POST", "https://example.com/api", data=iter([b"chunk"])).prepare()
+        with patch("requests.adapters.HTTPAdapter.send", return_value=make_response(429, {"Retry-After": "0"})) as send:
+            response = adapter.send(request)
+        assert response.status_code == 429
+        assert send.call_count == 1
+
+    @pytest.mark.negative
+    def test_adapter_does_not_retry_unavailable_post(self):
+        """Test that a 503 is retried for idempotent requests only."""
+        adapter = RateLimitedAdapter(scheduler=RateLimitScheduler())
+        post = requests.Request("POST", "https://example.com/api", data=b"{}").prepare()
+        with patch("requests.adapters.HTTPAdapter.send", return_value=make_response(503, {"Retry-After": "0"})) as send:
+            assert adapter.send(post).status_code == 503
+        assert send.call_count == 1
+        get = requests.Request("GET", "https://example.com/api").prepare()
+        responses = [make_response(503, {"Retry-After": "0"}), make_response(200)]
+        with patch("requests.adapters.HTTPAdapter.send", side_effect=responses) as send:
+            assert adapter.send(get).status_code == 200
+        assert send.call_count == 2
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+import alita_tools
+from alita_tools import schema_cache
+
+
+class FakeModel:
+    @staticmethod
+    def model_json_schema():
+        return {"title": "fake"}
+
+
+class FakeToolkit:
+    calls = 0
+
+    @classmethod
+    def toolkit_config_schema(cls):
+        cls.calls += 1
+        return FakeModel
+
+
+@pytest.fixture
+def fake_registry(monkeypatch):
+    FakeToolkit.calls = 0
+    schema_cache.clear_cache()
+    monkeypatch.setattr(alita_tools, "_TOOLKITS_REGISTRY", [(".fake", "FakeToolkit")])
+    monkeypatch.setattr(alita_tools, "_resolve", lambda module, attr: FakeToolkit)
+    monkeypatch.setattr(schema_cache, "package_version", lambda: "1.2.3")
+    yield
+    schema_cache.clear_cache()
+
+
+@pytest.mark.unit
+@pytest.mark.base
+@pytest.mark.utils
+class TestSchemaCache:
+    @pytest.mark.positive
+    def test_models_are_memoized(self, fake_registry):
+        """Test that toolkit schemas are built once per process."""
+        assert alita_tools.get_toolkits() == [FakeModel]
+        assert alita_tools.get_toolkits() == [FakeModel]
+        assert FakeToolkit.calls == 1
+
+    @pytest.mark.positive
+    def test_artifact_round_trip(self, fake_registry, tmp_path):
+        """Test that a built artifact is served without building the schemas again."""
+        artifact = tmp_path / "schemas.json"
+        schema_cache.build_schema_artifact(str(artifact))
+        schema_cache.clear_cache()
+        FakeToolkit.calls = 0
+        assert schema_cache.get_toolkit_json_schemas(str(artifact)) == [{"title": "fake"}]
+        assert FakeToolkit.calls == 0
+
+    @pytest.mark.negative
+    def test_stale_artifact_is_ignored(self, fake_registry, tmp_path):
+        """Test that an artifact built for another version is not used."""
+        artifact = tmp_path / "schemas.json"
+        artifact.write_text(json.dumps({"version": "0.0.0-other", "schemas": [{"title": "stale"}]}))
+        assert schema_cache.get_toolkit_json_schemas(str(artifact)) == [{"title": "fake"}]
+
+    @pytest.mark.negative
+    def test_artifact_is_ignored_without_version(self, fake_registry, monkeypatch, tmp_path):
+        """Test that a development build without package metadata does not trust an artifact."""
+        monkeypatch.setattr(schema_cache, "package_version", lambda: "unknown")
+        artifact = tmp_path / "schemas.json"
+        artifact.write_text(json.dumps({"version": "unknown", "schemas": [{"title": "stale"}]}))
+        assert schema_cache.get_toolkit_json_schemas(str(artifact)) == [{"title": "fake"}]
+
+    @pytest.mark.positive
+    def test_json_schemas_are_memoized_per_path(self, fake_registry, tmp_path):
+        """Test that schemas loaded from one artifact are not returned for another path."""
+        first, second = tmp_path / "first.json", tmp_path / "second.json"
+        first.write_text(json.dumps({"version": "1.2.3", "schemas": [{"title": "first"}]}))
+        second.write_text(json.dumps({"version": "1.2.3", "schemas": [{"title": "second"}]}))
+        assert schema_cache.get_toolkit_json_schemas(str(first)) == [{"title": "first"}]
+        assert schema_cache.get_toolkit_json_schemas(str(second)) == [{"title": "second"}]
+
+    @pytest.mark.positive
+    def test_package_version_is_memoized(self, monkeypatch):
+        """Test that the package metadata is read once."""
+        calls = []
+        monkeypatch.setattr(schema_cache, "version", lambda name: calls.append(name) or "1.2.3")
+        schema_cache.clear_cache()
+        assert schema_cache.package_version() == schema_cache.package_version() == "1.2.3"
+        assert calls == ["alita_tools"]
+        schema_cache.clear_cache()
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+
+from alita_tools.utils import tokens
+
+
+class FakeEncoder:
+    """Whitespace tokenizer standing in for tiktoken (the BPE file is downloaded on first use)."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts, disallowed_special=()):
+        return [self.encode(text) for text in texts]
+
+
+@pytest.fixture
+def encoder():
+    encoder = FakeEncoder()
+    tokens.clear_token_cache()
+    with patch.object(tokens, "_encoder", encoder):
+        yield encoder
+    tokens.clear_token_cache()
+
+
+@pytest.mark.unit
+@pytest.mark.utils
+class TestTokens:
+    @pytest.mark.positive
+    def test_count_tokens_keeps_order(self, encoder):
+        """Test that batched counts are returned in input order, duplicates included."""
+        assert tokens.count_tokens(["a b", "c", "a b", ""]) == [2, 1, 2, 0]
+        assert encoder.encoded == ["a b", "c", ""]
+
+    @pytest.mark.positive
+    def test_counts_are_memoized(self, encoder):
+        """Test that a text is encoded only once across calls."""
+        tokens.count_tokens(["one two", "three"])
+        assert tokens.token_length("one two") == 2
+        assert tokens.count_tokens(["three", "four five six"]) == [1, 3]
+        assert encoder.encoded == ["one two", "three", "four five six"]
+
+    @pytest.mark.positive
+    def test_memo_is_bounded(self, encoder):
+        """Test that the memo evicts least recently used counts."""
+        with patch.object(tokens, "MEMO_MAXSIZE", 2):
+            tokens.count_tokens(["a", "b", "c"])
+            tokens.token_length("a")
+        assert encoder.encoded == ["a", "b", "c", "a"]
+
+    @pytest.mark.positive
+    def test_tiktoken_length_uses_shared_counter(self, encoder):
+        """Test that the chunker helper goes through the shared memoized counter."""
+        pytest.importorskip("langchain.schema")
+        from alita_tools.chunkers.utils import tiktoken_length, tiktoken_lengths
+        assert tiktoken_length("x y z") == 3
+        assert tiktoken_lengths(["x y z", "w"]) == [3, 1]
+        assert encoder.encoded == ["x y z", "w"]
+
+    @pytest.mark.positive
+    def test_memo_does_not_keep_texts(self, encoder):
+        """Test that the memo is keyed by a digest instead of holding the texts."""
+        tokens.count_tokens(["a large diff " * 1000])
+        assert all(isinstance(key, bytes) and len(key) == 20 for key in tokens._memo)
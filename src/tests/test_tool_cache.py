@@ -0,0 +1,141 @@
+import pytest
+from langchain_core.tools import ToolException
+
+from alita_tools.elitea_base import BaseToolApiWrapper
+from alita_tools.utils import tool_cache
+from alita_tools.utils.tool_cache import InMemoryLRUCache, SqliteCache
+
+
+class CachedToolApiWrapper(BaseToolApiWrapper):
+    base_url: str = "https://example.com"
+    active_branch: str = "main"
+
+    def get_available_tools(self):
+        return [
+            {"name": "read_page", "cache": "read", "ref": self.read_page},
+            {"name": "read_missing", "cache": "read", "ref": self.read_missing},
+            {"name": "read_report", "cache": "read", "ref": self.read_report},
+            {"name": "update_page", "cache": "write", "ref": self.update_page},
+            {"name": "search", "ref": self.read_page},
+        ]
+
+    def read_page(self, page_id):
+        calls.append(page_id)
+        return f"page {page_id} v{len(calls)}"
+
+    def read_missing(self, page_id):
+        calls.append(page_id)
+        return ToolException(f"Error: page {page_id} not found")
+
+    def read_report(self, page_id):
+        calls.append(page_id)
+        return f"Error handling of page {page_id}"
+
+    def update_page(self, page_id):
+        return "updated"
+
+    def _get_cache_state(self):
+        return {"branch": self.active_branch}
+
+
+calls = []
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    calls.clear()
+    cache = InMemoryLRUCache() if request.param == "memory" else SqliteCache(str(tmp_path / "cache.db"))
+    tool_cache.set_cache_backend(cache)
+    yield cache
+    tool_cache.set_cache_backend(None)
+
+
+@pytest.mark.unit
+@pytest.mark.base
+@pytest.mark.utils
+class TestToolCache:
+    @pytest.mark.positive
+    def test_read_tool_is_cached(self, backend):
+        """Test that repeated reads with the same arguments hit the cache."""
+        wrapper = CachedToolApiWrapper()
+        assert wrapper.run("read_page", page_id="1") == "page 1 v1"
+        assert wrapper.run("read_page", page_id="1") == "page 1 v1"
+        assert wrapper.run("read_page", page_id="2") == "page 2 v2"
+        assert calls == ["1", "2"]
+
+    @pytest.mark.positive
+    def test_write_tool_invalidates(self, backend):
+        """Test that a write tool drops cached reads of the same toolkit."""
+        wrapper = CachedToolApiWrapper()
+        wrapper.run("read_page", page_id="1")
+        wrapper.run("update_page", page_id="1")
+        assert wrapper.run("read_page", page_id="1") == "page 1 v2"
+
+    @pytest.mark.positive
+    def test_toolkits_are_isolated(self, backend):
+        """Test that the cache key includes the toolkit instance configuration."""
+        CachedToolApiWrapper().run("read_page", page_id="1")
+        other = CachedToolApiWrapper(base_url="https://other.example.com")
+        assert other.run("read_page", page_id="1") == "page 1 v2"
+        other.run("update_page", page_id="1")
+        assert CachedToolApiWrapper().run("read_page", page_id="1") == "page 1 v1"
+
+    @pytest.mark.negative
+    def test_tools_without_policy_are_not_cached(self, backend):
+        """Test that tools without cache metadata always call through."""
+        wrapper = CachedToolApiWrapper()
+        wrapper.run("search", page_id="1")
+        wrapper.run("search", page_id="1")
+        assert len(calls) == 2
+
+    @pytest.mark.negative
+    def test_expired_entries_are_dropped(self, backend):
+        """Test that entries older than the TTL are not served."""
+        backend.ttl = -1
+        wrapper = CachedToolApiWrapper()
+        wrapper.run("read_page", page_id="1")
+        assert wrapper.run("read_page", page_id="1") == "page 1 v2"
+
+    @pytest.mark.positive
+    def test_key_includes_instance_state(self, backend):
+        """Test that an instance on another branch does not get reads cached for the first one."""
+        CachedToolApiWrapper().run("read_page", page_id="1")
+        dev = CachedToolApiWrapper()
+        dev.active_branch = "dev"
+        assert dev.run("read_page", page_id="1") == "page 1 v2"
+        assert CachedToolApiWrapper().run("read_page", page_id="1") == "page 1 v1"
+
+    @pytest.mark.negative
+    def test_error_results_are_not_cached(self, backend):
+        """Test that exceptions returned as results are not served from the cache."""
+        wrapper = CachedToolApiWrapper()
+        wrapper.run("read_missing", page_id="1")
+        wrapper.run("read_missing", page_id="1")
+        assert calls == ["1", "1"]
+
+    @pytest.mark.positive
+    def test_results_are_cached_regardless_of_text(self, backend):
+        """Test that a result whose text reads like an error message is still cached."""
+        wrapper = CachedToolApiWrapper()
+        assert wrapper.run("read_report", page_id="1") == "Error handling of page 1"
+        assert wrapper.run("read_report", page_id="1") == "Error handling of page 1"
+        assert calls == ["1"]
+
+    @pytest.mark.negative
+    def test_cache_is_opt_in(self, monkeypatch):
+        """Test that no backend is used unless ALITA_TOOLS_CACHE selects one."""
+        monkeypatch.delenv("ALITA_TOOLS_CACHE", raising=False)
+        assert tool_cache._backend_from_env() is None
+        monkeypatch.setenv("ALITA_TOOLS_CACHE", "memory")
+        assert isinstance(tool_cache._backend_from_env(), InMemoryLRUCache)
+
+    @pytest.mark.negative
+    def test_lru_eviction(self):
+        """Test that the in-memory backend evicts the least recently used entry."""
+        cache = InMemoryLRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
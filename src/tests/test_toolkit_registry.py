@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import alita_tools
+
+
+@pytest.mark.unit
+@pytest.mark.base
+class TestToolkitRegistry:
+    @pytest.mark.positive
+    def test_import_does_not_load_toolkits(self):
+        """Test that importing the package does not import any toolkit module."""
+        src = str(Path(alita_tools.__file__).resolve().parents[1])
+        code = (
+            f"import sys; sys.path.insert(0, {src!r}); import alita_tools; "
+            "print(sorted(m for m in sys.modules if m.startswith('alita_tools.')))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "[]"
+
+    @pytest.mark.positive
+    def test_get_tools_dispatches_by_type(self, monkeypatch):
+        """Test that `get_tools` resolves the entry point registered for the toolkit type."""
+        calls = []
+        monkeypatch.setattr(alita_tools, "_resolve", lambda module, attr: lambda *a: calls.append((module, a)) or ["tool"])
+        tools = alita_tools.get_tools([{"type": "jira", "settings": {}}], alita=None, llm=None)
+        assert tools == ["tool"]
+        assert calls[0][0] == ".jira"
+
+    @pytest.mark.positive
+    def test_get_tools_passes_type_to_ado(self, monkeypatch):
+        """Test that ADO boards/wiki/plans receive the toolkit type."""
+        calls = []
+        monkeypatch.setattr(alita_tools, "_resolve", lambda module, attr: lambda *a: calls.append(a) or [])
+        alita_tools.get_tools([{"type": "ado_wiki", "settings": {}}], alita=None, llm=None)
+        assert calls[0][0] == "ado_wiki"
+
+    @pytest.mark.negative
+    def test_unknown_attribute(self):
+        """Test that unknown package attributes still raise AttributeError."""
+        with pytest.raises(AttributeError):
+            alita_tools.NotAToolkit